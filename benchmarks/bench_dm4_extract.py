@@ -0,0 +1,64 @@
+"""
+Compare header-only (lazy) and full DM4 metadata extraction.
+
+Each run happens in a fresh interpreter so peak RSS is measured per mode:
+
+    python benchmarks/bench_dm4_extract.py path/to/file.dm4 --repeat 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+CLIENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "diatoms_to_datafed", "Datafed_Client")
+
+# Runs in the child interpreter: import outside the timed region, then extract once
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from materials.EM.dm.dm4 import DM4
+from MetaXtract import MyEncoder
+try:
+    import resource
+except ImportError:
+    resource = None
+start = time.perf_counter()
+metadata = DM4(sys.argv[2], lazy=sys.argv[3] == "lazy").extract()
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+if peak_kb and sys.platform == "darwin":
+    peak_kb //= 1024  # ru_maxrss is in bytes on macOS
+print(json.dumps({"seconds": elapsed, "peak_rss_kb": peak_kb, "metadata": json.loads(json.dumps(metadata, cls=MyEncoder))}))
+"""
+
+
+def run(file_name, mode):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, CLIENT_DIR, file_name, mode],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="DM4 file to extract")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in ("full", "lazy"):
+        runs = [run(args.file, mode) for _ in range(args.repeat)]
+        results[mode] = runs
+        best = min(r["seconds"] for r in runs)
+        peak = max(r["peak_rss_kb"] or 0 for r in runs)
+        print(f"{mode:>4}: best {best:.3f} s, peak RSS {peak / 1024:.1f} MiB")
+
+    same = results["full"][0]["metadata"] == results["lazy"][0]["metadata"]
+    print(f"metadata identical: {same}")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Measure the import time and RSS cost of the app's modules and fail on regressions.
+
+Each measurement runs in a fresh interpreter; the cost is reported relative to an
+interpreter that imports nothing:
+
+    python benchmarks/bench_startup.py --repeat 5 --max-seconds 1.5 --max-rss-mb 150
+
+Exits non-zero if a budget is exceeded or if importing the modules pulled in a format
+backend (hyperspy, h5py, igor2), which should only be loaded when a file needs it.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+CLIENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "diatoms_to_datafed", "Datafed_Client")
+
+DEFAULT_MODULES = ["util", "extraction_service", "ingest_service"]
+LAZY_BACKENDS = ["hyperspy", "h5py", "igor2"]
+
+# Runs in the child interpreter: time the imports, then report peak RSS and which backends got loaded
+CHILD = r"""
+import json, sys, time, importlib
+sys.path.insert(0, sys.argv[1])
+modules = [m for m in sys.argv[2].split(",") if m]
+try:
+    import resource
+except ImportError:
+    resource = None
+start = time.perf_counter()
+for name in modules:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+if peak_kb and sys.platform == "darwin":
+    peak_kb //= 1024  # ru_maxrss is in bytes on macOS
+loaded = sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[3].split(",")))
+print(json.dumps({"seconds": elapsed, "peak_rss_kb": peak_kb, "backends": loaded}))
+"""
+
+
+def run(modules):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, CLIENT_DIR, ",".join(modules), ",".join(LAZY_BACKENDS)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES,
+                        help=f"modules to import (default: {' '.join(DEFAULT_MODULES)}; add datafed_app with the UI installed)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    parser.add_argument("--max-seconds", type=float, default=1.5, help="import time budget (best run)")
+    parser.add_argument("--max-rss-mb", type=float, default=150.0, help="extra peak RSS budget")
+    args = parser.parse_args(argv)
+
+    baseline = [run([]) for _ in range(args.repeat)]
+    runs = [run(args.modules) for _ in range(args.repeat)]
+    seconds = min(r["seconds"] for r in runs)
+    base_kb = min(r["peak_rss_kb"] or 0 for r in baseline)
+    rss_mb = (min(r["peak_rss_kb"] or 0 for r in runs) - base_kb) / 1024
+    backends = sorted({b for r in runs for b in r["backends"]})
+    print(f"import {' '.join(args.modules)}: best {seconds:.3f} s, +{rss_mb:.1f} MiB peak RSS")
+    print(f"format backends loaded: {', '.join(backends) or 'none'}")
+
+    failed = False
+    if seconds > args.max_seconds:
+        print(f"FAIL: import time {seconds:.3f} s exceeds {args.max_seconds:.3f} s")
+        failed = True
+    if rss_mb > args.max_rss_mb:
+        print(f"FAIL: peak RSS +{rss_mb:.1f} MiB exceeds {args.max_rss_mb:.1f} MiB")
+        failed = True
+    if backends:
+        print("FAIL: format backends must be imported on first use, not at startup")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
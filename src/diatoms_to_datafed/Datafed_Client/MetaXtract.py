@@ -31,6 +31,10 @@ class MetaXtractor:
     Base class for extracting metadata from different file formats.
     Subclasses must implement the extract() method.
     """
+    # Content signatures for extractors registered with extractors.register_extractor or as entry points:
+    # tuples of (offset, bytes) pairs that must all match the start of the file (offset None: anywhere in it)
+    magic = ()
+
     def __init__(self, file_name):
         """
         Constructor that initializes the extractor with the file name.
@@ -246,55 +246,83 @@ login_pane = pn.Column(
     css_classes=['md-card']
 )
 
+def format_size(nbytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if nbytes < 1024:
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} TB"
+
+def format_directory_info(info):
+    return (
+        f"📁 {info.get('dir_count', 0)} directories, 📄 {info.get('file_count', 0)} files "
+        f"({format_size(info.get('total_size', 0))}), ⏳ {info.get('backlog_count', 0)} pending "
+        f"({format_size(info.get('backlog_bytes', 0))})"
+    )
+
 # Automated processing panel with Material Design styling
-@pn.depends(app.param.progress, app.param.processing_status, app.param.current_file, app.param.task_id)
-def auto_processing_panel(progress, status, current_file, task_id):
-    progress_bar = pn.widgets.Progress(name="Progress", value=progress, width=400)
-    
-    return pn.Column(
-        pn.pane.Markdown("## Automated Data Processing", css_classes=['md-text']),
-        pn.Row(app.start_auto_button, app.stop_auto_button),
-        pn.Row(
-            pn.Column(
-                pn.pane.Markdown("### Directory Configuration", css_classes=['md-text']),
-                pn.pane.Markdown("**Current Auto Processing Directory:**", css_classes=['md-text']),
-                pn.bind(lambda _: f"`{app.file_path or 'Not set'}`", app.param.progress),
-                pn.pane.Markdown("**Directory Info:**", css_classes=['md-text']),
-                pn.bind(lambda _: f"📁 {app.get_auto_processing_directory_info().get('dir_count', 0)} directories, 📄 {app.get_auto_processing_directory_info().get('file_count', 0)} files", app.param.progress),
-                pn.pane.Markdown("**Directory Selection:**", css_classes=['md-text']),
-                app.auto_processing_dir_selector,
-                pn.Row(app.sync_file_selector_button),
-                css_classes=['progress-container']
-            ),
-            pn.Column(
-                pn.pane.Markdown(f"**Status:** {status}", css_classes=['md-text']),
-                pn.pane.Markdown(f"**Current File:** {current_file}", css_classes=['md-text']),
-                pn.pane.Markdown(f"**Task ID:** {task_id}", css_classes=['md-text']),
-                progress_bar,
-                pn.pane.Markdown(f"**Progress:** {progress}%", css_classes=['md-text']),
-                css_classes=['progress-container']
-            )
+# Built once; the publisher updates only the widgets whose values changed, at app.ui_refresh_ms intervals
+status_text = pn.pane.Markdown("", css_classes=['md-text'])
+current_file_text = pn.pane.Markdown("", css_classes=['md-text'])
+task_id_text = pn.pane.Markdown("", css_classes=['md-text'])
+progress_bar = pn.widgets.Progress(name="Progress", value=0, width=400)
+progress_text = pn.pane.Markdown("", css_classes=['md-text'])
+directory_path_text = pn.pane.Markdown("", css_classes=['md-text'])
+directory_info_text = pn.pane.Markdown("", css_classes=['md-text'])
+
+app.ui_publisher.bind(status_text, 'object', lambda: f"**Status:** {app.processing_status}")
+app.ui_publisher.bind(current_file_text, 'object', lambda: f"**Current File:** {app.current_file}")
+app.ui_publisher.bind(task_id_text, 'object', lambda: f"**Task ID:** {app.task_id}")
+app.ui_publisher.bind(progress_bar, 'value', lambda: app.progress)
+app.ui_publisher.bind(progress_text, 'object', lambda: f"**Progress:** {app.progress}%")
+app.ui_publisher.bind(directory_path_text, 'object', lambda: f"`{app.file_path or 'Not set'}`")
+app.ui_publisher.bind(directory_info_text, 'object', lambda: format_directory_info(app.get_auto_processing_directory_info()))
+
+auto_processing_panel = pn.Column(
+    pn.pane.Markdown("## Automated Data Processing", css_classes=['md-text']),
+    pn.Row(app.start_auto_button, app.stop_auto_button),
+    pn.Row(
+        pn.Column(
+            pn.pane.Markdown("### Directory Configuration", css_classes=['md-text']),
+            pn.pane.Markdown("**Current Auto Processing Directory:**", css_classes=['md-text']),
+            directory_path_text,
+            pn.pane.Markdown("**Directory Info:**", css_classes=['md-text']),
+            directory_info_text,
+            pn.pane.Markdown("**Directory Selection:**", css_classes=['md-text']),
+            app.auto_processing_dir_selector,
+            pn.Row(app.sync_file_selector_button),
+            css_classes=['progress-container']
         ),
-
-        pn.Row(
-            pn.Column(
-                app.current_file_pane,
-                width=400,
-                css_classes=['file-tracking-pane']
-            ),
-            pn.Column(
-                app.processed_files_pane,
-                width=400,
-                css_classes=['file-tracking-pane']
-            ),
-            pn.Column(
-                app.unprocessed_files_pane,
-                width=400,
-                css_classes=['file-tracking-pane']
-            )
+        pn.Column(
+            status_text,
+            current_file_text,
+            task_id_text,
+            progress_bar,
+            progress_text,
+            css_classes=['progress-container']
+        )
+    ),
+
+    pn.Row(
+        pn.Column(
+            app.current_file_pane,
+            width=400,
+            css_classes=['file-tracking-pane']
         ),
-        pn.Row(app.record_output_pane)
-    )
+        pn.Column(
+            app.processed_files_pane,
+            width=400,
+            css_classes=['file-tracking-pane']
+        ),
+        pn.Column(
+            app.unprocessed_files_pane,
+            width=400,
+            css_classes=['file-tracking-pane']
+        )
+    ),
+    pn.Row(app.record_output_pane)
+)
+app.ui_publisher.flush()
 
 # Define the record management pane with Material Design styling
 record_pane = pn.Column(
@@ -308,7 +336,9 @@ record_pane = pn.Column(
             css_classes=['md-card']
         )),
         ("Read Record", pn.Column(
+            pn.Param(app.param.record_search, css_classes=['md-input']),
             pn.Param(app.param.record_id, css_classes=['md-select']),
+            pn.Row(app.prev_page_button, app.record_page_pane, app.next_page_button),
             pn.Column(app.read_button, app.update_button, app.delete_button),
             app.record_output_pane,
             app.metadata_json_editor,
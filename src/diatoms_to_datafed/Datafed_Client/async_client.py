@@ -0,0 +1,149 @@
+import queue
+import asyncio
+import threading
+from functools import partial
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ContextTrackingAPI:
+    """
+    Wraps a datafed.CommandLib.API instance and remembers its current context,
+    so setContext is only sent to the server when the context actually changes.
+    """
+    def __init__(self, api, generation=0):
+        self.api = api
+        self.context = None
+        # DataFedClientPool generation the instance was authenticated in
+        self.generation = generation
+
+    def setContext(self, context):
+        if context != self.context:
+            self.api.setContext(context)
+            self.context = context
+
+    def __getattr__(self, name):
+        return getattr(self.api, name)
+
+
+class DataFedClientPool:
+    """
+    Pool of authenticated DataFed API instances, created on demand up to size.
+    If no authenticated instance can be created, callers share fallback_api under fallback_lock.
+    reset() starts a new generation: instances leased before it are discarded when they are released.
+    """
+    def __init__(self, factory, size=4, fallback_api=None, fallback_lock=None):
+        """
+        :param factory: Callable returning a new authenticated API instance, or None if that is not possible.
+        :param size: Maximum number of instances.
+        :param fallback_api: API instance to share when the factory cannot authenticate.
+        :param fallback_lock: Lock serializing use of fallback_api.
+        """
+        self.factory = factory
+        self.size = size
+        self.fallback_api = fallback_api
+        self.fallback_lock = fallback_lock or threading.Lock()
+        self._idle = queue.Queue()
+        self._created = 0
+        self._generation = 0
+        self._factory_failed = False
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                api = None
+            if api is not None:
+                return api
+            with self._lock:
+                if self._created < self.size and not self._factory_failed:
+                    api = self.factory()
+                    if api is not None:
+                        self._created += 1
+                        return ContextTrackingAPI(api, self._generation)
+                    self._factory_failed = True
+                if self._created == 0:
+                    return None
+            api = self._idle.get()
+            # None wakes a waiter after a stale instance was discarded, so it can create a new one
+            if api is not None:
+                return api
+
+    def _release(self, api):
+        with self._lock:
+            if api.generation == self._generation:
+                self._idle.put(api)
+                return
+        # Leased before reset(): still authenticated as the old user with its old context
+        self._idle.put(None)
+
+    @contextmanager
+    def session(self):
+        """Lease an API instance for the duration of the with block."""
+        api = self._acquire()
+        if api is None:
+            with self.fallback_lock:
+                yield self.fallback_api
+            return
+        try:
+            yield api
+        finally:
+            self._release(api)
+
+    def reset(self):
+        """Drop all instances (e.g. after logout) so new ones are authenticated on next use."""
+        with self._lock:
+            self._generation += 1
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+            # Leased instances are discarded when they come back
+            self._created = 0
+            self._factory_failed = False
+
+
+class AsyncDataFedClient:
+    """
+    Awaitable facade over the blocking datafed.CommandLib.API calls.
+    Calls run on a dedicated executor, each on an instance leased from a DataFedClientPool,
+    so Panel callbacks and the processor can overlap DataFed round trips.
+    """
+    def __init__(self, pool, max_workers=None):
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or pool.size, thread_name_prefix="datafed")
+
+    def _call_sync(self, method, context, args, kwargs):
+        with self.pool.session() as api:
+            if context:
+                api.setContext(context)
+            return getattr(api, method)(*args, **kwargs)
+
+    async def call(self, method, *args, context=None, **kwargs):
+        """Run API.<method>(*args, **kwargs) on the executor, after switching to context if given."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(self._call_sync, method, context, args, kwargs))
+
+    async def project_list(self):
+        return await self.call("projectList")
+
+    async def collection_items_list(self, coll_id, offset=0, count=None, context=None):
+        kwargs = {"offset": offset, "context": context}
+        if count is not None:
+            kwargs["count"] = count
+        return await self.call("collectionItemsList", coll_id, **kwargs)
+
+    async def data_view(self, data_id, context=None):
+        return await self.call("dataView", data_id, context=context)
+
+    async def data_create(self, title, metadata=None, parent_id="root", context=None, **kwargs):
+        return await self.call("dataCreate", title, metadata=metadata, parent_id=parent_id, context=context, **kwargs)
+
+    async def data_put(self, data_id, path, wait=False, context=None):
+        return await self.call("dataPut", data_id, path, wait=wait, context=context)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,33 @@
+import os
+import json
+import tempfile
+from MetaXtract import MyEncoder
+
+
+def create_records_batch(api, records, coll_id, context=None, tags=None):
+    """
+    Create several DataFed records with a single dataBatchCreate round trip.
+    :param api: Authenticated datafed.CommandLib.API instance.
+    :param records: List of (title, metadata dict) tuples.
+    :param coll_id: Parent collection for all records.
+    :param context: Optional project/user context.
+    :param tags: Optional list of tags added to every record.
+    :return: List of record IDs, in the same order as records.
+    """
+    payload = [{"title": title, "md": metadata} for title, metadata in records]
+    if tags:
+        for record in payload:
+            record["tags"] = list(tags)
+    # dataBatchCreate reads the records from local JSON files
+    fd, batch_file = tempfile.mkstemp(prefix="datafed_batch_", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(payload, f, cls=MyEncoder)
+        reply = api.dataBatchCreate([batch_file], coll_id=coll_id, context=context)
+    finally:
+        os.remove(batch_file)
+
+    record_ids = [record.id for record in reply[0].data]
+    if len(record_ids) != len(records):
+        raise RuntimeError(f"dataBatchCreate returned {len(record_ids)} records for {len(records)} items")
+    return record_ids
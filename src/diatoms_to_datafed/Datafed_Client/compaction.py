@@ -0,0 +1,152 @@
+import json
+import numbers
+from MetaXtract import MyEncoder
+
+# Key under which a compacted document records what was changed
+COMPACTION_KEY = "_compaction"
+# Paths listed per category in the compaction record; the counts are always complete
+MAX_LISTED = 20
+# Bytes kept free for the compaction record itself
+RECORD_RESERVE = 2048
+
+
+def _size(value):
+    """Encoded size of a value, as json.dumps(metadata, cls=MyEncoder) will send it."""
+    try:
+        return len(json.dumps(value, cls=MyEncoder))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+def _path_str(path):
+    text = ""
+    for key in path:
+        text += f"[{key}]" if isinstance(key, int) else (f".{key}" if text else str(key))
+    return text
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Number) and not isinstance(value, (bool, complex))
+
+
+def _summarize_array(value):
+    """shape/dtype/min/max of an array-like (numpy arrays are detected by duck typing)."""
+    summary = {"shape": [int(n) for n in value.shape], "dtype": str(value.dtype)}
+    try:
+        if value.size and value.dtype.kind in "iuf":
+            summary["min"] = value.min().item()
+            summary["max"] = value.max().item()
+    except Exception:
+        pass
+    return summary
+
+
+def _summarize_list(value):
+    summary = {"length": len(value), "type": "list"}
+    if all(_is_number(item) for item in value):
+        summary["min"] = min(value)
+        summary["max"] = max(value)
+    return summary
+
+
+class _Compactor:
+    def __init__(self, max_depth, max_array_items):
+        self.max_depth = max_depth
+        self.max_array_items = max_array_items
+        self.summarized = []
+        self.pruned = []
+
+    def compact(self, value, path):
+        if hasattr(value, "shape") and hasattr(value, "dtype"):
+            if getattr(value, "ndim", 0) == 0:
+                return value  # numpy scalar
+            self.summarized.append(path)
+            return _summarize_array(value)
+        if isinstance(value, dict):
+            if len(path) >= self.max_depth and value:
+                self.pruned.append(path)
+                return {"pruned_keys": len(value)}
+            return {
+                key: item if key == COMPACTION_KEY else self.compact(item, path + (str(key),))
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            if len(value) > self.max_array_items:
+                self.summarized.append(path)
+                if all(_is_number(item) for item in value):
+                    return _summarize_list(value)
+                summary = _summarize_list(value)
+                summary["first"] = [self.compact(item, path + (i,)) for i, item in enumerate(value[:self.max_array_items])]
+                return summary
+            return [self.compact(item, path + (i,)) for i, item in enumerate(value)]
+        return value
+
+
+def _leaves(value, path=()):
+    """(path, encoded size) of every non-dict value, so the budget can drop the largest first."""
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            if key != COMPACTION_KEY:
+                yield from _leaves(item, path + (key,))
+    elif path:
+        yield path, _size(value) + len(str(path[-1])) + 4
+
+
+def _drop(metadata, path):
+    node = metadata
+    for key in path[:-1]:
+        node = node[key]
+    del node[path[-1]]
+    # Remove parents the drop left empty
+    for depth in range(len(path) - 1, 0, -1):
+        parent = metadata
+        for key in path[:depth - 1]:
+            parent = parent[key]
+        if parent[path[depth - 1]]:
+            break
+        del parent[path[depth - 1]]
+
+
+def _listed(paths):
+    return {"count": len(paths), "paths": [_path_str(p) for p in paths[:MAX_LISTED]]}
+
+
+def compact_metadata(metadata, max_bytes=64 * 1024, max_depth=8, max_array_items=16):
+    """
+    Bound the size of a metadata document before it is sent to DataFed.
+    Arrays, and lists longer than max_array_items, are replaced by their shape/dtype (or length) and min/max;
+    dictionaries deeper than max_depth are replaced by their key count; if the document is still larger than
+    max_bytes, the largest values are dropped until it fits. What was changed is recorded under COMPACTION_KEY.
+    :param metadata: Metadata dictionary; it is not modified.
+    :param max_bytes: Budget for the JSON-encoded document (None for no limit).
+    :param max_depth: Nesting depth kept in full.
+    :param max_array_items: Longest list kept in full.
+    :return: The compacted dictionary (metadata itself if nothing had to change).
+    """
+    if not isinstance(metadata, dict):
+        return metadata
+    # Arrays are summarized before anything is encoded, so they are never turned into nested lists
+    compactor = _Compactor(max_depth, max_array_items)
+    compacted = compactor.compact(metadata, ())
+    if not (compactor.summarized or compactor.pruned) and (max_bytes is None or _size(metadata) <= max_bytes):
+        return metadata
+
+    dropped = []
+    if max_bytes is not None:
+        budget = max_bytes - RECORD_RESERVE if max_bytes > 2 * RECORD_RESERVE else max_bytes
+        excess = _size(compacted) - budget
+        if excess > 0:
+            for path, size in sorted(_leaves(compacted), key=lambda leaf: -leaf[1]):
+                _drop(compacted, path)
+                dropped.append(path)
+                excess -= size
+                if excess <= 0 and _size(compacted) <= budget:
+                    break
+
+    compacted[COMPACTION_KEY] = {
+        "bytes": _size(compacted),
+        "summarized": _listed(compactor.summarized),
+        "pruned": _listed(compactor.pruned),
+        "dropped": _listed(dropped),
+    }
+    return compacted
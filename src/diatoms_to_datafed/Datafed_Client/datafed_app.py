@@ -6,12 +6,15 @@ from datafed.CommandLib import API
 from file_selector import FileSelector
 from google.protobuf.json_format import MessageToJson
 import os
-import time
 from dotenv import load_dotenv # type: ignore
-from util import get_file_metadata  # Import the utility function
+from ingest_service import IngestService, IngestObserver, DEFAULTS as INGEST_DEFAULTS
+from ingest_units import INGEST_UNITS
+from async_client import DataFedClientPool, AsyncDataFedClient
+from listing_cache import ListingCache
+from ui_state import StatePublisher
+from contextlib import contextmanager
+import asyncio
 import threading
-import datetime
-import glob
 # import zipfile  # No longer needed - zipping logic commented out
 load_dotenv()
 FILE_PATH = os.getenv("FILE_PATH")
@@ -27,9 +30,60 @@ try:
 except FileNotFoundError:
     print(f"Warning: Globus endpoint file not found at {globus_key}")
     ep = ""
+# Page size used when record search has to be filtered client-side
+SEARCH_SCAN_PAGE = 500
+# Entries the file selectors send to the browser at a time
+FILE_SELECTOR_WINDOW = 500
+
 pn.extension('material')
 pn.extension('jsoneditor')
 
+class _AppIngestObserver(IngestObserver):
+    """Maps IngestService progress onto the app's params; the UI publisher pushes them to the browser"""
+    def __init__(self, app):
+        self.app = app
+
+    def status(self, text):
+        self.app.processing_status = text
+
+    def batch_started(self, total):
+        self.app.total_files = total
+        self.app.progress = 0
+
+    def progress(self, percent, in_flight):
+        if percent is not None:
+            self.app.progress = percent
+        self.app.current_file = in_flight
+        self.app.current_processing_file = in_flight
+        self.app.update_file_tracking_panes()
+
+    def backlog(self, keys):
+        self.app.unprocessed_files_list = keys
+        self.app.update_file_tracking_panes()
+
+    def history(self, keys):
+        self.app.processed_files_list = keys
+
+    def item_processed(self, key):
+        self.app.processed_files_list.append(key)
+        if key in self.app.unprocessed_files_list:
+            self.app.unprocessed_files_list.remove(key)
+        self.app.update_file_tracking_panes()
+
+    def record_created(self, record_id):
+        self.app._listing_cache.invalidate("items", self.app.ingest.context)
+        self.app.task_id = record_id
+
+    def message(self, text):
+        self.app.ui_publisher.set(self.app.record_output_pane, 'object', f"<h3>{text}</h3>")
+
+    def stopped(self, error=None):
+        self.app.update_file_tracking_panes()
+        self.app.auto_processing = False
+        self.app.ui_publisher.set(self.app.start_auto_button, 'disabled', False)
+        self.app.ui_publisher.set(self.app.stop_auto_button, 'disabled', True)
+
+
 class DataFedApp(param.Parameterized):
     df_api = param.ClassSelector(class_=API, default=None)
 
@@ -40,6 +94,10 @@ class DataFedApp(param.Parameterized):
     metadata = param.String(default="", label="Metadata (JSON format)")
 
     record_id = param.Selector(default=None, objects={}, label="Select Record")
+    record_search = param.String(default="", label="Search Records")
+    record_page = param.Integer(default=0, bounds=(0, None), label="Record Page")
+    record_page_size = param.Integer(default=100, bounds=(1, None), label="Records per Page")
+    record_total = param.Integer(default=0, label="Records in Collection")
     update_metadata = param.String(default="", label="Update Metadata (JSON format)")
     metadata_changed = param.Boolean(default=False, label="Metadata Changed")
     show_update_button = param.Boolean(default=False, label="Show Update Button")
@@ -72,6 +130,28 @@ class DataFedApp(param.Parameterized):
     total_files = param.Integer(default=0, label="Total Files")
     task_id = param.String(default="", label="Current Task ID")
     log_file = param.String(default="backup_log.json", label="Log File Path")
+    ledger_file = param.String(default="backup_log.db", label="Ledger File Path")
+    watcher_backend = param.Selector(default="auto", objects=["auto", "notify", "polling"], label="Watcher Backend")
+    watch_timeout = param.Number(default=5.0, label="Retry Interval (s)")
+    stable_window = param.Number(default=10.0, label="Stable Window (s)")
+    ui_refresh_ms = param.Integer(default=250, bounds=(50, None), label="UI Refresh Period (ms)")
+    dir_stats_interval = param.Number(default=30.0, bounds=(0, None), label="Directory Stats Refresh (s)")
+    snapshot_dir = param.String(default="~/.cache/diatoms_to_datafed/snapshots", label="Directory Snapshot Path")
+    ingest_unit = param.Selector(default="top_level", objects=list(INGEST_UNITS), label="Ingestion Unit")
+    extract_workers = param.Integer(default=2, bounds=(1, None), label="Extraction Workers")
+    upload_workers = param.Integer(default=4, bounds=(1, None), label="DataFed Upload Workers")
+    ingest_batch_size = param.Integer(default=1, bounds=(1, None), label="Records per Batch Create")
+    extraction_timeout = param.Number(default=60.0, label="Default Extraction Timeout (s)")
+    extraction_max_tasks = param.Integer(default=50, bounds=(1, None), label="Extractions per Worker Process")
+    extractor_options = param.Dict(default={}, label="Extractor Options (by extractor class)")
+    transfer_drain_timeout = param.Number(default=30.0, bounds=(0, None), label="Transfer Wait on Stop (s)")
+    metadata_cache_file = param.String(default="~/.cache/diatoms_to_datafed/metadata_cache.db", label="Metadata Cache Path")
+    metadata_cache_max_mb = param.Integer(default=256, bounds=(1, None), label="Metadata Cache Size (MB)")
+    summary_max_files = param.Integer(default=32, bounds=(1, None), label="Files Summarized per Directory")
+    summary_max_mb = param.Integer(default=1024, bounds=(1, None), label="Bytes Summarized per Directory (MB)")
+    metadata_max_kb = param.Integer(default=64, bounds=(0, None), label="Metadata Size Budget (KB, 0 for none)")
+    metadata_max_depth = param.Integer(default=8, bounds=(1, None), label="Metadata Depth Kept")
+    listing_cache_ttl = param.Number(default=60.0, bounds=(0, None), label="Listing Cache TTL (s)")
 
     # New parameters for file tracking
     processed_files_list = param.List(default=[], label="Processed Files")
@@ -84,6 +164,19 @@ class DataFedApp(param.Parameterized):
     def __init__(self, **params):
         params['df_api'] = API() 
         super().__init__(**params)
+        # Worker threads only record state; the publisher pushes it to the browser at a fixed rate
+        self.ui_publisher = StatePublisher(period=self.ui_refresh_ms)
+        # Every use of the shared UI session holds this lock, including the client pool's fallback;
+        # it is re-entrant because handlers that hold it reload listings through the same session
+        self._df_api_lock = threading.RLock()
+        self._client_pool = DataFedClientPool(
+            self._create_session_api,
+            size=self.upload_workers + 2,
+            fallback_api=self.df_api,
+            fallback_lock=self._df_api_lock
+        )
+        self.datafed = AsyncDataFedClient(self._client_pool)
+        self._listing_cache = ListingCache(ttl=self.listing_cache_ttl)
         self.login_button = pn.widgets.Button(name='Login', button_type='primary')
         self.login_button.on_click(self.toggle_login_panel)
         
@@ -100,6 +193,12 @@ class DataFedApp(param.Parameterized):
         self.delete_button = pn.widgets.Button(name='Delete Record', button_type='danger')
         self.delete_button.on_click(self.delete_record)
         
+        self.prev_page_button = pn.widgets.Button(name='◀ Previous', button_type='light', width=100, disabled=True)
+        self.prev_page_button.on_click(self.previous_record_page)
+        self.next_page_button = pn.widgets.Button(name='Next ▶', button_type='light', width=100, disabled=True)
+        self.next_page_button.on_click(self.next_record_page)
+        self.record_page_pane = pn.pane.Markdown("", width=300)
+
         self.transfer_button = pn.widgets.Button(name='Transfer Data', button_type='primary')
         self.transfer_button.on_click(self.transfer_data)
         
@@ -121,7 +220,7 @@ class DataFedApp(param.Parameterized):
         self.metadata_json_editor = pn.widgets.JSONEditor(name='Metadata', width=600)
         self.record_output_pane = pn.pane.Markdown("<h3>Status Empty</h3>", name='Status', width=600)
 
-        self.file_selector = FileSelector(FILE_PATH)
+        self.file_selector = FileSelector(FILE_PATH, virtual_window=FILE_SELECTOR_WINDOW)
         self.file_selector.param.watch(self.update_metadata_from_file_selector, 'value')
         
         # Initialize file_path with default FILE_PATH
@@ -132,7 +231,8 @@ class DataFedApp(param.Parameterized):
             directory=FILE_PATH,
             name='Auto Processing Directory',
             width=600,
-            height=400
+            height=400,
+            virtual_window=FILE_SELECTOR_WINDOW
         )
         self.auto_processing_dir_selector.param.watch(self.on_directory_changed, 'directory')
         
@@ -146,12 +246,23 @@ class DataFedApp(param.Parameterized):
         
         # Set a better default directory if the current one doesn't exist
         self._ensure_valid_directory()
+
+        # The auto-processing pipeline runs without the UI; the app only observes it
+        self.ingest = IngestService(
+            self.file_path,
+            self._datafed_session,
+            observers=[_AppIngestObserver(self)],
+            **{name: getattr(self, name) for name in INGEST_DEFAULTS}
+        )
         
         # Update the directory selector to show the current directory
         self.update_directory_selector_display()
 
         self.param.watch(self.update_collections, 'selected_context')
         self.param.watch(self.update_collections, 'selected_collection')
+        self.param.watch(self.on_record_page_change, 'record_page')
+        self.param.watch(self.on_record_search_change, 'record_search')
+        self.param.watch(self._sync_ingest_target, ['selected_context', 'selected_collection'])
 
         self.record_output_pane.object = ""
 
@@ -159,6 +270,8 @@ class DataFedApp(param.Parameterized):
         self.param.watch(self.toggle_update_button_visibility, 'metadata_changed')
         self.endpoint_pane = pn.pane.Markdown("<h3>Endpoint Not Connected</h3>", name='Endpoint_Status', width=600)
         pn.state.onload(self.initial_login_check)
+        self.ui_publisher.add_renderer('file_tracking', self._render_file_tracking_panes)
+        pn.state.onload(self.ui_publisher.start)
 
         # Progress status
         self.progress_status = pn.pane.Markdown("", width=600)
@@ -179,17 +292,20 @@ class DataFedApp(param.Parameterized):
 
     def initial_login_check(self):
         try:
-            user_info = self.df_api.getAuthUser()
+            with self._df_api_lock:
+                user_info = self.df_api.getAuthUser()
+                current_context = self.df_api.getContext() if user_info else None
             if user_info:
                 self.current_user = user_info
-                self.current_context = self.df_api.getContext()
+                self.current_context = current_context
                 ids, titles = self.get_available_contexts()
                 self.available_contexts = {title: id_ for id_, title in zip(ids, titles)}
                 self.param['selected_context'].objects = self.available_contexts
                 self.selected_context = ids[0] if ids else None
                 self.record_output_pane.object = "<h3>User in session!</h3>"
                 if ep:
-                    self.df_api.endpointDefaultSet(ep)
+                    with self._df_api_lock:
+                        self.df_api.endpointDefaultSet(ep)
                     print(f"Successfully set up the endpoint with ID: {ep}")
                 else:
                     print("No endpoint ID found. Please check the environment variable.")
@@ -208,13 +324,18 @@ class DataFedApp(param.Parameterized):
 
     def check_login(self, event):
         try:
-            self.df_api.loginByPassword(self.username, self.password)
-            user_info = self.df_api.getAuthUser()
+            with self._df_api_lock:
+                self.df_api.loginByPassword(self.username, self.password)
+                user_info = self.df_api.getAuthUser()
+                current_context = self.df_api.getContext()
+            # Pooled sessions (and a factory failure from before the login) belong to the previous user
+            self._client_pool.reset()
+            self._listing_cache.clear()
             if hasattr(user_info, 'username'):
                 self.current_user = user_info.username
             else:
                 self.current_user = str(user_info)
-            self.current_context = self.df_api.getContext()
+            self.current_context = current_context
             ids, titles = self.get_available_contexts()
             self.available_contexts = {title: id_ for id_, title in zip(ids, titles)}
             self.param['selected_context'].objects = self.available_contexts
@@ -222,7 +343,8 @@ class DataFedApp(param.Parameterized):
             self.record_output_pane.object = "<h3>Login Successful!</h3>"
             self.show_login_panel = False
             if ep:
-                self.df_api.endpointDefaultSet(ep)
+                with self._df_api_lock:
+                    self.df_api.endpointDefaultSet(ep)
                 print(f"Successfully set up the endpoint with ID: {ep}")
             else:
                 print("No endpoint ID found. Please check the environment variable.")
@@ -230,29 +352,57 @@ class DataFedApp(param.Parameterized):
         except Exception as e:
             self.record_output_pane.object = f"<h3>Invalid username or password: {e}</h3>"
     def logout(self, event):
-        self.df_api.logout()
+        with self._df_api_lock:
+            self.df_api.logout()
+        self._client_pool.reset()
+        self._listing_cache.clear()
         self.current_user = "Not Logged In"
         self.current_context = "No Context"
         self.record_output_pane.object = "<h3>Logged out successfully!</h3>"
         self.username = ""
         self.password = ""
                     
-    def update_collections(self, event):
+    async def update_collections(self, event):
         context_id = self.selected_context
 
         if context_id:
-            collections = self.get_collections_in_context(context_id)
+            # Collections and the records listing are fetched concurrently off the UI thread
+            with param.parameterized.discard_events(self):
+                self.record_page = 0
+            collections, records = await asyncio.gather(
+                self.get_collections_in_context_async(context_id),
+                self.get_records_async(self.selected_collection or 'root', context_id, 0, self.record_search)
+            )
             self.available_collections = collections
             self.param['selected_collection'].objects = collections  # Update collection options in the Selector
             if self.selected_collection is None:
                 self.selected_collection = 'root'  # Default to 'root'
-            self.update_records()
+            self.show_records(records)
 
 
+    def _list_items(self, coll_id, context, offset=0, count=None):
+        """collectionItemsList through the listing cache"""
+        kwargs = {"offset": offset, "context": context}
+        if count is not None:
+            kwargs["count"] = count
+        return self._listing_cache.get_or_fetch(
+            ("items", context, coll_id, offset, count),
+            lambda: self._call_df_api("collectionItemsList", coll_id, **kwargs)
+        )
+
+    async def _list_items_async(self, coll_id, context, offset=0, count=None):
+        return await self._listing_cache.get_or_fetch_async(
+            ("items", context, coll_id, offset, count),
+            lambda: self.datafed.collection_items_list(coll_id, offset=offset, count=count, context=context)
+        )
+
+    def _list_projects(self):
+        """projectList through the listing cache"""
+        return self._listing_cache.get_or_fetch(("projects",), lambda: self._call_df_api("projectList"))
+
     def get_collections_in_context(self, context):
         try:
-            self.df_api.setContext(context)
-            items_list = self.df_api.collectionItemsList('root', context=context)
+            items_list = self._list_items('root', context)
             collections = {item.title: item.id for item in items_list[0].item if item.id.startswith("c/")}
             collections['root'] = 'root' 
             return collections
@@ -260,20 +410,122 @@ class DataFedApp(param.Parameterized):
             print(f"Error fetching collections: {e}")
             return {"Error": str(e)}
 
+    async def get_collections_in_context_async(self, context):
+        try:
+            # DataFed lists collections ahead of records, so stop paging at the first page holding a record
+            collections = {}
+            offset = 0
+            while True:
+                reply = (await self._list_items_async('root', context, offset, SEARCH_SCAN_PAGE))[0]
+                collections.update({item.title: item.id for item in reply.item if item.id.startswith("c/")})
+                offset += len(reply.item)
+                if any(item.id.startswith("d/") for item in reply.item) or self._last_page(reply, offset):
+                    break
+            collections['root'] = 'root'
+            return collections
+        except Exception as e:
+            print(f"Error fetching collections: {e}")
+            return {"Error": str(e)}
 
-    def update_metadata_from_file_selector(self, event):
+    async def get_records_async(self, coll_id, context, page=0, search=""):
+        """
+        One page of records in a collection as ({title: id}, total), or the exception if the listing failed.
+        With search, only records whose title or ID matches are listed. The next page is prefetched into the listing cache.
+        """
+        size = self.record_page_size
+        offset = page * size
         try:
-            selected_file = self.file_selector.value[0] if self.file_selector.value else None
-            if selected_file:
-                print(f"Selected file: {self.file_selector.value}")
-                metadata = get_file_metadata(selected_file) 
-                self.metadata_json_editor.value = metadata if metadata else {}
-            else:
-                self.metadata_json_editor.value = {}
-        except json.JSONDecodeError as e:
-            self.metadata_json_editor.value = {"error": f"Invalid JSON file: {e}"}
+            if search:
+                return await self._search_records_async(coll_id, context, search, offset, size)
+            reply = (await self._list_items_async(coll_id, context, offset, size))[0]
+            records = {item.title: item.id for item in reply.item if item.id.startswith("d/")}
+            total = getattr(reply, 'total', 0) or offset + len(reply.item)
+            if offset + size < total:
+                asyncio.ensure_future(self._prefetch_items(coll_id, context, offset + size, size))
+            return records, total
+        except Exception as e:
+            return e
+
+    @staticmethod
+    def _last_page(reply, consumed):
+        """Whether a listing reply ends the listing, given how many items have been read so far"""
+        total = getattr(reply, 'total', 0)
+        if not reply.item:
+            return True
+        if total:
+            return consumed >= total
+        return len(reply.item) < SEARCH_SCAN_PAGE
+
+    async def _prefetch_items(self, coll_id, context, offset, count):
+        try:
+            await self._list_items_async(coll_id, context, offset, count)
         except Exception as e:
-            self.metadata_json_editor.value = {"error": f"Error processing file: {e}"}
+            print(f"Error prefetching records: {e}")
+
+    async def _search_records_async(self, coll_id, context, search, offset, count):
+        """
+        Records matching search, filtered by DataFed's query service; if that is not available,
+        collection pages are scanned and filtered here, keeping only the requested page of matches.
+        """
+        async def query():
+            return await self.datafed.call(
+                "queryDirect",
+                coll=None if coll_id == 'root' else [coll_id],
+                text=search,
+                offset=offset,
+                count=count,
+                context=context
+            )
+        try:
+            reply = (await self._listing_cache.get_or_fetch_async(
+                ("items", context, coll_id, "search", search, offset, count), query
+            ))[0]
+            records = {item.title: item.id for item in reply.item if item.id.startswith("d/")}
+            return records, getattr(reply, 'total', 0) or offset + len(reply.item)
+        except Exception as e:
+            print(f"Server-side record search unavailable, filtering locally: {e}")
+
+        needle = search.lower()
+        records = {}
+        matched = 0
+        scanned = 0
+        while True:
+            reply = (await self._list_items_async(coll_id, context, scanned, SEARCH_SCAN_PAGE))[0]
+            for item in reply.item:
+                if item.id.startswith("d/") and (needle in item.title.lower() or needle in item.id.lower()):
+                    if matched >= offset and len(records) < count:
+                        records[item.title] = item.id
+                    matched += 1
+            scanned += len(reply.item)
+            if self._last_page(reply, scanned):
+                break
+        return records, matched
+
+    async def on_record_page_change(self, event):
+        await self.refresh_records()
+
+    async def on_record_search_change(self, event):
+        if self.record_page:
+            self.record_page = 0  # the page watcher refreshes the listing
+        else:
+            await self.refresh_records()
+
+    def previous_record_page(self, event=None):
+        if self.record_page > 0:
+            self.record_page -= 1
+
+    def next_record_page(self, event=None):
+        if (self.record_page + 1) * self.record_page_size < self.record_total:
+            self.record_page += 1
+
+    async def refresh_records(self):
+        """Reload the current page of the record picker"""
+        if not self.selected_context:
+            return
+        self.show_records(await self.get_records_async(
+            self.selected_collection or 'root', self.selected_context, self.record_page, self.record_search
+        ))
+
 
     def create_record(self, event):
         if not self.title or not self.metadata_json_editor.value:
@@ -290,18 +542,21 @@ class DataFedApp(param.Parameterized):
             self.record_output_pane.object = "<h3>Warning: No file selected. Creating record with metadata only.</h3>"
             
         try:
-            if self.selected_context:
-                self.df_api.setContext(self.selected_context)
-            response = self.df_api.dataCreate(
-                title=self.title,
-                metadata=json.dumps(self.metadata_json_editor.value),
-                parent_id=self.available_collections[self.selected_collection] 
-            )
+            with self._df_api_lock:
+                if self.selected_context:
+                    self.df_api.setContext(self.selected_context)
+                response = self.df_api.dataCreate(
+                    title=self.title,
+                    metadata=json.dumps(self.metadata_json_editor.value),
+                    parent_id=self.available_collections[self.selected_collection] 
+                )
             record_id = response[0].data[0].id
+            self._listing_cache.invalidate("items", self.selected_context)
             
             if file_to_upload:
                 try:
-                    res = self.df_api.dataPut(
+                    res = self._call_df_api(
+                        "dataPut",
                         data_id=record_id, 
                         wait=False,
                         path=file_to_upload
@@ -318,54 +573,71 @@ class DataFedApp(param.Parameterized):
             self.record_output_pane.object = f"<h3>Error: Failed to create record: {e}</h3>"
 
     def update_records(self,event=None):
+        """Reload the first page of records (used after our own creates and deletes)"""
+        with param.parameterized.discard_events(self):
+            self.record_page = 0
+            self.record_search = ""
         try:
-            selected_collection = self.available_collections.get(self.selected_collection)
-            items_list = self.df_api.collectionItemsList(coll_id=self.selected_collection, context=self.selected_context)
-            records = {item.title: item.id for item in items_list[0].item if item.id.startswith("d/")}
-            self.param['record_id'].objects = records
-            if records:
-                self.record_id = next(iter(records))
-            else:
-                self.record_id = None
-                self.record_output_pane.object = "<h3>No records found in the selected collection</h3>"
-        
+            size = self.record_page_size
+            reply = self._list_items(self.selected_collection, self.selected_context, 0, size)[0]
+            records = {item.title: item.id for item in reply.item if item.id.startswith("d/")}
+            result = records, getattr(reply, 'total', 0) or len(reply.item)
         except Exception as e:
-            self.record_output_pane.object = f"<h3>Error: Failed to fetch records: {e}</h3>"
+            result = e
+        self.show_records(result)
+
+    def show_records(self, result):
+        """Fill the record selector from a ({title: id}, total) page (or report the exception the listing raised)"""
+        if isinstance(result, Exception):
+            self.record_output_pane.object = f"<h3>Error: Failed to fetch records: {result}</h3>"
+            return
+        records, self.record_total = result
+        pages = max(1, -(-self.record_total // self.record_page_size))
+        self.record_page_pane.object = f"Page {self.record_page + 1} of {pages} ({self.record_total} items)"
+        self.prev_page_button.disabled = self.record_page == 0
+        self.next_page_button.disabled = self.record_page + 1 >= pages
+        self.param['record_id'].objects = records
+        if records:
+            self.record_id = next(iter(records))
+        else:
+            self.record_id = None
+            self.record_output_pane.object = "<h3>No records found in the selected collection</h3>"
 
     def on_metadata_change(self, event):
         """Callback to handle changes in the JSON editor."""
         self.metadata_changed = True
-    def update_metadata_from_file_selector(self, event):
-            try:
-                selected_file = self.file_selector.value[0] if self.file_selector.value else None
-                if selected_file:
-                    print(f"Selected file: {self.file_selector.value}")
-                    metadata = get_file_metadata(selected_file)  # Get metadata using utility function
-                    
-                    # If there is metadata, set the mode to 'tree'
-                    if metadata:
-                        self.metadata_json_editor.mode = 'tree'
-                        self.metadata_json_editor.value = metadata
-                    else:
-                        # If no metadata, set the mode to 'text'
-                        self.metadata_json_editor.mode = 'text'
-                        self.metadata_json_editor.value = {}
-                else:
-                    # If no file is selected, set the mode to 'text' and clear the editor
-                    self.metadata_json_editor.mode = 'text'
-                    self.metadata_json_editor.value = {}
-            except json.JSONDecodeError as e:
-                self.metadata_json_editor.value = {"error": f"Invalid JSON file: {e}"}
-            except Exception as e:
-                self.metadata_json_editor.value = {"error": f"Error processing file: {e}"}
-
-    def read_record(self, event):
+
+    async def update_metadata_from_file_selector(self, event):
+        selected_file = self.file_selector.value[0] if self.file_selector.value else None
+        if not selected_file:
+            # If no file is selected, set the mode to 'text' and clear the editor
+            self.metadata_json_editor.mode = 'text'
+            self.metadata_json_editor.value = {}
+            return
+        print(f"Selected file: {self.file_selector.value}")
+        try:
+            # Extraction can take seconds for large files, so it runs off the UI thread
+            loop = asyncio.get_running_loop()
+            metadata = await loop.run_in_executor(None, self.extract_metadata, selected_file)
+        except json.JSONDecodeError as e:
+            metadata = {"error": f"Invalid JSON file: {e}"}
+        except Exception as e:
+            metadata = {"error": f"Error processing file: {e}"}
+
+        # A newer selection replaces this one
+        if not self.file_selector.value or self.file_selector.value[0] != selected_file:
+            return
+        # If there is metadata, set the mode to 'tree'
+        self.metadata_json_editor.mode = 'tree' if metadata else 'text'
+        self.metadata_json_editor.value = metadata if metadata else {}
+
+    async def read_record(self, event):
         if not self.record_id:
             self.record_output_pane.object = "<h3>Warning: Record ID is required</h3>"
             return
         try:            
             if self.selected_context:
-                response = self.df_api.dataView(data_id=self.record_id, context=self.selected_context)
+                response = await self.datafed.data_view(self.record_id, context=self.selected_context)
                 res = MessageToJson(response[0])
                 res_json = json.loads(res)
 
@@ -391,7 +663,7 @@ class DataFedApp(param.Parameterized):
 
         try:
             if self.selected_context and self.metadata_changed:
-                self.df_api.setContext(self.selected_context)
+                self._call_df_api("setContext", self.selected_context)
                 
                 # Prepare parameters for the dataUpdate call
                 update_params = {
@@ -453,7 +725,8 @@ class DataFedApp(param.Parameterized):
                 print(f"update_params:{update_params}")
                 if update_params:
                     # Call the dataUpdate method with the updated parameters
-                    response = self.df_api.dataUpdate(**update_params)
+                    response = self._call_df_api("dataUpdate", **update_params)
+                    self._listing_cache.invalidate("items", self.selected_context)
                     self.record_output_pane.object = f"<h3>Success: Record updated with new metadata</h3>"
                     self.metadata_changed = False  # Reset the change flag after updating
                 else:
@@ -474,9 +747,11 @@ class DataFedApp(param.Parameterized):
             self.record_output_pane.object = "<h3>Warning: Record ID is required</h3>"
             return
         try:
-            if self.selected_context:
-                self.df_api.setContext(self.selected_context)
-            response = self.df_api.dataDelete(f"{self.record_id}")
+            with self._df_api_lock:
+                if self.selected_context:
+                    self.df_api.setContext(self.selected_context)
+                response = self.df_api.dataDelete(f"{self.record_id}")
+            self._listing_cache.invalidate("items", self.selected_context)
             self.metadata_json_editor.value = {}  # Clear the JSON editor
             self.original_metadata = {}  # Reset the original metadata tracking
             self.record_output_pane.object = f"<h3>Success: Record :{self.record_id} successfully deleted  </h3>"
@@ -490,24 +765,26 @@ class DataFedApp(param.Parameterized):
             self.record_output_pane.object = "<h3>Warning: Source ID and destination collection are required</h3>"
             return
         try:
-            if self.selected_context:
-                self.df_api.setContext(self.selected_context)
-            source_record = self.df_api.dataView(f"d/{self.source_id}")
-            source_details = source_record[0].data[0]
-            new_record = self.df_api.dataCreate(
-                title=source_details.title,
-                metadata=source_details.metadata,
-                parent=self.dest_collection
-            )
-            new_record_id = new_record[0].data[0].id
-            self.df_api.dataMove(f"d/{self.source_id}", new_record_id)
+            with self._df_api_lock:
+                if self.selected_context:
+                    self.df_api.setContext(self.selected_context)
+                source_record = self.df_api.dataView(f"d/{self.source_id}")
+                source_details = source_record[0].data[0]
+                new_record = self.df_api.dataCreate(
+                    title=source_details.title,
+                    metadata=source_details.metadata,
+                    parent=self.dest_collection
+                )
+                new_record_id = new_record[0].data[0].id
+                self.df_api.dataMove(f"d/{self.source_id}", new_record_id)
+            self._listing_cache.invalidate("items")
             self.record_output_pane.object = f"<h3>Success: Data transferred to new record ID: {new_record_id}</h3>"
         except Exception as e:
             self.record_output_pane.object = f"<h3>Error: Failed to transfer data: {e}</h3>"
 
     def get_projects(self, event):
         try:
-            response = self.df_api.projectList()
+            response = self._list_projects()
             projects = response[0].item
             projects_list = [{"id": project.id, "title": project.title} for project in projects]
             self.projects_json_pane.object = projects_list
@@ -516,7 +793,7 @@ class DataFedApp(param.Parameterized):
 
     def get_available_contexts(self):
         try:
-            response = self.df_api.projectList()
+            response = self._list_projects()
             projects = response[0].item
             return [project.id for project in projects], [project.title for project in projects]
         except Exception as e:
@@ -547,18 +824,24 @@ class DataFedApp(param.Parameterized):
         self.start_auto_button.disabled = True
         self.stop_auto_button.disabled = False
         
-        # Start processing in a separate thread to avoid blocking the UI
-        processing_thread = threading.Thread(target=self.process_new_data, daemon=True)
-        processing_thread.start()
+        # The ingest service processes on its own thread to avoid blocking the UI
+        self._configure_ingest()
+        self.ingest.start()
         
     def stop_auto_processing(self, event=None):
         """Stop automated processing"""
         self.auto_processing = False
         self.processing_status = "Stopping..."
-        self.start_auto_button.disabled = False
+        self.ingest.stop()
+        # Start stays disabled until the service reports that it stopped (running transfers are drained first)
+        self.start_auto_button.disabled = True
         self.stop_auto_button.disabled = True
         
     def update_file_tracking_panes(self):
+        """Schedule a rebuild of the file tracking panes; repeated calls between UI ticks are coalesced"""
+        self.ui_publisher.invalidate('file_tracking')
+
+    def _render_file_tracking_panes(self):
         """Update the file tracking panes with current status"""
         # Update current file pane
         if self.current_processing_file:
@@ -570,7 +853,7 @@ class DataFedApp(param.Parameterized):
         if self.processed_files_list:
             processed_text = "### Processed Files\n\n"
             for file in self.processed_files_list[-10:]:  # Show last 10 files
-                processed_text += f"✅ {os.path.basename(file)}\n"
+                processed_text += f"✅ {file}\n"
             self.processed_files_pane.object = processed_text
         else:
             self.processed_files_pane.object = "### Processed Files\n\nNo files processed yet"
@@ -579,204 +862,65 @@ class DataFedApp(param.Parameterized):
         if self.unprocessed_files_list:
             unprocessed_text = "### Files to Process\n\n"
             for file in self.unprocessed_files_list[:10]:  # Show next 10 files
-                unprocessed_text += f"⏳ {os.path.basename(file)}\n"
+                unprocessed_text += f"⏳ {file}\n"
             self.unprocessed_files_pane.object = unprocessed_text
         else:
             self.unprocessed_files_pane.object = "### Files to Process\n\nNo files in queue"
 
+    def _configure_ingest(self):
+        """Copy the auto-processing params, directory and target collection into the ingest service"""
+        for name in INGEST_DEFAULTS:
+            setattr(self.ingest, name, getattr(self, name))
+        self.ingest.watch_directory = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
+        self._sync_ingest_target()
+
+    def _sync_ingest_target(self, event=None):
+        """Records created by auto-processing go to the currently selected project and collection"""
+        self.ingest.context = self.selected_context
+        self.ingest.coll_id = self.available_collections.get(self.selected_collection, self.selected_collection) or "root"
+
     def process_single_file(self, dir_path):
         """Process a single file or directory with DataFed operations"""
-        try:
-            dirname = os.path.basename(dir_path)
-            file_title = os.path.splitext(dirname)[0]
-            zip_path = None  # Initialize zip_path variable
-            
-            print(f"Starting to process: {dirname}")
-            
-            # Check if it's a directory
-            if os.path.isdir(dir_path):
-                print(f"Directory detected: {dir_path}")
-                # ZIP LOGIC COMMENTED OUT - Processing directory directly instead of zipping
-                # # Create temp_zips directory if it doesn't exist
-                # # Use current auto-processing directory for temp_zips
-                # base_dir = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
-                # temp_zips_dir = os.path.join(base_dir, "temp_zips")
-                # try:
-                #     if not os.path.exists(temp_zips_dir):
-                #         os.makedirs(temp_zips_dir, exist_ok=True)
-                #         print(f"Created temp_zips directory: {temp_zips_dir}")
-                #     
-                #     # Test write permissions
-                #     test_file = os.path.join(temp_zips_dir, "test_write.tmp")
-                #     try:
-                #         with open(test_file, 'w') as f:
-                #             f.write("test")
-                #         os.remove(test_file)
-                #     except (IOError, PermissionError) as e:
-                #         error_msg = f"Permission error: Cannot write to temp_zips directory. Please check permissions for: {temp_zips_dir}"
-                #         print(error_msg)
-                #         self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                #         return False
-                #         
-                # except PermissionError as e:
-                #     error_msg = f"Permission error: Cannot create temp_zips directory. Please check permissions for: {base_dir}"
-                #     print(error_msg)
-                #         self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                #         return False
-                # except Exception as e:
-                #     error_msg = f"Error creating temp_zips directory: {str(e)}"
-                #         print(error_msg)
-                #         self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                #         return False
-                # 
-                # # Create a zip file of the directory with timestamp
-                # timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                # zip_filename = f"{file_title}_{timestamp}.zip"
-                # zip_path = os.path.join(temp_zips_dir, zip_filename)
-                # 
-                # try:
-                #     print(f"Creating zip file: {zip_path}")
-                #     
-                #     # First, count total files for progress bar
-                #     total_files = 0
-                #     for root, dirs, files in os.walk(dir_path):
-                #         total_files += len(files)
-                #     
-                #     self.processing_status = "Zipping directory..."
-                #     self.total_files = total_files
-                #     self.progress = 0
-                #     self.current_processing_file = f"Zipping {dirname}"
-                #         self.update_file_tracking_panes()
-                #     
-                #     processed_files = 0
-                #     with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                #         for root, dirs, files in os.walk(dir_path):
-                #             for file in files:
-                #                 try:
-                #                     file_full_path = os.path.join(root, file)
-                #                     # Calculate the relative path for the file in the zip
-                #                     rel_path = os.path.relpath(file_full_path, dir_path)
-                #                     zipf.write(file_full_path, rel_path)
-                #     
-                #                                     # Update progress
-                #                                     processed_files += 1
-                #                                     self.progress = int((processed_files / total_files) * 100)
-                #                                     self.current_processing_file = f"Zipping {dirname} - {processed_files}/{total_files} files"
-                #                                     self.update_file_tracking_panes()
-                #     
-                #                                 except PermissionError as e:
-                #                                     print(f"Permission error accessing file {file_full_path}: {str(e)}")
-                #                                     continue
-                #                                 except Exception as e:
-                #                                     print(f"Error processing file {file_full_path}: {str(e)}")
-                #                                     continue
-                #     
-                #     print(f"Successfully created zip file: {zip_path}")
-                #     # Use the zip file for further processing
-                #     dir_path = zip_path
-                #     dirname = zip_filename
-                #     file_title = os.path.splitext(dirname)[0]
-                #     
-                #     # Add zip file to cleanup tracking
-                #     self.add_to_zip_zip_cleanup_log(zip_path)
-                #     
-                #     # Reset progress for next stage
-                #     self.progress = 0
-                #     self.current_processing_file = f"Uploading {dirname}"
-                #         self.update_file_tracking_panes()
-                #     
-                # except PermissionError as e:
-                #     error_msg = f"Permission error: Cannot create zip file. Please check permissions for: {temp_zips_dir}"
-                #     print(error_msg)
-                #         self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                #         return False
-                # except Exception as e:
-                #     error_msg = f"Error creating zip file: {str(e)}"
-                #     print(error_msg)
-                #         self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                #         return False
-                
-                # Process directory directly without zipping
-                print(f"Processing directory directly: {dir_path}")
-                self.processing_status = f"Processing directory: {dirname}"
-                self.current_processing_file = f"Processing {dirname}"
-                self.update_file_tracking_panes()
-            
-            # Try to extract metadata if possible, otherwise use basic file info
-            try:
-                metadata = get_file_metadata(dir_path)
-                print(f"Successfully extracted metadata for {dirname}")
-            except Exception as e:
-                print(f"Could not extract specialized metadata: {str(e)}")
-                # Create basic metadata with file stats
-                try:
-                    file_stat = os.stat(dir_path)
-                    metadata = {
-                        "filename": dirname,
-                        "filesize": file_stat.st_size,
-                        "modified_time": datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                        "created_time": datetime.datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                        "file_type": os.path.splitext(dirname)[1],
-                        "error": str(e)
-                    }
-                    print(f"Created basic metadata for {dirname}")
-                except PermissionError as e:
-                    error_msg = f"Permission error: Cannot access file metadata. Please check permissions for: {dir_path}"
-                    print(error_msg)
-                    self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                    return False
-                except Exception as e:
-                    error_msg = f"Error accessing file metadata: {str(e)}"
-                    print(error_msg)
-                    self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                    return False
-                
-            # Set the context
-            if self.selected_context:
-                self.df_api.setContext(self.selected_context)
-                print(f"Using context: {self.selected_context}")
-                
-            # Create record
-            print(f"Creating DataFed record for {dirname}")
-            response = self.df_api.dataCreate(
-                title=file_title,
-                metadata=json.dumps(metadata),
-                parent_id=self.available_collections[self.selected_collection]
-            )
-            
-            record_id = response[0].data[0].id
-            self.task_id = record_id
-            print(f"Created record with ID: {record_id}")
-            
-            # Put data
-            print(f"Uploading file to DataFed: {dir_path}")
-            try:
-                res = self.df_api.dataPut(
-                    data_id=record_id,
-                    wait=False,
-                    path=dir_path
-                )
-                print(f"res: {res}")
-                self.record_output_pane.object = f"<h3>Success: Record created with ID {record_id}</h3>"
-                print(f"File upload initiated for {dirname} with record {record_id}")
-            except PermissionError as e:
-                error_msg = f"Permission error: Cannot upload file to DataFed. Please check permissions for: {dir_path}"
-                print(error_msg)
-                self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                return False
-            except Exception as e:
-                error_msg = f"Error uploading file to DataFed: {str(e)}"
-                print(error_msg)
-                self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-                return False
-            
-            return True
-            
-        except Exception as e:
-            error_msg = f"Error processing directory {dir_path}: {str(e)}"
-            print(error_msg)
-            self.record_output_pane.object = f"<h3>{error_msg}</h3>"
-            return False
+        return self.ingest.process_single_file(dir_path)
+
+    def get_extraction_service(self):
+        """Process-pool metadata extraction service shared by the UI and auto-processing"""
+        return self.ingest.get_extraction_service()
+
+    def extract_metadata(self, file_path):
+        """Extract metadata through the ingest service's on-disk cache, so re-selected or retried files are instant"""
+        return self.ingest.extract_metadata(file_path)
+
+    def _create_session_api(self):
+        """Client pool factory: a new authenticated API instance, or None if it cannot log in"""
+        api = API()
+        if not api.getAuthUser() and self.username and self.password:
+            api.loginByPassword(self.username, self.password)
+        if not api.getAuthUser():
+            return None
+        if ep:
+            api.endpointDefaultSet(ep)
+        return api
+
+    @contextmanager
+    def _datafed_session(self):
+        """
+        Yield a DataFed API instance for the calling thread.
+        Background threads lease an instance from the client pool, which skips setContext calls
+        that would not change the instance's context; if no instance can be authenticated, and
+        on the UI thread, the shared UI session is used under its lock.
+        """
+        if threading.current_thread() is threading.main_thread():
+            with self._df_api_lock:
+                yield self.df_api
+            return
+        with self._client_pool.session() as api:
+            yield api
+
+    def _call_df_api(self, method, *args, **kwargs):
+        """Call a method of the shared UI session under its lock"""
+        with self._df_api_lock:
+            return getattr(self.df_api, method)(*args, **kwargs)
 
     # ZIP CLEANUP METHODS COMMENTED OUT - No longer creating zip files
     # def add_to_zip_cleanup_log(self, zip_path):
@@ -849,209 +993,18 @@ class DataFedApp(param.Parameterized):
     #         except Exception as e:
     #             print(f"Error in zip cleanup process: {str(e)}")
 
+    def get_ledger(self):
+        """Open (or reuse) the processed-items ledger for the current auto-processing directory"""
+        return self.ingest.get_ledger()
+
     def get_processed_files(self):
-        """Get the list of already processed files from the log"""
-        # Use current auto-processing directory for log file
-        base_dir = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
-        if not base_dir:
-            print("No valid directory for log file")
-            return []
-            
-        log_path = os.path.join(base_dir, self.log_file)
-        try:
-            with open(log_path, 'r') as f:
-                log_data = json.load(f)
-                return log_data.get("processed_dirs", [])
-        except (json.JSONDecodeError, FileNotFoundError):
-            # If the file doesn't exist or is invalid, create a new one
-            with open(log_path, 'w') as f:
-                json.dump({"processed_dirs": []}, f)
-            return []
-            
-    def add_to_processed_log(self, dirname):
-        """Add a processed directory to the log"""
-        # Use current auto-processing directory for log file
-        base_dir = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
-        if not base_dir:
-            print("No valid directory for log file")
-            return
-            
-        log_path = os.path.join(base_dir, self.log_file)
-        try:
-            with open(log_path, 'r') as f:
-                log_data = json.load(f)
-                
-            if dirname not in log_data["processed_dirs"]:
-                log_data["processed_dirs"].append(dirname)
-                
-            # Add timestamp
-            if "timestamps" not in log_data:
-                log_data["timestamps"] = {}
-                    
-            log_data["timestamps"][dirname] = datetime.datetime.now().isoformat()
-            
-            with open(log_path, 'w') as f:
-                json.dump(log_data, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error updating log file: {str(e)}")
+        """Get the already processed files from the ledger (supports O(1) `in` checks), or None without a directory"""
+        return self.ingest.get_ledger()
 
     def process_new_data(self):
-        """Process new data files in directories"""
-        # Use the current auto-processing directory
-        base_dir = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
-        print(f"Base directory: {base_dir}")
-        
-        try:
-            # Check if base directory is valid
-            if not base_dir or not os.path.exists(base_dir) or not os.path.isdir(base_dir):
-                print(f"Invalid base directory: {base_dir}")
-                self.processing_status = f"Error: Invalid base directory {base_dir}"
-                return
-            
-            # Create log file if it doesn't exist
-            log_path = os.path.join(base_dir, self.log_file)
-            print(f"Log path: {log_path}")
-            
-            # Make sure the directory exists
-            log_dir = os.path.dirname(log_path)
-            if not os.path.exists(log_dir):
-                print(f"Creating log directory: {log_dir}")
-                os.makedirs(log_dir, exist_ok=True)
-                
-            if not os.path.exists(log_path):
-                print(f"Creating new log file at {log_path}")
-                with open(log_path, 'w') as f:
-                    json.dump({"processed_dirs": []}, f)
-                print(f"Created new log file at {log_path}")
-                
-            while self.auto_processing:
-                # Get the current directory at the start of each cycle
-                current_base_dir = self.file_path if hasattr(self, 'file_path') and self.file_path else FILE_PATH
-                if current_base_dir != base_dir:
-                    base_dir = current_base_dir
-                    print(f"Directory changed during processing, now using: {base_dir}")
-                
-                # ZIP CLEANUP COMMENTED OUT - No longer creating zip files
-                # self.cleanup_old_zip_files()
-                
-                # Read the log file to get processed directories
-                processed_dirs = self.get_processed_files()
-                self.processed_files_list = processed_dirs
-                print(f"Found {len(processed_dirs)} previously processed directories in log")
-                
-                # Get all directories and files in the base directory
-                all_items = []
-                
-                # First, add files in the current directory
-                current_files = []
-                try:
-                    for item in os.listdir(base_dir):
-                        item_path = os.path.join(base_dir, item)
-                        if os.path.isfile(item_path):
-                            # Skip temp files and logs
-                            if not item.startswith('.') and not item.endswith('.tmp') and not item.endswith('.log'):
-                                current_files.append(item_path)
-                except Exception as e:
-                    print(f"Error reading current directory: {e}")
-                
-                # Then add subdirectories
-                all_dirs = []
-                for root, dirs, files in os.walk(base_dir):
-                    # Skip $RECYCLE.BIN directory and temp_zips directory
-                    if os.path.basename(root) in ["$RECYCLE.BIN", "temp_zips"]:
-                        print(f"Skipping directory: {root}")
-                        continue
-                    
-                    # Add the current directory if it's not the base directory itself
-                    if root != base_dir:
-                        all_dirs.append(root)
-                
-                # Combine files and directories
-                all_items = current_files + all_dirs
-                
-                print(f"Found {len(current_files)} files and {len(all_dirs)} directories to process")
-                print(f"Total items to process: {len(all_items)}")
-                
-                # Filter out already processed items
-                new_items = [item for item in all_items if os.path.basename(item) not in processed_dirs]
-                self.unprocessed_files_list = [os.path.basename(item) for item in new_items]
-                
-                print(f"Found {len(new_items)} new unprocessed items")
-                for item in new_items[:5]:  # Print up to 5 examples
-                    print(f"  - {item}")
-                if len(new_items) > 5:
-                    print(f"  - ... and {len(new_items) - 5} more")
-                
-                if new_items:
-                    self.processing_status = f"Found {len(new_items)} new items to process"
-                    self.total_files = len(new_items)
-                    self.progress = 0
-                    
-                    for idx, item_path in enumerate(new_items):
-                        if not self.auto_processing:
-                            break
-                            
-                        itemname = os.path.basename(item_path)
-                        self.current_file = itemname
-                        self.current_processing_file = itemname
-                        
-                        # Check if it's a file or directory
-                        if os.path.isfile(item_path):
-                            self.processing_status = f"Processing file {itemname}"
-                            print(f"Processing file {idx+1}/{len(new_items)}: {itemname}")
-                        else:
-                            self.processing_status = f"Processing directory {itemname}"
-                            print(f"Processing directory {idx+1}/{len(new_items)}: {itemname}")
-                        
-                        self.progress = int((idx / self.total_files) * 100)
-                        
-                        # Update the file tracking panes
-                        self.update_file_tracking_panes()
-                        
-                        # Process the item (file or directory)
-                        success = self.process_single_file(item_path)
-                        
-                        if success:
-                            print(f"Successfully processed: {itemname}")
-                            # Add to processed items log
-                            self.add_to_processed_log(itemname)
-                            # Update processed items list
-                            self.processed_files_list.append(itemname)
-                            # Remove from unprocessed items list
-                            if itemname in self.unprocessed_files_list:
-                                self.unprocessed_files_list.remove(itemname)
-                        else:
-                            print(f"Failed to process: {itemname}")
-                        
-                        # Update the file tracking panes again
-                        self.update_file_tracking_panes()
-                        
-                        # Small delay to prevent overwhelming the system
-                        time.sleep(1)
-                    
-                    self.progress = 100
-                    self.processing_status = "Processing complete"
-                    self.current_processing_file = ""
-                    print("Completed processing batch of items")
-                else:
-                    self.processing_status = "No new items found"
-                    print("No new items found in this scan")
-                
-                # Update the file tracking panes one last time
-                self.update_file_tracking_panes()
-                
-                # Wait before checking again
-                print(f"Waiting 5 seconds before next scan...")
-                time.sleep(5)
-                
-        except Exception as e:
-            error_msg = f"Error in process_new_data: {str(e)}"
-            print(error_msg)
-            self.processing_status = f"Error: {str(e)}"
-            self.auto_processing = False
-            self.start_auto_button.disabled = False
-            self.stop_auto_button.disabled = True
+        """Process new data in the auto-processing directory until auto-processing is stopped (blocking)"""
+        self._configure_ingest()
+        self.ingest.run()
 
     # Removed update_auto_processing_directory method - no longer needed
 
@@ -1060,6 +1013,8 @@ class DataFedApp(param.Parameterized):
         if os.path.exists(new_directory) and os.path.isdir(new_directory):
             old_path = getattr(self, 'file_path', 'Not set')
             self.file_path = new_directory
+            # Picked up by a running ingest service at the start of its next cycle
+            self.ingest.watch_directory = new_directory
             print(f"Auto-processing directory changed from '{old_path}' to: {new_directory}")
             # Update the file selector as well
             self.file_selector.directory = new_directory
@@ -1112,25 +1067,12 @@ class DataFedApp(param.Parameterized):
             print(f"Synced file selector with auto-processing directory: {self.file_path}")
     
     def get_auto_processing_directory_info(self):
-        """Get information about the current auto-processing directory"""
-        if hasattr(self, 'file_path') and self.file_path:
-            try:
-                if os.path.exists(self.file_path):
-                    files = [f for f in os.listdir(self.file_path) if os.path.isfile(os.path.join(self.file_path, f))]
-                    dirs = [f for f in os.listdir(self.file_path) if os.path.isdir(os.path.join(self.file_path, f))]
-                    total_size = sum(os.path.getsize(os.path.join(self.file_path, f)) for f in files)
-                    return {
-                        'path': self.file_path,
-                        'file_count': len(files),
-                        'dir_count': len(dirs),
-                        'total_size': total_size,
-                        'exists': True
-                    }
-                else:
-                    return {'path': self.file_path, 'exists': False}
-            except Exception as e:
-                return {'path': self.file_path, 'error': str(e)}
-        return {'path': None, 'exists': False}
+        """
+        Get information about the current auto-processing directory (counts, total bytes and the pending backlog).
+        Served from the memoized stats, which the processing loop keeps current; the directory is
+        only listed again when they are older than dir_stats_interval
+        """
+        return self.ingest.directory_info(getattr(self, 'file_path', None))
     
     def go_to_parent_directory(self, event=None):
         """Navigate to the parent directory"""
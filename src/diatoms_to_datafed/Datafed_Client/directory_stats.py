@@ -0,0 +1,101 @@
+import os
+import time
+import threading
+
+
+class DirectoryStats:
+    """
+    Memoized statistics of the auto-processing directory's top level (file and directory counts,
+    total file bytes) plus the pending backlog. The processing loop pushes what its own scans found
+    with update_from_entries() and set_backlog(); the directory itself is only listed again when
+    the numbers are older than max_age seconds.
+    """
+    def __init__(self, max_age=30.0):
+        """
+        :param max_age: Seconds after which get() lists the directory again.
+        """
+        self.max_age = max_age
+        self._info = {'path': None, 'exists': False}
+        self._updated = 0.0
+        self._backlog = {}  # pending item -> bytes
+        self._lock = threading.Lock()
+
+    def _set_counts(self, path, file_count, dir_count, total_size):
+        with self._lock:
+            if path != self._info.get('path'):
+                self._backlog = {}
+            self._info = {
+                'path': path,
+                'file_count': file_count,
+                'dir_count': dir_count,
+                'total_size': total_size,
+                'exists': True
+            }
+            self._updated = time.monotonic()
+
+    def refresh(self, path):
+        """List path once (a single scandir pass) and update the counts."""
+        file_count = dir_count = total_size = 0
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            dir_count += 1
+                        elif entry.is_file():
+                            file_count += 1
+                            total_size += entry.stat().st_size
+                    except OSError:
+                        continue
+        except FileNotFoundError:
+            with self._lock:
+                self._info = {'path': path, 'exists': False}
+                self._updated = time.monotonic()
+            return
+        except OSError as e:
+            with self._lock:
+                self._info = {'path': path, 'error': str(e)}
+                self._updated = time.monotonic()
+            return
+        self._set_counts(path, file_count, dir_count, total_size)
+
+    def update_from_entries(self, path, entries):
+        """Update the counts from a listing the caller already has: {name: (mtime_ns, size, inode, is_dir)}."""
+        files = [info for info in entries.values() if not info[3]]
+        self._set_counts(path, len(files), len(entries) - len(files), sum(info[1] for info in files))
+
+    def set_backlog(self, items, size_fn=None):
+        """
+        Add items to the pending backlog, or update their sizes if they are already in it.
+        Items leave the backlog through discard() once they have been processed.
+        :param items: Item paths waiting to be processed.
+        :param size_fn: Callable(path) -> bytes; by default files are stat'ed and directories count as 0.
+        """
+        size_fn = size_fn or (lambda p: os.path.getsize(p) if os.path.isfile(p) else 0)
+        backlog = {}
+        for item in items:
+            try:
+                backlog[item] = size_fn(item)
+            except OSError:
+                continue
+        with self._lock:
+            self._backlog.update(backlog)
+
+    def discard(self, item):
+        """Drop an item from the backlog once it has been processed."""
+        with self._lock:
+            self._backlog.pop(item, None)
+
+    def get(self, path):
+        """Return the statistics of path, listing it only if the cached numbers are for another path or stale."""
+        if not path:
+            return {'path': None, 'exists': False}
+        with self._lock:
+            stale = path != self._info.get('path') or time.monotonic() - self._updated > self.max_age
+        if stale:
+            self.refresh(path)
+        with self._lock:
+            info = dict(self._info)
+            info['backlog_count'] = len(self._backlog)
+            info['backlog_bytes'] = sum(self._backlog.values())
+        return info
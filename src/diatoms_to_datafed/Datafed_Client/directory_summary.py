@@ -0,0 +1,167 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from MetaXtract import MyEncoder
+from compaction import _is_number
+from extractors import REGISTRY
+from snapshot import SKIP_DIRS
+
+# Distinct example values kept for a key that varies between files
+MAX_EXAMPLES = 3
+
+
+def _list_files(dir_path, is_candidate_file=None):
+    """Every candidate file below dir_path as (path, size), in walk order."""
+    files = []
+    stack = [dir_path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    if is_candidate_file is None or is_candidate_file(entry.name):
+                        files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+    return files
+
+
+def _flatten(metadata, prefix=()):
+    """{('a', 'b'): value} for every leaf of a nested dictionary."""
+    flat = {}
+    for key, value in metadata.items():
+        path = prefix + (str(key),)
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, path))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _unflatten(flat):
+    nested = {}
+    for path, value in flat.items():
+        node = nested
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return nested
+
+
+def _identity(value):
+    """Hashable stand-in for a metadata value, so lists and numpy values can be compared."""
+    try:
+        return json.dumps(value, cls=MyEncoder, sort_keys=True)
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+def _variance(values):
+    """Compact description of the values one key takes across files."""
+    distinct = {}
+    for value in values:
+        distinct.setdefault(_identity(value), value)
+    summary = {"files": len(values), "distinct": len(distinct)}
+    if all(_is_number(value) for value in values):
+        summary["min"] = min(values)
+        summary["max"] = max(values)
+    else:
+        summary["examples"] = list(distinct.values())[:MAX_EXAMPLES]
+    return summary
+
+
+def merge_metadata(documents):
+    """
+    Merge per-file metadata documents.
+    :param documents: List of metadata dictionaries.
+    :return: (common, varying): the nested keys every document has with the same value, and
+             {"dotted.key": variance} for the keys that differ or only some documents have.
+    """
+    flats = [_flatten(doc) for doc in documents]
+    paths = {}
+    for flat in flats:
+        for path in flat:
+            paths.setdefault(path, None)
+    common = {}
+    varying = {}
+    for path in paths:
+        values = [flat[path] for flat in flats if path in flat]
+        if len(values) == len(flats) and len({_identity(value) for value in values}) == 1:
+            common[path] = values[0]
+        else:
+            varying[".".join(path)] = _variance(values)
+    return _unflatten(common), varying
+
+
+def summarize_directory(dir_path, extract, max_files=32, max_bytes=1024 * 1024 * 1024, workers=2,
+                        is_candidate_file=None):
+    """
+    One record-level metadata document for a directory: the contained files are extracted in parallel
+    within a budget of file count and bytes, keys shared by all of them are kept once and keys that
+    differ are recorded with their variance.
+    :param dir_path: Directory to summarize.
+    :param extract: Callable(file path) -> metadata dictionary.
+    :param max_files: Most files extracted.
+    :param max_bytes: Most bytes (sum of file sizes) extracted; files of known formats are picked first.
+    :param workers: Extractions run at the same time.
+    :param is_candidate_file: Optional callable(name) -> bool to skip temp and log files.
+    :return: Metadata dictionary.
+    """
+    files = _list_files(dir_path, is_candidate_file)
+    file_types = {}
+    for path, _ in files:
+        extension = os.path.splitext(path)[1].lower() or "(none)"
+        file_types[extension] = file_types.get(extension, 0) + 1
+
+    # Known formats first, then the rest in walk order, until a budget runs out
+    known = set(REGISTRY.extensions())
+    ordered = sorted(files, key=lambda f: os.path.splitext(f[0])[1].lower() not in known)
+    selected = []
+    budget = max_bytes
+    for path, size in ordered:
+        if len(selected) >= max_files:
+            break
+        if size > budget:
+            continue
+        selected.append(path)
+        budget -= size
+
+    def extract_one(path):
+        try:
+            return extract(path)
+        except Exception as e:
+            return {"error": str(e)}
+
+    if selected:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(selected)))) as executor:
+            results = list(executor.map(extract_one, selected))
+    else:
+        results = []
+
+    # Stat-only results of unsupported files and failures would only add noise to the merge
+    documents = [
+        metadata for metadata in results
+        if isinstance(metadata, dict) and not metadata.get("unsupported_type") and "error" not in metadata
+    ]
+    common, varying = merge_metadata(documents)
+    return {
+        "directory": os.path.basename(os.path.normpath(dir_path)),
+        "file_count": len(files),
+        "total_bytes": sum(size for _, size in files),
+        "file_types": file_types,
+        "summarized_files": len(documents),
+        "failed_files": sum(1 for metadata in results if not isinstance(metadata, dict) or "error" in metadata),
+        "skipped_files": len(files) - len(selected),
+        "common": common,
+        "varying": varying,
+    }
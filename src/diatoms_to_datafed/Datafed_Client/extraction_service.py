@@ -0,0 +1,103 @@
+import os
+import time
+import threading
+import multiprocessing as mp
+from util import basic_file_metadata, get_file_metadata
+
+# Seconds allowed per extraction, by file extension
+DEFAULT_TIMEOUTS = {
+    '.dm4': 300,
+    '.h5': 120,
+    '.xrdml': 60,
+    '.ibw': 30,
+    '.json': 10,
+}
+
+
+def _extract_in_worker(file_path, extractor_options=None):
+    """Runs inside a pool worker process."""
+    return get_file_metadata(file_path, extractor_options)
+
+
+class ExtractionService:
+    """
+    Runs metadata extractors in a pool of worker processes so that slow or crashing
+    extractors cannot stall the auto-processing loop or the UI.
+    Every extraction has a per-format timeout; when it expires (or a worker dies and its task is lost)
+    the pool is torn down and restarted, and basic file metadata is returned instead.
+    Workers are recycled after max_tasks_per_child extractions to cap memory growth.
+    """
+    def __init__(self, workers=2, max_tasks_per_child=50, timeouts=None, default_timeout=60, extractor_options=None):
+        """
+        :param workers: Number of worker processes.
+        :param max_tasks_per_child: Extractions a worker runs before it is replaced.
+        :param timeouts: Mapping of extension -> timeout in seconds, merged over DEFAULT_TIMEOUTS.
+        :param default_timeout: Timeout for extensions not in timeouts.
+        :param extractor_options: Mapping of extractor class name -> keyword arguments (see util.get_file_metadata).
+        """
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.default_timeout = default_timeout
+        self.extractor_options = dict(extractor_options or {})
+        # spawn avoids forking the Panel/tornado process with its threads and sockets
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._pool = None
+        self._generation = 0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._ctx.Pool(self.workers, maxtasksperchild=self.max_tasks_per_child)
+            return self._pool, self._generation
+
+    def _restart(self, generation):
+        """Terminate the pool unless another caller already replaced it since generation."""
+        with self._lock:
+            if generation != self._generation or self._pool is None:
+                return
+            print("Restarting metadata extraction pool")
+            self._pool.terminate()
+            self._pool = None
+            self._generation += 1
+
+    def timeout_for(self, file_path):
+        return self.timeouts.get(os.path.splitext(file_path)[1].lower(), self.default_timeout)
+
+    def extract(self, file_path):
+        """
+        Extract metadata for file_path in a worker process.
+        Always returns a dictionary; timeouts and worker crashes yield basic file metadata with an error.
+        """
+        if os.path.isdir(file_path):
+            # Directories only get stat metadata, which is not worth a round trip to a worker
+            return get_file_metadata(file_path)
+
+        timeout = self.timeout_for(file_path)
+        deadline = time.monotonic() + timeout
+        while True:
+            pool, generation = self._get_pool()
+            async_result = pool.apply_async(_extract_in_worker, (file_path, self.extractor_options))
+            # Wait in short slices so a restart triggered by another item is noticed
+            # and this item is resubmitted instead of being lost with the old pool
+            while not async_result.ready() and generation == self._generation:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._restart(generation)
+                    print(f"Metadata extraction timed out after {timeout}s: {file_path}")
+                    return basic_file_metadata(file_path, error=f"Metadata extraction timed out after {timeout}s")
+                async_result.wait(min(0.5, remaining))
+            if async_result.ready():
+                break
+        try:
+            return async_result.get()
+        except Exception as e:
+            return basic_file_metadata(file_path, error=str(e))
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
+                self._generation += 1
@@ -0,0 +1,239 @@
+import os
+import sys
+import importlib
+import threading
+
+if sys.version_info[:2] >= (3, 8):
+    from importlib.metadata import entry_points
+else:
+    from importlib_metadata import entry_points
+
+# Out-of-tree formats register here: entry point name = extension, value = "module:MetaXtractorSubclass"
+ENTRY_POINT_GROUP = "diatoms_to_datafed.extractors"
+
+# Built-in formats as "module:class"; a module (and its backend, e.g. hyperspy for .dm4) is only imported on first use
+BUILTIN_EXTRACTORS = {
+    ".h5": "materials.AFM.bandexcitation.h5:H5",
+    ".xrdml": "materials.Xray.panalytical.xrdml:XRDML",
+    ".dm4": "materials.EM.dm.dm4:DM4",
+    ".ibw": "materials.AFM.oxfordAFM.ibw:IBW",
+    ".hdf5": "materials.AFM.bandexcitation.h5:H5",
+}
+
+# Bytes read from the start of a file to recognize its format
+SNIFF_BYTES = 4096
+
+_HDF5 = b"\x89HDF\r\n\x1a\n"
+# The HDF5 superblock follows an optional user block of 512, 1024, 2048, ... bytes (probed up to 2 GiB)
+_HDF5_OFFSETS = (0,) + tuple(512 << k for k in range(23))
+
+# Content signatures of the built-in formats, so they are recognized whatever the extension.
+# A signature is a tuple of (offset, bytes) pairs that must all match; offset None means anywhere in the first SNIFF_BYTES.
+# Offsets beyond the first SNIFF_BYTES are read with a seek.
+# Formats without a reliable signature (.ibw) are dispatched by extension only.
+BUILTIN_SIGNATURES = {
+    "materials.AFM.bandexcitation.h5:H5": tuple(((offset, _HDF5),) for offset in _HDF5_OFFSETS),
+    # Version 4, then an 8-byte length and a 4-byte byte-order flag (0 or 1)
+    "materials.EM.dm.dm4:DM4": (
+        ((0, b"\x00\x00\x00\x04"), (12, b"\x00\x00\x00\x01")),
+        ((0, b"\x00\x00\x00\x04"), (12, b"\x00\x00\x00\x00")),
+    ),
+    "materials.Xray.panalytical.xrdml:XRDML": (((None, b"<xrdMeasurements"),),),
+}
+
+
+def _normalize(extension):
+    extension = extension.lower()
+    return extension if extension.startswith(".") else "." + extension
+
+
+def _matches(head, signatures, read_at=None):
+    """
+    Whether the first bytes of a file match any of the signatures.
+    :param read_at: Callable(offset, length) -> bytes for markers past the end of head.
+    """
+    for signature in signatures:
+        if all(_marker_at(head, offset, marker, read_at) for offset, marker in signature):
+            return True
+    return False
+
+
+def _marker_at(head, offset, marker, read_at):
+    if offset is None:
+        return marker in head
+    if offset + len(marker) <= len(head) or read_at is None or len(head) < SNIFF_BYTES:
+        return head[offset:offset + len(marker)] == marker
+    return read_at(offset, len(marker)) == marker
+
+
+class _FileProbe:
+    """read_at() for _matches: opens the file on the first read beyond the head and skips offsets past its end."""
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = None
+        self._size = 0
+
+    def __call__(self, offset, length):
+        if self._file is None:
+            self._file = open(self.file_path, "rb")
+            self._size = os.fstat(self._file.fileno()).st_size
+        if offset + length > self._size:
+            return b""
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _load_spec(spec):
+    """Resolve a "module:class" string or an entry point to the extractor class."""
+    if isinstance(spec, str):
+        module_name, _, attr = spec.partition(":")
+        return getattr(importlib.import_module(module_name), attr)
+    if isinstance(spec, type):
+        return spec
+    return spec.load()
+
+
+class ExtractorRegistry:
+    """
+    Maps file extensions and content signatures to MetaXtractor subclasses without importing them up front.
+    resolve() reads the first SNIFF_BYTES of a file, so mislabelled HDF5 or DM files still reach the
+    right extractor and files whose content contradicts their extension fall back to basic metadata
+    instead of failing slowly inside a parser. Signature offsets past SNIFF_BYTES (large HDF5 user blocks)
+    are probed with a seek, for the extension's own format only. The signatures tried for each extension are cached,
+    with the format that last matched it tried first.
+    Entry points in ENTRY_POINT_GROUP are read from the installed package metadata on first lookup
+    (nothing is imported) and override the built-in formats; register() overrides both.
+    """
+    def __init__(self, builtins=None, signatures=None, discover=True):
+        """
+        :param builtins: Mapping of extension -> "module:class", defaults to BUILTIN_EXTRACTORS.
+        :param signatures: Mapping of "module:class" -> signatures, defaults to BUILTIN_SIGNATURES.
+        :param discover: Also look up extractors registered as entry points.
+        """
+        self._specs = {_normalize(ext): spec for ext, spec in (builtins or BUILTIN_EXTRACTORS).items()}
+        self._signatures = dict(BUILTIN_SIGNATURES if signatures is None else signatures)
+        self._classes = {}  # spec -> extractor class
+        self._dispatch = {}  # extension -> specs to sniff, in order
+        self._discovered = not discover
+        self._lock = threading.Lock()
+
+    def _discover_locked(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        try:
+            eps = entry_points()
+            group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+        except Exception as e:
+            print(f"Could not read extractor entry points: {e}")
+            return
+        for ep in group:
+            self._specs[_normalize(ep.name)] = ep
+        self._dispatch = {}
+
+    def _load_locked(self, spec):
+        cls = self._classes.get(spec)
+        if cls is None:
+            cls = self._classes[spec] = _load_spec(spec)
+            # Out-of-tree extractors can declare their own signatures
+            if getattr(cls, "magic", None) and spec not in self._signatures:
+                self._signatures[spec] = cls.magic
+                self._dispatch = {}
+        return cls
+
+    def register(self, extension, extractor):
+        """
+        Register an extractor for an extension.
+        :param extractor: MetaXtractor subclass (its magic attribute is used for sniffing),
+                          or "module:class" to import it lazily.
+        """
+        extension = _normalize(extension)
+        with self._lock:
+            self._discover_locked()
+            self._specs[extension] = extractor
+            if isinstance(extractor, type) and getattr(extractor, "magic", None):
+                self._signatures[extractor] = extractor.magic
+            self._dispatch = {}
+
+    def get(self, extension):
+        """Return the extractor class for extension, importing it on first use; None if the type is unsupported."""
+        extension = _normalize(extension)
+        with self._lock:
+            self._discover_locked()
+            spec = self._specs.get(extension)
+            return None if spec is None else self._load_locked(spec)
+
+    def _candidates_locked(self, extension):
+        candidates = self._dispatch.get(extension)
+        if candidates is None:
+            expected = self._specs.get(extension)
+            candidates = [expected] if expected in self._signatures else []
+            candidates += [spec for spec in self._signatures if spec != expected]
+            self._dispatch[extension] = candidates
+        return candidates
+
+    def resolve(self, file_path, head=None):
+        """
+        Pick the extractor for file_path from its first bytes, then its extension.
+        :param head: The file's first bytes, if the caller already read them.
+        :return: (extractor class, None); (None, None) for unsupported types;
+                 (None, reason) when the content does not match the extension's format.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if head is None:
+            with open(file_path, "rb") as f:
+                head = f.read(SNIFF_BYTES)
+        with self._lock:
+            self._discover_locked()
+            candidates = self._candidates_locked(extension)
+            signatures = [(spec, self._signatures[spec]) for spec in candidates]
+            expected = self._specs.get(extension)
+        probe = _FileProbe(file_path)
+        try:
+            for i, (spec, signature) in enumerate(signatures):
+                if _matches(head, signature, probe if spec == expected else None):
+                    with self._lock:
+                        if i and self._dispatch.get(extension) is candidates and spec in candidates:
+                            # Remember the format files with this extension turned out to be
+                            candidates.remove(spec)
+                            candidates.insert(0, spec)
+                        return self._load_locked(spec), None
+        finally:
+            probe.close()
+        with self._lock:
+            expected = self._specs.get(extension)
+            if expected is None:
+                return None, None
+            if expected in self._signatures:
+                return None, f"Content does not match the {extension} format"
+            return self._load_locked(expected), None
+
+    def extensions(self):
+        with self._lock:
+            self._discover_locked()
+            return sorted(self._specs)
+
+    def loaded(self):
+        """Extractors imported so far, as their specs."""
+        with self._lock:
+            return sorted(str(spec) for spec in self._classes)
+
+
+REGISTRY = ExtractorRegistry()
+
+
+def register_extractor(extension, extractor):
+    REGISTRY.register(extension, extractor)
+
+
+def get_extractor(extension):
+    return REGISTRY.get(extension)
+
+
+def resolve_extractor(file_path):
+    return REGISTRY.resolve(file_path)
@@ -13,9 +13,27 @@ from panel.widgets.input import TextInput
 from panel.io import PeriodicCallback
 from panel.util import fullpath
 from fnmatch import fnmatch
+from bisect import insort
 
 pn.extension('material')
 
+# Directory listings shared by all FileSelectors: path -> (mtime_ns, sorted dirs, sorted files)
+_LISTING_CACHE = {}
+LISTING_CACHE_SIZE = 64
+
+def _resort(old_sorted, new):
+    """Sorted version of new, patched from the previous sorted listing when only a few entries changed"""
+    new_set = set(new)
+    old_set = set(old_sorted)
+    added = new_set - old_set
+    if len(added) + len(old_set - new_set) > len(old_sorted) // 4:
+        return sorted(new)
+    result = [p for p in old_sorted if p in new_set]
+    for p in added:
+        insort(result, p)
+    return result
+
+
 class FileSelector(CompositeWidget):
     directory = param.String(default=os.getcwd(), doc="The directory to explore.")
     file_pattern = param.String(default='*', doc="A glob-like pattern to filter the files.")
@@ -24,6 +42,7 @@ class FileSelector(CompositeWidget):
     size = param.Integer(default=10, doc="The number of options shown at once (note this is the only way to control the height of this widget)")
     refresh_period = param.Integer(default=None, doc="If set to non-None value indicates how frequently to refresh the directory contents in milliseconds.")
     root_directory = param.String(default=None, doc="If set, overrides directory parameter as the root directory beyond which users cannot navigate.")
+    virtual_window = param.Integer(default=None, doc="If set, only this many entries (the visible rows plus a buffer) are sent to the browser at a time; the rest are reached through paging entries at either end of the list, and file_pattern is applied on the server.")
     value = param.List(default=[], doc="List of selected files.")
     _composite_type: ClassVar[type[Column]] = Column
 
@@ -54,10 +73,20 @@ class FileSelector(CompositeWidget):
             self._back, self._forward, self._up, self._directory, self._go, self._reload,
             **dict(layout, width=None, margin=0, width_policy='max')
         )
+        if self.virtual_window:
+            self._pattern = TextInput(value=self.file_pattern, placeholder='Filter (glob)', width=120, margin=(5, 0, 0, 10))
+            self._pattern.param.watch(self._pattern_change, 'value')
+            self._nav_bar.append(self._pattern)
+        self._window_info = pn.pane.Markdown("", margin=(0, 5))
         self._composite[:] = [self._nav_bar, Divider(margin=0), self._selector]
+        if self.virtual_window:
+            self._composite.append(self._window_info)
 
         self._stack = []
         self._cwd = None
+        self._listing = None  # (cwd, file_pattern, option labels) of the last update, reused by _filter_denylist
+        self._window_start = 0
+        self._pager = {}  # paging option label -> window start it jumps to
         self._position = -1
         self._update_files(True)
 
@@ -74,6 +103,7 @@ class FileSelector(CompositeWidget):
         self._selector._lists[False].param.watch(self._filter_denylist, 'options')
         self._periodic = PeriodicCallback(callback=self._refresh, period=self.refresh_period or 0)
         self.param.watch(self._update_periodic, 'refresh_period')
+        self.param.watch(self._file_pattern_change, 'file_pattern')
         if self.refresh_period:
             self._periodic.start()
 
@@ -84,6 +114,9 @@ class FileSelector(CompositeWidget):
         self._composite.append(self._output)
 
     def _select_and_go(self, event):
+        if event.option in self._pager:
+            self._window_start = self._pager[event.option]
+            return self._update_files(refresh=True)
         relpath = event.option.replace('📁', '').replace('⬆ ', '')
         if relpath == 'panel.':
             return self._go_up()
@@ -135,6 +168,14 @@ class FileSelector(CompositeWidget):
     def _refresh(self):
         self._update_files(refresh=True)
 
+    def _pattern_change(self, event):
+        self.file_pattern = event.new or '*'
+
+    def _file_pattern_change(self, event):
+        self._window_start = 0
+        if self._cwd is not None:
+            self._update_files(refresh=True)
+
     def _update_files(self, event=None, refresh=False):
         path = fullpath(self._directory.value)
         refresh = refresh or (event and getattr(event, 'obj', None) is self._reload)
@@ -148,6 +189,8 @@ class FileSelector(CompositeWidget):
             self._stack.append(path)
             self._position += 1
 
+        if path != self._cwd:
+            self._window_start = 0
         self._cwd = path
         if not refresh:
             self._go.disabled = True
@@ -158,22 +201,39 @@ class FileSelector(CompositeWidget):
             self._back.disabled = False
 
         selected = self.value
-        dirs, files = self._scan_path(path, self.file_pattern)
+        force = bool(event and getattr(event, 'obj', None) is self._reload)
+        dirs, files = self._scan_path(path, self.file_pattern, force=force)
+        dir_set = set(dirs)
+        listed = dir_set.union(files)
+        extra_dirs, extra_files = [], []
         for s in selected:
+            if s in listed:
+                continue
             check = os.path.realpath(s) if os.path.islink(s) else s
             if os.path.isdir(check):
-                dirs.append(s)
+                extra_dirs.append(s)
             elif os.path.isfile(check):
-                files.append(s)
+                extra_files.append(s)
+        if extra_dirs or extra_files:
+            dir_set.update(extra_dirs)
+            dirs, files = sorted(dirs + extra_dirs), sorted(files + extra_files)
 
         paths = [
-            p for p in sorted(dirs) + sorted(files)
+            p for p in dirs + files
             if self.show_hidden or not os.path.basename(p).startswith('.')
         ]
+        paths, pager = self._window(paths)
         abbreviated = [
-            ('📁' if f in dirs else '') + os.path.relpath(f, self._cwd)
+            ('📁' if f in dir_set else '') + self._relpath(f)
             for f in paths
         ]
+        for label, start in pager:
+            at = 0 if start < self._window_start else len(paths)
+            paths.insert(at, f'panel.{label}')
+            abbreviated.insert(at, label)
+        self._pager = dict(pager)
+        # The '⬆ panel.' entry is not part of the listing; _filter_denylist adds it back itself
+        self._listing = (path, self.file_pattern, set(abbreviated))
         if not self._up.disabled:
             paths.insert(0, 'panel.')
             abbreviated.insert(0, '⬆ panel.')
@@ -182,9 +242,43 @@ class FileSelector(CompositeWidget):
         self._selector.options = options
         self._selector.value = selected
 
+    def _window(self, paths):
+        """
+        Cut the sorted listing down to virtual_window entries starting at _window_start.
+        Returns the slice and [(label, window start)] paging entries for the parts left out.
+        """
+        total = len(paths)
+        window = self.virtual_window
+        if not window or total <= window:
+            self._window_info.object = ""
+            return paths, []
+        start = max(0, min(self._window_start, total - window))
+        end = min(start + window, total)
+        self._window_start = start
+        # Pages overlap by the visible rows so the user keeps their place
+        step = max(1, window - self.size)
+        pager = []
+        if start > 0:
+            pager.append((f'⋯ previous {min(step, start)} entries', max(0, start - step)))
+        if end < total:
+            pager.append((f'⋯ next {min(step, total - end)} of {total} entries', start + step))
+        self._window_info.object = f"Showing {start + 1}–{end} of {total} entries"
+        return paths[start:end], pager
+
+    def _relpath(self, path):
+        # Entries of the current directory only need their name
+        if os.path.dirname(path) == self._cwd:
+            return os.path.basename(path)
+        return os.path.relpath(path, self._cwd)
+
     def _filter_denylist(self, event):
-        dirs, files = self._scan_path(self._cwd, self.file_pattern)
-        paths = [('📁' if p in dirs else '') + os.path.relpath(p, self._cwd) for p in dirs + files]
+        # Reuse the listing of the navigation that changed the options instead of listing the directory again
+        if self._listing is not None and self._listing[:2] == (self._cwd, self.file_pattern):
+            paths = self._listing[2]
+        else:
+            dirs, files = self._scan_path(self._cwd, self.file_pattern)
+            paths = {'📁' + self._relpath(p) for p in dirs}
+            paths.update(self._relpath(p) for p in files)
         denylist = self._selector._lists[False]
         options = dict(self._selector._items)
         self._selector.options.clear()
@@ -195,7 +289,9 @@ class FileSelector(CompositeWidget):
         options = [o for o in denylist.options if o in paths]
         if not self._up.disabled:
             options.insert(0, '⬆ panel.')
-        denylist.options = options
+        # Assigning an unchanged list would fire this watcher again
+        if options != denylist.options:
+            denylist.options = options
 
     def _select(self, event):
         if len(event.new) != 1:
@@ -259,16 +355,37 @@ class FileSelector(CompositeWidget):
             self._output[:] = [self._selected_file_display, self._message]  # Replace with message
             return None
 
-    def _scan_path(self, path, file_pattern):
-        paths = [os.path.join(path, p) for p in os.listdir(path)]
-        dirs = [p for p in paths if os.path.isdir(p)]
-        files = [p for p in paths if os.path.isfile(p) and fnmatch(os.path.basename(p), file_pattern)]
-        for p in paths:
-            if not os.path.islink(p):
-                continue
-            path = os.path.realpath(p)
-            if os.path.isdir(path):
-                dirs.append(p)
-            elif os.path.isfile(path):
-                files.append(p)
+    def _list_dir(self, path, force=False):
+        """(dirs, files) directly in path, served from the listing cache unless the directory's mtime changed"""
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _LISTING_CACHE.get(path)
+        if cached is not None and cached[0] == mtime_ns and not force:
+            return cached[1], cached[2]
+        dirs, files = [], []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    # DirEntry knows the type from the directory read; only symlinks cost a stat
+                    if entry.is_dir():
+                        dirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+        if cached is not None:
+            dirs = _resort(cached[1], dirs)
+            files = _resort(cached[2], files)
+        else:
+            dirs.sort()
+            files.sort()
+        _LISTING_CACHE.pop(path, None)
+        _LISTING_CACHE[path] = (mtime_ns, dirs, files)
+        while len(_LISTING_CACHE) > LISTING_CACHE_SIZE:
+            del _LISTING_CACHE[next(iter(_LISTING_CACHE))]
         return dirs, files
+
+    def _scan_path(self, path, file_pattern, force=False):
+        dirs, files = self._list_dir(path, force)
+        if file_pattern != '*':
+            files = [p for p in files if fnmatch(os.path.basename(p), file_pattern)]
+        return list(dirs), list(files)
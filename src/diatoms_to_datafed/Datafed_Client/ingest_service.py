@@ -0,0 +1,694 @@
+import os
+import json
+import queue
+import hashlib
+import datetime
+import threading
+from extraction_service import ExtractionService
+from metadata_cache import MetadataCache
+from batch_ingest import create_records_batch
+from transfer_monitor import TransferMonitor, task_id_from_reply
+from stability import QuiescenceDetector, is_sidecar
+from watcher import create_watcher
+from snapshot import DirectorySnapshot
+from directory_stats import DirectoryStats
+from directory_summary import summarize_directory
+from compaction import compact_metadata
+from ledger import open_ledger
+from ingest_units import item_key, scan_units, units_for_path
+from upload_pool import UploadPool, ProgressTracker
+
+# Tunables of the pipeline and their defaults; DataFedApp exposes the same names as params
+DEFAULTS = {
+    "ledger_file": "backup_log.db",
+    "log_file": "backup_log.json",
+    "ingest_unit": "top_level",
+    "watcher_backend": "auto",
+    "watch_timeout": 5.0,
+    "stable_window": 10.0,
+    "extract_workers": 2,
+    "upload_workers": 4,
+    "ingest_batch_size": 1,
+    "extraction_timeout": 60.0,
+    "transfer_drain_timeout": 30.0,
+    "extraction_max_tasks": 50,
+    "extractor_options": {},
+    "metadata_cache_file": "~/.cache/diatoms_to_datafed/metadata_cache.db",
+    "metadata_cache_max_mb": 256,
+    "summary_max_files": 32,
+    "summary_max_mb": 1024,
+    "metadata_max_kb": 64,
+    "metadata_max_depth": 8,
+    "snapshot_dir": "~/.cache/diatoms_to_datafed/snapshots",
+    "dir_stats_interval": 30.0,
+}
+
+
+class IngestObserver:
+    """
+    Receives progress from an IngestService. Every method is optional and does nothing by default.
+    Methods are called from the service's threads, so implementations should only record state.
+    """
+    def status(self, text):
+        pass
+
+    def batch_started(self, total):
+        pass
+
+    def progress(self, percent, in_flight):
+        pass
+
+    def backlog(self, keys):
+        """Keys of the items found but not processed yet"""
+        pass
+
+    def history(self, keys):
+        """Keys of the most recently processed items"""
+        pass
+
+    def item_processed(self, key):
+        pass
+
+    def record_created(self, record_id):
+        pass
+
+    def message(self, text):
+        pass
+
+    def stopped(self, error=None):
+        pass
+
+
+class IngestService:
+    """
+    Auto-processing pipeline without any UI: watcher -> stability gate -> metadata extraction ->
+    DataFedRecord creation -> transfer tracking -> ledger. Progress is reported to observers
+    (such as the Panel app), so it can run headless from the command line or behind the UI.
+    """
+    def __init__(self, watch_directory, session, coll_id="root", context=None, tags=None, observers=None, **options):
+        """
+        :param watch_directory: Directory to ingest.
+        :param session: Callable returning a context manager that yields an authenticated DataFed API instance.
+        :param coll_id: Collection the records are created in.
+        :param context: Optional project/user context.
+        :param tags: Optional list of tags added to every record.
+        :param observers: Optional list of IngestObserver.
+        :param options: Overrides for DEFAULTS.
+        """
+        unknown = set(options) - set(DEFAULTS)
+        if unknown:
+            raise TypeError(f"Unknown ingest options: {sorted(unknown)}")
+        self.watch_directory = watch_directory
+        self.session = session
+        self.coll_id = coll_id
+        self.context = context
+        self.tags = tags
+        for name, default in DEFAULTS.items():
+            setattr(self, name, options.get(name, default))
+        self.observers = list(observers or [])
+        self.running = False
+        self._thread = None
+        self._generation = 0
+        self._ledger = None
+        self._extraction_service = None
+        self._metadata_cache = None
+        self._transfer_monitor = None
+        self._failed_transfers = queue.Queue()
+        # Records created for items whose upload has not started or failed: a retry uploads into them
+        self._created_records = {}
+        self._base_dir = None
+        self._dir_stats = DirectoryStats(max_age=self.dir_stats_interval)
+
+    def _notify(self, event, *args):
+        for observer in self.observers:
+            try:
+                getattr(observer, event)(*args)
+            except Exception as e:
+                print(f"Error in ingest observer {event}: {e}")
+
+    def start(self):
+        """
+        Run the pipeline on a background thread. If the previous run is still draining its transfers,
+        the new run waits for it, so it sees the transfers that run stored instead of uploading them again.
+        """
+        if self.running:
+            return
+        self.running = True
+        self._generation += 1
+        previous = self._thread
+        self._thread = threading.Thread(target=self._run_after, args=(previous, self._generation), daemon=True)
+        self._thread.start()
+
+    def _run_after(self, previous, generation):
+        if previous is not None:
+            previous.join()
+        self.run(generation)
+
+    def stop(self, wait=False):
+        """Ask the pipeline to stop after the current batch"""
+        self.running = False
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def close(self):
+        """Stop and release the extraction workers, metadata cache and ledger"""
+        self.stop(wait=True)
+        if self._extraction_service is not None:
+            self._extraction_service.shutdown()
+            self._extraction_service = None
+        if self._metadata_cache is not None:
+            self._metadata_cache.close()
+            self._metadata_cache = None
+        if self._ledger is not None:
+            self._ledger.close()
+            self._ledger = None
+
+    def directory_info(self, path=None):
+        """Memoized statistics of the watched directory, including the pending backlog"""
+        return self._dir_stats.get(path or self.watch_directory)
+
+    def get_extraction_service(self):
+        """Process-pool metadata extraction service"""
+        if self._extraction_service is None:
+            self._extraction_service = ExtractionService(
+                workers=self.extract_workers,
+                max_tasks_per_child=self.extraction_max_tasks,
+                default_timeout=self.extraction_timeout,
+                extractor_options=self.extractor_options
+            )
+        return self._extraction_service
+
+    def extract_metadata(self, file_path):
+        """
+        Extract metadata for a file, or summarize a directory from a bounded sample of the files it contains
+        (extracted in parallel, each through the cache)
+        """
+        if os.path.isdir(file_path):
+            return self.compact(summarize_directory(
+                file_path,
+                self._extract_file,
+                max_files=self.summary_max_files,
+                max_bytes=self.summary_max_mb * 1024 * 1024,
+                workers=self.extract_workers,
+                is_candidate_file=self._is_candidate_file
+            ))
+        return self._extract_file(file_path)
+
+    def compact(self, metadata):
+        """Apply the metadata size budget, whatever extractor produced the metadata"""
+        return compact_metadata(
+            metadata,
+            max_bytes=self.metadata_max_kb * 1024 if self.metadata_max_kb else None,
+            max_depth=self.metadata_max_depth
+        )
+
+    def _extract_file(self, file_path):
+        """Extract metadata through the on-disk cache, so re-selected or retried files are instant"""
+        if self._metadata_cache is None and self.metadata_cache_file:
+            try:
+                # Cached documents are already compacted, so entries written under other compaction
+                # or extractor settings are dropped
+                self._metadata_cache = MetadataCache(
+                    os.path.expanduser(self.metadata_cache_file),
+                    max_bytes=self.metadata_cache_max_mb * 1024 * 1024,
+                    version=f"compact:{self.metadata_max_kb}:{self.metadata_max_depth}:"
+                            + json.dumps(self.extractor_options, sort_keys=True)
+                )
+            except Exception as e:
+                print(f"Metadata cache unavailable: {e}")
+                self.metadata_cache_file = ""
+        if self._metadata_cache is None:
+            return self._extract_compacted(file_path)
+        return self._metadata_cache.get_or_extract(file_path, self._extract_compacted)
+
+    def _extract_compacted(self, file_path):
+        """Extract metadata in the worker processes and apply the size budget before it is cached"""
+        return self.compact(self.get_extraction_service().extract(file_path))
+
+    def get_ledger(self):
+        """Open (or reuse) the processed-items ledger for the watched directory"""
+        base_dir = self.watch_directory
+        if not base_dir:
+            print("No valid directory for log file")
+            return None
+
+        ledger_path = os.path.join(base_dir, self.ledger_file)
+        if self._ledger is None or self._ledger.db_path != ledger_path:
+            if self._ledger is not None:
+                self._ledger.close()
+            # The legacy JSON log is imported the first time the ledger is created
+            self._ledger = open_ledger(ledger_path, legacy_json_path=os.path.join(base_dir, self.log_file))
+        return self._ledger
+
+    def add_to_processed_log(self, key):
+        """Add a processed item (its path relative to the watched directory) to the ledger; writes are committed in batches"""
+        ledger = self.get_ledger()
+        if ledger is None:
+            return
+        try:
+            ledger.add(key)
+        except Exception as e:
+            print(f"Error updating log file: {str(e)}")
+
+    def process_single_file(self, dir_path):
+        """Process a single file or directory with DataFed operations"""
+        metadata = self.extract_item_metadata(dir_path)
+        if metadata is None:
+            return False
+        return self.upload_item(dir_path, metadata) is not None
+
+    def extract_item_metadata(self, dir_path):
+        """Extract metadata for a file or directory, falling back to basic file info; None on failure"""
+        try:
+            dirname = os.path.basename(dir_path)
+            print(f"Extracting metadata for: {dirname}")
+            if os.path.isdir(dir_path):
+                # Directories are uploaded as they are, without zipping
+                print(f"Processing directory directly: {dir_path}")
+
+            # Try to extract metadata if possible, otherwise use basic file info
+            try:
+                metadata = self.extract_metadata(dir_path)
+                print(f"Successfully extracted metadata for {dirname}")
+            except Exception as e:
+                print(f"Could not extract specialized metadata: {str(e)}")
+                # Create basic metadata with file stats
+                try:
+                    file_stat = os.stat(dir_path)
+                    metadata = {
+                        "filename": dirname,
+                        "filesize": file_stat.st_size,
+                        "modified_time": datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+                        "created_time": datetime.datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
+                        "file_type": os.path.splitext(dirname)[1],
+                        "error": str(e)
+                    }
+                    print(f"Created basic metadata for {dirname}")
+                except PermissionError as e:
+                    error_msg = f"Permission error: Cannot access file metadata. Please check permissions for: {dir_path}"
+                    print(error_msg)
+                    self._notify("message", error_msg)
+                    return None
+                except Exception as e:
+                    error_msg = f"Error accessing file metadata: {str(e)}"
+                    print(error_msg)
+                    self._notify("message", error_msg)
+                    return None
+
+            return metadata
+
+        except Exception as e:
+            error_msg = f"Error extracting metadata for {dir_path}: {str(e)}"
+            print(error_msg)
+            self._notify("message", error_msg)
+            return None
+
+    def upload_item(self, dir_path, metadata):
+        """Create a DataFed record for a file or directory and start its upload; returns (record ID, task ID) or None"""
+        try:
+            dirname = os.path.basename(dir_path)
+            file_title = os.path.splitext(dirname)[0]
+
+            with self.session() as api:
+                # Set the context
+                if self.context:
+                    api.setContext(self.context)
+                    print(f"Using context: {self.context}")
+
+                record_id = self._created_records.get(dir_path)
+                if record_id is not None:
+                    print(f"Retrying upload into existing record {record_id} for {dirname}")
+                else:
+                    # Create record
+                    print(f"Creating DataFed record for {dirname}")
+                    kwargs = {"tags": self.tags} if self.tags else {}
+                    response = api.dataCreate(
+                        title=file_title,
+                        metadata=json.dumps(metadata),
+                        parent_id=self.coll_id,
+                        **kwargs
+                    )
+
+                    record_id = response[0].data[0].id
+                    self._created_records[dir_path] = record_id
+                    self._notify("record_created", record_id)
+                    print(f"Created record with ID: {record_id}")
+
+                # Put data
+                print(f"Uploading file to DataFed: {dir_path}")
+                try:
+                    res = api.dataPut(
+                        data_id=record_id,
+                        wait=False,
+                        path=dir_path
+                    )
+                    print(f"res: {res}")
+                    task_id = task_id_from_reply(res)
+                    self._created_records.pop(dir_path, None)
+                    self._notify("message", f"Success: Record created with ID {record_id}")
+                    print(f"File upload initiated for {dirname} with record {record_id}")
+                except PermissionError as e:
+                    error_msg = f"Permission error: Cannot upload file to DataFed. Please check permissions for: {dir_path}"
+                    print(error_msg)
+                    self._notify("message", error_msg)
+                    return None
+                except Exception as e:
+                    error_msg = f"Error uploading file to DataFed: {str(e)}"
+                    print(error_msg)
+                    self._notify("message", error_msg)
+                    return None
+
+            return record_id, task_id
+
+        except Exception as e:
+            error_msg = f"Error processing directory {dir_path}: {str(e)}"
+            print(error_msg)
+            self._notify("message", error_msg)
+            return None
+
+    def upload_batch(self, items):
+        """
+        Create records for a group of (path, metadata) items with one dataBatchCreate call,
+        then start their uploads over the same session. Returns (record ID, task ID) per item, None where the upload failed.
+        Items whose record was created by an earlier attempt only have their upload retried.
+        """
+        existing = {path: self._created_records[path] for path, _ in items if path in self._created_records}
+        new_items = [(path, metadata) for path, metadata in items if path not in existing]
+        with self.session() as api:
+            record_ids = dict(existing)
+            if new_items:
+                print(f"Creating {len(new_items)} DataFed records in one batch")
+                titles = [os.path.splitext(os.path.basename(path))[0] for path, _ in new_items]
+                created = create_records_batch(
+                    api, list(zip(titles, [metadata for _, metadata in new_items])), self.coll_id,
+                    context=self.context or None, tags=self.tags
+                )
+                for (path, _), record_id in zip(new_items, created):
+                    record_ids[path] = self._created_records[path] = record_id
+                    self._notify("record_created", record_id)
+            results = []
+            for path, _ in items:
+                record_id = record_ids[path]
+                try:
+                    res = api.dataPut(data_id=record_id, wait=False, path=path)
+                    print(f"File upload initiated for {os.path.basename(path)} with record {record_id}: {res}")
+                    self._created_records.pop(path, None)
+                    results.append((record_id, task_id_from_reply(res)))
+                except Exception as e:
+                    # The record is kept, so the retry only repeats the dataPut
+                    print(f"Error uploading file to DataFed: {str(e)}")
+                    results.append(None)
+        if new_items:
+            self._notify("message", f"Success: {len(new_items)} records created in one batch")
+        return results
+
+    def _on_transfer_succeeded(self, item_path, record_id):
+        """Transfer monitor callback: the item is only logged as processed once its upload finished"""
+        key = item_key(self._base_dir or os.path.dirname(item_path), item_path)
+        print(f"Transfer finished for {key} (record {record_id})")
+        self._dir_stats.discard(item_path)
+        self.add_to_processed_log(key)
+        self._notify("item_processed", key)
+
+    def _on_transfer_completed(self, item_path, record_id):
+        """
+        Transfer monitor callback: log the item and commit the ledger right away, since the monitor
+        reports after the processing loop's own flushes and a kill would otherwise lose the entry
+        """
+        self._on_transfer_succeeded(item_path, record_id)
+        if self._ledger is not None:
+            self._ledger.flush()
+
+    def _on_transfer_failed(self, item_path, record_id, message):
+        """Transfer monitor callback: hand the item back to the processing loop for another upload into the same record"""
+        print(f"Transfer failed for {os.path.basename(item_path)} (record {record_id}): {message}")
+        self._created_records[item_path] = record_id
+        self._failed_transfers.put(item_path)
+
+    def _resubmit_transfer(self, item_path, record_id):
+        """Transfer monitor callback: restart the upload into the existing record"""
+        with self.session() as api:
+            return task_id_from_reply(api.dataPut(data_id=record_id, wait=False, path=item_path))
+
+    def _is_candidate_file(self, name):
+        """Whether a file should be processed"""
+        # Skip temp files, logs and our own processed-items log
+        return (
+            not name.startswith('.') and not name.endswith('.tmp') and not name.endswith('.log')
+            and name != os.path.basename(self.log_file) and not name.startswith(os.path.basename(self.ledger_file))
+            and not is_sidecar(name)
+        )
+
+    def _open_snapshot(self, base_dir):
+        """Directory snapshot of base_dir, persisted under snapshot_dir so restarts only re-list changed directories"""
+        if self.snapshot_dir:
+            digest = hashlib.sha1(os.path.abspath(base_dir).encode()).hexdigest()[:16]
+            db_path = os.path.join(os.path.expanduser(self.snapshot_dir), f"{digest}.db")
+            try:
+                return DirectorySnapshot(base_dir, db_path)
+            except Exception as e:
+                print(f"Directory snapshot unavailable, scanning in memory: {e}")
+        return DirectorySnapshot(base_dir)
+
+    def _scan_items(self, base_dir, snapshot=None):
+        """
+        Full scan: every item under base_dir for the ingestion unit, pruning subtrees already in the ledger.
+        With a snapshot, it is brought up to date (re-listing only directories whose mtime changed) and walked instead of the disk.
+        """
+        ledger = self.get_ledger()
+        if snapshot is not None:
+            relisted = snapshot.refresh()
+            snapshot.save()
+            print(f"Directory snapshot: {len(snapshot)} directories, {relisted} re-listed")
+        items = scan_units(
+            base_dir,
+            self.ingest_unit,
+            is_ingested=(lambda key: key in ledger) if ledger is not None else (lambda key: False),
+            is_candidate_file=self._is_candidate_file,
+            list_dir=snapshot.children if snapshot is not None else None
+        )
+        print(f"Found {len(items)} items to process ({self.ingest_unit})")
+        return items
+
+    def _items_from_events(self, base_dir, events):
+        """Map watcher events to the items that contain the changed paths"""
+        items = []
+        seen = set()
+        for event in events:
+            if event.kind == "deleted" or not os.path.exists(event.path):
+                continue
+            for item in units_for_path(base_dir, event.path, event.is_dir, self.ingest_unit, self._is_candidate_file):
+                if item not in seen:
+                    seen.add(item)
+                    items.append(item)
+        return items
+
+    def run(self, generation=None):
+        """
+        Process new data until stop() is called.
+        :param generation: Set by start(); a direct call starts a new generation itself.
+        """
+        # A run left over from before a stop/start finishes its batch and exits without touching the new one
+        if generation is None:
+            self.running = True
+            self._generation += 1
+            generation = self._generation
+
+        def active():
+            return self.running and generation == self._generation
+
+        base_dir = self.watch_directory
+        print(f"Base directory: {base_dir}")
+        watcher = None
+        pool = None
+        snapshot = None
+        monitor = None
+        error = None
+
+        try:
+            # Check if base directory is valid
+            if not base_dir or not os.path.exists(base_dir) or not os.path.isdir(base_dir):
+                print(f"Invalid base directory: {base_dir}")
+                self._notify("status", f"Error: Invalid base directory {base_dir}")
+                return
+
+            # Create the ledger if it doesn't exist
+            ledger_path = os.path.join(base_dir, self.ledger_file)
+            print(f"Ledger path: {ledger_path}")
+            ledger_dir = os.path.dirname(ledger_path)
+            if not os.path.exists(ledger_dir):
+                print(f"Creating log directory: {ledger_dir}")
+                os.makedirs(ledger_dir, exist_ok=True)
+            self.get_ledger()
+
+            snapshot = self._open_snapshot(base_dir)
+            watcher = create_watcher(base_dir, backend=self.watcher_backend, snapshot=snapshot)
+            watcher.start()
+            print(f"Watching {base_dir} with {type(watcher).__name__}")
+            pool = UploadPool(
+                self.extract_item_metadata,
+                self.upload_item,
+                extract_workers=self.extract_workers,
+                upload_workers=self.upload_workers
+            )
+            monitor = self._transfer_monitor = TransferMonitor(
+                self.session,
+                on_success=self._on_transfer_completed,
+                on_failure=self._on_transfer_failed,
+                resubmit=self._resubmit_transfer
+            )
+            # Transfers left running by the previous stop are watched again instead of re-uploaded
+            for item, record_id, task_id, started in self._ledger.load_transfers():
+                monitor.track(item, record_id, task_id, started=started)
+            monitor.start()
+            stability = QuiescenceDetector(window=self.stable_window)
+            full_scan = True
+            retry_items = set()
+
+            while active():
+                # Pick up a change of directory at the start of each cycle
+                if self.watch_directory != base_dir:
+                    base_dir = self.watch_directory
+                    print(f"Directory changed during processing, now using: {base_dir}")
+                    watcher.stop()
+                    snapshot.close()
+                    snapshot = self._open_snapshot(base_dir)
+                    watcher = create_watcher(base_dir, backend=self.watcher_backend, snapshot=snapshot)
+                    watcher.start()
+                    full_scan = True
+                    retry_items = set()
+                    stability = QuiescenceDetector(window=self.stable_window)
+
+                active_items = []
+                if full_scan:
+                    # Walk the whole tree once to pick up anything that arrived while we were not watching
+                    all_items = self._scan_items(base_dir, snapshot)
+                    self._dir_stats.update_from_entries(base_dir, snapshot.entries(base_dir))
+                    full_scan = False
+                else:
+                    # Wait for change events; on timeout only the previously failed items are retried
+                    # and the items still settling are re-checked
+                    settling = stability.pending_items()
+                    timeout = min(self.watch_timeout, self.stable_window) if settling else self.watch_timeout
+                    events = watcher.get_events(timeout=timeout)
+                    for event in events:
+                        stability.note_event(event.kind, event.path)
+                    all_items = active_items = self._items_from_events(base_dir, events) if events else []
+                    all_items = all_items + [item for item in settling if item not in all_items]
+                    # Items whose transfer failed for good are retried like any other failure
+                    while not self._failed_transfers.empty():
+                        retry_items.add(self._failed_transfers.get_nowait())
+                    all_items += [item for item in retry_items if item not in all_items]
+                    if not all_items:
+                        continue
+
+                # Read the ledger to get processed items
+                self._base_dir = base_dir
+                processed_dirs = self.get_ledger()
+                self._notify("history", processed_dirs.recent(10))
+                print(f"Found {len(processed_dirs)} previously processed directories in log")
+                print(f"Total items to process: {len(all_items)}")
+
+                # Filter out already processed items, keyed by their path relative to the base directory
+                # Items with a transfer still in flight are not picked up again
+                new_items = [
+                    item for item in all_items
+                    if item_key(base_dir, item) not in processed_dirs and not monitor.is_tracking(item)
+                ]
+                self._notify("backlog", [item_key(base_dir, item) for item in new_items])
+                # Items are sized from the snapshot in one pass rather than walked
+                sizes = snapshot.tree_sizes(new_items)
+                self._dir_stats.set_backlog(new_items, size_fn=sizes.__getitem__)
+
+                # Only hand over items that stopped changing, so acquisitions still being written are not uploaded
+                for item in new_items:
+                    stability.observe(item)
+                for item in active_items:
+                    stability.touch(item)
+                stable = set(stability.ready())
+                waiting = len(new_items) - len(stable)
+                new_items = [item for item in new_items if item in stable]
+                if waiting:
+                    print(f"Waiting for {waiting} items that are still being written")
+
+                print(f"Found {len(new_items)} new unprocessed items")
+                for item in new_items[:5]:  # Print up to 5 examples
+                    print(f"  - {item}")
+                if len(new_items) > 5:
+                    print(f"  - ... and {len(new_items) - 5} more")
+
+                if new_items:
+                    self._notify("status", f"Found {len(new_items)} new items to process")
+                    self._notify("batch_started", len(new_items))
+
+                    tracker = ProgressTracker(len(new_items))
+
+                    def on_start(item_path):
+                        in_flight = tracker.start(os.path.basename(item_path))
+                        kind = "file" if os.path.isfile(item_path) else "directory"
+                        print(f"Processing {kind}: {os.path.basename(item_path)}")
+                        self._notify("progress", None, in_flight)
+                        self._notify("status", f"Processing {tracker.completed}/{tracker.total} items")
+
+                    def on_done(result):
+                        percent, in_flight = tracker.done(os.path.basename(result.path))
+                        self._notify("progress", percent, in_flight)
+                        self._notify("status", f"Processing {tracker.completed}/{tracker.total} items")
+
+                    # Results arrive in submission order, so the ledger is committed in order too
+                    batch_size = self.ingest_batch_size
+                    for result in pool.run(new_items, should_continue=active,
+                                           on_start=on_start, on_done=on_done,
+                                           batch_size=batch_size, upload_batch_fn=self.upload_batch):
+                        itemname = os.path.basename(result.path)
+                        if result.success:
+                            print(f"Successfully processed: {itemname}")
+                            retry_items.discard(result.path)
+                            if result.task_id:
+                                # Logged as processed by the monitor once the transfer succeeds
+                                monitor.track(result.path, result.record_id, result.task_id)
+                            else:
+                                self._on_transfer_succeeded(result.path, result.record_id)
+                        else:
+                            print(f"Failed to process: {itemname} ({result.error})")
+                            retry_items.add(result.path)
+
+                        # In batch mode the ledger is committed once per batch
+                        if batch_size > 1 and (result.index + 1) % batch_size == 0:
+                            processed_dirs.flush()
+
+                    # Commit whatever is left of the last ledger batch
+                    processed_dirs.flush()
+                    self._notify("progress", 100, "")
+                    self._notify("status", "Processing complete")
+                    print("Completed processing batch of items")
+                else:
+                    self._notify("status", "No new items found")
+                    print("No new items found in this scan")
+
+        except Exception as e:
+            error = e
+            print(f"Error in process_new_data: {str(e)}")
+            self._notify("status", f"Error: {str(e)}")
+        finally:
+            if watcher is not None:
+                watcher.stop()
+            if snapshot is not None:
+                snapshot.close()
+            if pool is not None:
+                pool.shutdown(wait=error is None)
+            if monitor is not None:
+                monitor.stop()
+                # Give running transfers a bounded time to finish; the rest are stored and tracked again on restart
+                remaining = monitor.drain(self.transfer_drain_timeout)
+                if remaining:
+                    print(f"{remaining} transfers still running, resuming them on the next start")
+                if self._ledger is not None:
+                    self._ledger.save_transfers(
+                        [(t.item, t.record_id, t.task_id, t.started) for t in monitor.transfers()]
+                    )
+            if self._ledger is not None:
+                self._ledger.flush()
+            if generation == self._generation:
+                self.running = False
+                self._notify("stopped", error)
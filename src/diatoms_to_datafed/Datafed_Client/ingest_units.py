@@ -0,0 +1,98 @@
+import os
+from snapshot import SKIP_DIRS
+
+# What becomes one DataFed record during auto-processing:
+#   top_level - each file or directory directly in the watched directory, keyed by its relative path
+#               (which for these items is the name); directories are not descended into
+#   leaf_dir  - each directory without sub-directories, plus files lying next to sub-directories
+#   file      - each file, at any depth
+INGEST_UNITS = ("top_level", "leaf_dir", "file")
+
+
+def item_key(base_dir, path):
+    """
+    Ledger key of an item: its path relative to base_dir, with '/' separators.
+    For top-level items this is the plain name, which is what older ledgers stored.
+    """
+    return os.path.relpath(path, base_dir).replace(os.sep, "/")
+
+
+def _list_dir(path):
+    """Return (file paths, directory paths) directly in path, skipping SKIP_DIRS"""
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            dirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError as e:
+        print(f"Error reading directory {path}: {e}")
+    return files, dirs
+
+
+def scan_units(base_dir, unit="top_level", is_ingested=lambda key: False, is_candidate_file=lambda name: True,
+               list_dir=None):
+    """
+    Walk base_dir and return the items to ingest under the given unit policy.
+    Directories whose key is already ingested are pruned and never listed.
+    :param base_dir: Watched directory.
+    :param unit: One of INGEST_UNITS.
+    :param is_ingested: Callable(key) telling whether an item was already ingested.
+    :param is_candidate_file: Callable(name) filtering out logs, temp and hidden files.
+    :param list_dir: Optional callable(path) -> (file paths, directory paths), e.g. DirectorySnapshot.children
+                     to walk a snapshot instead of the disk.
+    :return: List of absolute item paths, files of a directory before its sub-directories.
+    """
+    if unit not in INGEST_UNITS:
+        raise ValueError(f"Unknown ingestion unit {unit!r}, expected one of {INGEST_UNITS}")
+    list_dir = list_dir or _list_dir
+    items = []
+    stack = [base_dir]
+    while stack:
+        path = stack.pop()
+        files, all_dirs = list_dir(path)
+        if path != base_dir and unit == "leaf_dir" and not all_dirs:
+            items.append(path)
+            continue
+        dirs = sorted(d for d in all_dirs if not is_ingested(item_key(base_dir, d)))
+        items.extend(
+            f for f in sorted(files)
+            if is_candidate_file(os.path.basename(f)) and not is_ingested(item_key(base_dir, f))
+        )
+        if unit == "top_level":
+            # Top-level directories are items themselves and are never descended into
+            items.extend(dirs)
+        else:
+            stack.extend(reversed(dirs))
+    return items
+
+
+def units_for_path(base_dir, path, is_dir, unit="top_level", is_candidate_file=lambda name: True):
+    """
+    Map a changed path below base_dir to the item(s) that contain it under the given unit policy.
+    """
+    rel_path = os.path.relpath(path, base_dir)
+    if rel_path == os.curdir or rel_path.startswith(os.pardir):
+        return []
+    parts = rel_path.split(os.sep)
+    if len(parts) == 1 and not is_dir:
+        return [path] if is_candidate_file(parts[0]) else []
+    if unit == "top_level":
+        return [os.path.join(base_dir, parts[0])]
+    if unit == "file":
+        if not is_dir:
+            return [path] if is_candidate_file(parts[-1]) else []
+        return scan_units(path, "file", is_candidate_file=is_candidate_file) if os.path.isdir(path) else []
+    # leaf_dir: the enclosing directory if it is a leaf, otherwise the file itself
+    directory = path if is_dir else os.path.dirname(path)
+    if _list_dir(directory)[1]:
+        if is_dir:
+            return scan_units(directory, "leaf_dir", is_candidate_file=is_candidate_file)
+        return [path] if is_candidate_file(parts[-1]) else []
+    return [directory]
@@ -0,0 +1,132 @@
+import os
+import json
+import sqlite3
+import datetime
+import threading
+from itertools import islice
+
+
+class ProcessedLedger:
+    """
+    Ledger of processed items backed by an SQLite table keyed by item name.
+    Membership checks are served from an in-memory index, and writes are committed in batches
+    instead of rewriting the whole log for every item.
+    """
+    def __init__(self, db_path, batch_size=20):
+        """
+        :param db_path: Path of the SQLite database file (created if missing).
+        :param batch_size: Number of pending additions that triggers a commit.
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed (item TEXT PRIMARY KEY, processed_at TEXT NOT NULL)"
+        )
+        # Transfers still running when auto-processing stopped, picked up again on the next start
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transfers "
+            "(item TEXT PRIMARY KEY, record_id TEXT NOT NULL, task_id TEXT NOT NULL, started REAL NOT NULL)"
+        )
+        self._conn.commit()
+        # Ordered by insertion so recent() can return the latest items cheaply
+        self._items = {
+            item: processed_at
+            for item, processed_at in self._conn.execute("SELECT item, processed_at FROM processed ORDER BY rowid")
+        }
+        self._pending = []
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def recent(self, count=10):
+        """Return the last count items added, oldest first."""
+        with self._lock:
+            return list(islice(reversed(self._items), count))[::-1]
+
+    def add(self, item, timestamp=None):
+        """Record item as processed; the write is committed once batch_size additions are pending."""
+        self.add_many([item], timestamp)
+
+    def add_many(self, items, timestamp=None):
+        """Record several items as processed in one batch."""
+        timestamp = timestamp or datetime.datetime.now().isoformat()
+        with self._lock:
+            for item in items:
+                self._items.pop(item, None)
+                self._items[item] = timestamp
+                self._pending.append((item, timestamp))
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """Commit all pending additions."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        self._conn.executemany("INSERT OR REPLACE INTO processed (item, processed_at) VALUES (?, ?)", self._pending)
+        self._conn.commit()
+        self._pending = []
+
+    def save_transfers(self, transfers):
+        """Replace the stored in-flight transfers with (item, record ID, task ID, started) tuples."""
+        with self._lock:
+            self._conn.execute("DELETE FROM transfers")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO transfers (item, record_id, task_id, started) VALUES (?, ?, ?, ?)", transfers
+            )
+            self._conn.commit()
+
+    def load_transfers(self):
+        """The in-flight transfers stored by save_transfers(), as (item, record ID, task ID, started) tuples."""
+        with self._lock:
+            return list(self._conn.execute("SELECT item, record_id, task_id, started FROM transfers ORDER BY rowid"))
+
+    def import_json(self, json_path):
+        """
+        Import a legacy backup_log.json ({"processed_dirs": [...], "timestamps": {...}}).
+        :return: Number of items imported that were not already in the ledger.
+        """
+        with open(json_path, 'r') as f:
+            log_data = json.load(f)
+        timestamps = log_data.get("timestamps", {})
+        new_items = [item for item in log_data.get("processed_dirs", []) if item not in self._items]
+        now = datetime.datetime.now().isoformat()
+        with self._lock:
+            for item in new_items:
+                timestamp = timestamps.get(item, now)
+                self._items[item] = timestamp
+                self._pending.append((item, timestamp))
+            self._flush_locked()
+        return len(new_items)
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+
+def open_ledger(db_path, legacy_json_path=None, batch_size=20):
+    """
+    Open the ledger at db_path, importing the legacy JSON log the first time the database is created.
+    """
+    is_new = not os.path.exists(db_path)
+    ledger = ProcessedLedger(db_path, batch_size=batch_size)
+    if is_new and legacy_json_path and os.path.exists(legacy_json_path):
+        try:
+            imported = ledger.import_json(legacy_json_path)
+            print(f"Imported {imported} items from legacy log {legacy_json_path}")
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Could not import legacy log {legacy_json_path}: {e}")
+    return ledger
@@ -0,0 +1,78 @@
+import time
+import asyncio
+import threading
+
+
+class ListingCache:
+    """
+    TTL cache for DataFed listing replies (projectList, collectionItemsList), keyed by tuples such as
+    ("projects",) or ("items", context, coll_id). Entries expire after ttl seconds and are dropped
+    explicitly with invalidate() when we create, update or delete records ourselves.
+    Concurrent async lookups of the same key share a single request.
+    """
+    def __init__(self, ttl=60.0):
+        """
+        :param ttl: Seconds a listing stays valid.
+        """
+        self.ttl = ttl
+        self._entries = {}  # key -> (expires, reply)
+        self._inflight = {}  # key -> asyncio.Future of a running fetch
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return False, None
+            return True, entry[1]
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def get_or_fetch(self, key, fetch):
+        """Return the cached reply for key, or call fetch() and cache what it returns."""
+        found, value = self._lookup(key)
+        if found:
+            return value
+        value = fetch()
+        self._store(key, value)
+        return value
+
+    async def get_or_fetch_async(self, key, fetch):
+        """Like get_or_fetch, with fetch a coroutine function."""
+        found, value = self._lookup(key)
+        if found:
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        else:
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, *prefix):
+        """Drop every entry whose key starts with prefix, e.g. invalidate("items", context)."""
+        n = len(prefix)
+        with self._lock:
+            for key in [k for k in self._entries if k[:n] == prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
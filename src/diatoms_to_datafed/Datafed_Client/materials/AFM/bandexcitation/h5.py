@@ -1,20 +1,96 @@
 import h5py
+import numpy as np
 from MetaXtract import MetaXtractor
 
 
 class H5(MetaXtractor):
     """
     Class for extracting metadata from HDF5 (.h5) files.
+    The object tree is walked with a depth and object-count budget, and attributes are
+    sized from their dtype/shape before anything is read.
     """
 
-    def extract(self):
-        def extract_h5_data(name, obj):
-            # Only include attributes where the length of the value is <= 10
-            attrs = {k: v for k, v in obj.attrs.items() if len(str(v)) <= 10}
-            return {name: attrs}
+    def __init__(self, file_name, max_depth=None, max_objects=10000, max_attr_bytes=64, max_value_chars=10,
+                 skip_datasets=False, rdcc_nbytes=None, page_buf_size=None):
+        """
+        :param file_name: Name of the file from which metadata will be extracted.
+        :param max_depth: Deepest group level to descend into (None for unlimited).
+        :param max_objects: Stop the walk after opening this many groups/datasets.
+        :param max_attr_bytes: Attributes whose raw data is larger than this are skipped without being read.
+        :param max_value_chars: Only keep attribute values whose text form is at most this long.
+        :param skip_datasets: Only record the attributes of groups.
+        :param rdcc_nbytes: Chunk cache size passed to h5py.File (useful on network shares).
+        :param page_buf_size: Page buffer size passed to h5py.File, for files written with paged aggregation.
+        """
+        super().__init__(file_name)
+        self.max_depth = max_depth
+        self.max_objects = max_objects
+        self.max_attr_bytes = max_attr_bytes
+        self.max_value_chars = max_value_chars
+        self.skip_datasets = skip_datasets
+        self.rdcc_nbytes = rdcc_nbytes
+        self.page_buf_size = page_buf_size
+
+    def _open(self):
+        kwargs = {}
+        if self.rdcc_nbytes is not None:
+            kwargs['rdcc_nbytes'] = self.rdcc_nbytes
+        if self.page_buf_size is not None:
+            try:
+                return h5py.File(self.file_name, 'r', page_buf_size=self.page_buf_size, **kwargs)
+            except OSError:
+                pass  # the file was not written with paged aggregation
+        return h5py.File(self.file_name, 'r', **kwargs)
+
+    def _attr_nbytes(self, obj, name):
+        """Size of an attribute's raw data, from its dtype and shape, without reading it."""
+        attr_id = obj.attrs.get_id(name)
+        shape = attr_id.shape or ()
+        return int(np.prod(shape, dtype=np.int64)) * attr_id.dtype.itemsize
 
-        with h5py.File(self.file_name, 'r') as f:
-            metadata = {}
-            # Visit all items in the HDF5 file and collect metadata
-            f.visititems(lambda name, obj: metadata.update(extract_h5_data(name, obj)))
+    def _read_attrs(self, obj):
+        attrs = {}
+        for k in obj.attrs:
+            try:
+                if self._attr_nbytes(obj, k) > self.max_attr_bytes:
+                    continue
+                v = obj.attrs[k]
+            except (OSError, TypeError, ValueError):
+                continue  # unreadable or unsupported attribute type
+            # Only include attributes where the length of the value is <= max_value_chars
+            if len(str(v)) <= self.max_value_chars:
+                attrs[k] = v
+        return attrs
+
+    def extract(self):
+        metadata = {}
+        visited = set()
+        opened = 0  # objects opened so far; the budget counts these, recorded or not (skip_datasets, hard links)
+        # Walk groups in name order with an explicit stack so the walk can stop at any point
+        with self._open() as f:
+            stack = [(f, "", 1)]
+            while stack:
+                group, prefix, depth = stack.pop()
+                children = []
+                for name in group:
+                    if opened >= self.max_objects:
+                        metadata["_walk_truncated"] = True
+                        return metadata
+                    try:
+                        obj = group[name]
+                    except (KeyError, OSError):
+                        continue  # dangling soft or external link
+                    opened += 1
+                    # Objects are identified by file number and header address, so no ObjectID (and open handle) is kept
+                    identity = (obj.id.fileno, h5py.h5o.get_info(obj.id).addr)
+                    if identity in visited:
+                        continue  # hard link to an object we already recorded
+                    visited.add(identity)
+                    path = prefix + name
+                    is_group = isinstance(obj, h5py.Group)
+                    if is_group or not self.skip_datasets:
+                        metadata[path] = self._read_attrs(obj)
+                    if is_group and (self.max_depth is None or depth < self.max_depth):
+                        children.append((obj, path + "/", depth + 1))
+                stack.extend(reversed(children))
         return metadata
@@ -8,9 +8,22 @@ class DM4(MetaXtractor):
     Class for extracting metadata from DigitalMicrograph (.dm4) files.
     """
 
+    def __init__(self, file_name, lazy=True):
+        """
+        :param file_name: Name of the file from which metadata will be extracted.
+        :param lazy: Only parse the tag tree and memory-map the data instead of reading the
+                     full image/spectrum-image into memory. The metadata is identical either way.
+        """
+        super().__init__(file_name)
+        self.lazy = lazy
+
     def extract(self):
-        s = hs.load(self.file_name)  # Load the .dm4 file using HyperSpy
+        s = hs.load(self.file_name, lazy=self.lazy)  # Load the .dm4 file using HyperSpy
+        # Multi-signal files load as a list; the first signal carries the acquisition metadata
+        if isinstance(s, list):
+            s = s[0]
         metadata = s.metadata.as_dictionary()  # Extract metadata as a dictionary
         # Filter out metadata entries with value lengths > 10
         # filtered_metadata = {k: v for k, v in metadata.items() if len(str(v)) <= 10}
+        del s  # Drop the lazy signal so its memory map is released
         return metadata
@@ -1,20 +1,53 @@
 import xml.etree.ElementTree as ET
 from MetaXtract import MetaXtractor
 
+# Data-point payloads (long whitespace-separated number lists); never kept as metadata
+DATA_TAGS = {"intensities", "counts", "beamAttenuationFactors", "listPositions"}
+
+
+def _local_name(tag):
+    """Strip the '{namespace}' prefix ElementTree puts on tags."""
+    return tag.rsplit('}', 1)[-1]
+
 
 # Subclass for XRDML (.xrdml) files
 class XRDML(MetaXtractor):
     """
     Class for extracting metadata from XRDML (.xrdml) files.
+    The document is parsed incrementally and every element is discarded once handled,
+    so memory stays bounded regardless of scan length.
     """
 
     def extract(self):
-        tree = ET.parse(self.file_name)
-        root = tree.getroot()
-
-        # Extract metadata from XML elements, skipping those with value length > 10
         metadata = {}
-        for elem in root.iter():
-            if elem.text and len(elem.text) <= 10:
-                metadata[elem.tag] = elem.text
+        suffixes = {}  # tag name -> last numeric suffix given, so repeated tags do not rescan the suffixes
+        stack = []  # open elements, so finished children can be detached from their parent
+        in_data = 0  # > 0 while inside a data-point payload
+        for event, elem in ET.iterparse(self.file_name, events=("start", "end")):
+            name = _local_name(elem.tag)
+            if event == "start":
+                stack.append(elem)
+                if name in DATA_TAGS:
+                    in_data += 1
+                continue
+
+            stack.pop()
+            if name in DATA_TAGS:
+                in_data -= 1
+            elif not in_data:
+                # Extract metadata from XML elements, skipping those with value length > 10
+                text = elem.text.strip() if elem.text else ""
+                if text and len(elem.text) <= 10:
+                    # Repeated tags get a numeric suffix instead of overwriting each other
+                    key = name
+                    if key in metadata:
+                        n = suffixes.get(name, 1)
+                        while key in metadata:
+                            n += 1
+                            key = f"{name}_{n}"
+                        suffixes[name] = n
+                    metadata[key] = elem.text
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
         return metadata
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from MetaXtract import MyEncoder
+
+# Bumped when the stored documents change shape, so older entries are dropped on open
+SCHEMA_VERSION = 2
+
+
+class MetadataCache:
+    """
+    On-disk cache of extracted metadata keyed by file identity (path, size, mtime_ns, inode).
+    A file rewritten in place changes at least one of those, so its entry is invalidated;
+    with verify_hash=True a fast hash of the file's head and tail is checked as well.
+    Entries are evicted least-recently-used once the cache exceeds max_bytes.
+    The cache is emptied when it was written under another SCHEMA_VERSION or version.
+    """
+    def __init__(self, db_path, max_bytes=256 * 1024 * 1024, verify_hash=False, hash_bytes=64 * 1024, version=""):
+        """
+        :param db_path: Path of the SQLite database file (created if missing).
+        :param max_bytes: Size cap for the cached metadata documents.
+        :param verify_hash: Also compare a hash of the first and last hash_bytes of the file.
+        :param hash_bytes: Bytes hashed from each end of the file when verify_hash is set.
+        :param version: Caller's description of how documents are produced (e.g. the compaction settings).
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+        self.hash_bytes = hash_bytes
+        self._lock = threading.Lock()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, partial_hash TEXT, "
+            "document TEXT, nbytes INTEGER, last_access REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metadata_lru ON metadata (last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache_info (key TEXT PRIMARY KEY, value TEXT)")
+        self.version = f"{SCHEMA_VERSION}:{version}"
+        row = self._conn.execute("SELECT value FROM cache_info WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            self._conn.execute("DELETE FROM metadata")
+            self._conn.execute("INSERT OR REPLACE INTO cache_info VALUES ('version', ?)", (self.version,))
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM metadata").fetchone()[0]
+
+    def _partial_hash(self, path, size):
+        digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+        with open(path, 'rb') as f:
+            digest.update(f.read(self.hash_bytes))
+            if size > 2 * self.hash_bytes:
+                f.seek(-self.hash_bytes, os.SEEK_END)
+                digest.update(f.read(self.hash_bytes))
+        return digest.hexdigest()
+
+    def get(self, path):
+        """Return the cached metadata for path, or None if missing or stale."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, inode, partial_hash, document FROM metadata WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                return None
+            size, mtime_ns, inode, partial_hash, document = row
+            fresh = (size, mtime_ns, inode) == (st.st_size, st.st_mtime_ns, st.st_ino)
+            if fresh and self.verify_hash:
+                fresh = partial_hash == self._partial_hash(path, st.st_size)
+            if not fresh:
+                self._delete_locked(path)
+                return None
+            self._conn.execute("UPDATE metadata SET last_access = ? WHERE path = ?", (time.time(), path))
+            self._conn.commit()
+        return json.loads(document)
+
+    def put(self, path, metadata):
+        """Cache metadata for path under its current identity."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        partial_hash = self._partial_hash(path, st.st_size) if self.verify_hash else None
+        document = json.dumps(metadata, cls=MyEncoder)
+        nbytes = len(document)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._delete_locked(path)
+            self._conn.execute(
+                "INSERT INTO metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, st.st_ino, partial_hash, document, nbytes, time.time())
+            )
+            self._total_bytes += nbytes
+            self._evict_locked()
+            self._conn.commit()
+
+    def get_or_extract(self, path, extract_fn):
+        """
+        Return cached metadata for path, or run extract_fn(path) and cache its result.
+        Directories and results carrying an error are never cached, so failures are retried.
+        """
+        if os.path.isdir(path):
+            return extract_fn(path)
+        metadata = self.get(path)
+        if metadata is not None:
+            return metadata
+        metadata = extract_fn(path)
+        if isinstance(metadata, dict) and "error" not in metadata:
+            try:
+                self.put(path, metadata)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Could not cache metadata for {path}: {e}")
+        return metadata
+
+    def _delete_locked(self, path):
+        row = self._conn.execute("SELECT nbytes FROM metadata WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM metadata WHERE path = ?", (path,))
+            self._total_bytes -= row[0]
+
+    def _evict_locked(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for path, nbytes in self._conn.execute("SELECT path, nbytes FROM metadata ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM metadata WHERE path = ?", (path,))
+            self._total_bytes -= nbytes
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,227 @@
+import os
+import json
+import sqlite3
+import threading
+
+# Directories that are never reported (Windows recycle bin, old zip staging area)
+SKIP_DIRS = ("$RECYCLE.BIN", "temp_zips")
+
+
+def _skipped(path):
+    """Return True if any component of the path is an ignored directory."""
+    return any(part in SKIP_DIRS for part in path.split(os.sep))
+
+
+def _list(dir_path):
+    """One listing of dir_path as {name: (mtime_ns, size, inode, is_dir)}."""
+    entries = {}
+    with os.scandir(dir_path) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                entries[entry.name] = (st.st_mtime_ns, st.st_size, st.st_ino, entry.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+    return entries
+
+
+class DirectorySnapshot:
+    """
+    (mtime, size, inode) snapshot of a directory tree: directory path -> mtime plus its child listing.
+    refresh() stats every known directory and only re-lists those whose mtime changed, which on POSIX
+    and NTFS happens whenever an entry is added, removed or renamed. With db_path the snapshot is kept
+    in SQLite, so after a restart only changed directories are listed again instead of the whole tree.
+    """
+    def __init__(self, root, db_path=None):
+        """
+        :param root: Top of the tree.
+        :param db_path: Optional SQLite file the snapshot is loaded from and saved to.
+        """
+        self.root = root
+        self.db_path = db_path
+        self._dirs = {}  # dir path -> mtime_ns
+        self._entries = {}  # dir path -> {name: (mtime_ns, size, inode, is_dir)}
+        self._dirty = set()
+        self._removed = set()
+        self._lock = threading.RLock()
+        self._conn = None
+        if db_path:
+            db_dir = os.path.dirname(db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER, entries TEXT)"
+            )
+            self._conn.commit()
+            for path, mtime_ns, entries in self._conn.execute("SELECT path, mtime_ns, entries FROM dirs"):
+                self._dirs[path] = mtime_ns
+                self._entries[path] = {name: tuple(info) for name, info in json.loads(entries).items()}
+
+    def __len__(self):
+        return len(self._dirs)
+
+    def _set(self, dir_path, mtime_ns, entries):
+        self._dirs[dir_path] = mtime_ns
+        self._entries[dir_path] = entries
+        self._dirty.add(dir_path)
+        self._removed.discard(dir_path)
+
+    def add_tree(self, dir_path=None, on_change=None):
+        """
+        Snapshot dir_path (default: root) and everything below it.
+        :param on_change: Optional callable(kind, path, is_dir), called with 'created' for each entry.
+        """
+        stack = [dir_path or self.root]
+        with self._lock:
+            while stack:
+                current = stack.pop()
+                if _skipped(current):
+                    continue
+                try:
+                    mtime_ns = os.stat(current).st_mtime_ns
+                    entries = _list(current)
+                except OSError:
+                    continue
+                self._set(current, mtime_ns, entries)
+                for name, (_, _, _, is_dir) in entries.items():
+                    child = os.path.join(current, name)
+                    if on_change is not None:
+                        on_change("created", child, is_dir)
+                    if is_dir:
+                        stack.append(child)
+
+    def drop_tree(self, dir_path):
+        prefix = dir_path + os.sep
+        with self._lock:
+            for d in [d for d in self._dirs if d == dir_path or d.startswith(prefix)]:
+                del self._dirs[d]
+                self._entries.pop(d, None)
+                self._dirty.discard(d)
+                self._removed.add(d)
+
+    def refresh(self, on_change=None):
+        """
+        Stat every known directory once and re-list the ones whose mtime changed.
+        :param on_change: Optional callable(kind, path, is_dir) for 'created', 'modified' and 'deleted' entries.
+        :return: Number of directories that were re-listed.
+        """
+        emit = on_change or (lambda kind, path, is_dir: None)
+        relisted = 0
+        with self._lock:
+            if not self._dirs:
+                self.add_tree(self.root, on_change)
+                return len(self._dirs)
+            for dir_path in sorted(self._dirs):
+                if dir_path not in self._dirs:
+                    continue  # dropped earlier in this pass together with its parent
+                try:
+                    mtime_ns = os.stat(dir_path).st_mtime_ns
+                except OSError:
+                    self.drop_tree(dir_path)
+                    continue
+                if mtime_ns == self._dirs[dir_path]:
+                    continue
+                try:
+                    new_entries = _list(dir_path)
+                except OSError:
+                    continue
+                relisted += 1
+                old_entries = self._entries.get(dir_path, {})
+                self._set(dir_path, mtime_ns, new_entries)
+                for name, info in new_entries.items():
+                    child = os.path.join(dir_path, name)
+                    old = old_entries.get(name)
+                    if old is None:
+                        emit("created", child, info[3])
+                        if info[3]:
+                            self.add_tree(child, on_change)
+                    elif old != info:
+                        emit("modified", child, info[3])
+                        if info[3] and child not in self._dirs:
+                            self.add_tree(child, on_change)
+                for name, info in old_entries.items():
+                    if name not in new_entries:
+                        child = os.path.join(dir_path, name)
+                        emit("deleted", child, info[3])
+                        if info[3]:
+                            self.drop_tree(child)
+        return relisted
+
+    def children(self, dir_path):
+        """Return (file paths, directory paths) directly in dir_path, from the snapshot, skipping SKIP_DIRS."""
+        with self._lock:
+            entries = self._entries.get(dir_path, {})
+            files = [os.path.join(dir_path, name) for name, info in entries.items() if not info[3]]
+            dirs = [os.path.join(dir_path, name) for name, info in entries.items() if info[3] and name not in SKIP_DIRS]
+        return files, dirs
+
+    def entries(self, dir_path):
+        """Return a copy of the snapshot's listing of dir_path as {name: (mtime_ns, size, inode, is_dir)}."""
+        with self._lock:
+            return dict(self._entries.get(dir_path, {}))
+
+    def tree_size(self, path):
+        """Total bytes of the files at or below path, from the snapshot."""
+        with self._lock:
+            if path not in self._dirs:
+                parent, name = os.path.split(path)
+                info = self._entries.get(parent, {}).get(name)
+                return info[1] if info is not None and not info[3] else 0
+            prefix = path + os.sep
+            return sum(
+                info[1]
+                for d, entries in self._entries.items() if d == path or d.startswith(prefix)
+                for info in entries.values() if not info[3]
+            )
+
+    def tree_sizes(self, paths):
+        """
+        Total bytes of the files at or below each of paths, from the snapshot, in one pass over its
+        directories (each directory's files are added to the requested paths above it).
+        :return: {path: bytes} for every path in paths.
+        """
+        sizes = dict.fromkeys(paths, 0)
+        with self._lock:
+            for d, entries in self._entries.items():
+                total = 0
+                for name, info in entries.items():
+                    if info[3]:
+                        continue
+                    total += info[1]
+                    child = os.path.join(d, name)
+                    if child in sizes:
+                        sizes[child] += info[1]  # a requested path that is a file
+                if not total:
+                    continue
+                current = d
+                while True:
+                    if current in sizes:
+                        sizes[current] += total
+                    if current == self.root:
+                        break
+                    parent = os.path.dirname(current)
+                    if parent == current:
+                        break
+                    current = parent
+        return sizes
+
+    def save(self):
+        """Write the directories changed since the last save to the database, if there is one."""
+        if self._conn is None:
+            return
+        with self._lock:
+            rows = [(d, self._dirs[d], json.dumps(self._entries[d])) for d in self._dirty if d in self._dirs]
+            removed = [(d,) for d in self._removed]
+            self._conn.executemany("INSERT OR REPLACE INTO dirs (path, mtime_ns, entries) VALUES (?, ?, ?)", rows)
+            self._conn.executemany("DELETE FROM dirs WHERE path = ?", removed)
+            self._conn.commit()
+            self._dirty.clear()
+            self._removed.clear()
+
+    def close(self):
+        if self._conn is not None:
+            self.save()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,117 @@
+import os
+import time
+import threading
+from fnmatch import fnmatch
+
+# Lock and temporary sidecar files written by instrument software and editors while a file is in use
+SIDECAR_PATTERNS = ("*.lock", "*.lck", "*.tmp", "*.part", "*.partial", "*.crdownload", "~$*", ".~lock.*#")
+
+
+def is_sidecar(name):
+    """Whether a file name looks like a lock/temp sidecar rather than data."""
+    return any(fnmatch(name, pattern) for pattern in SIDECAR_PATTERNS)
+
+
+class QuiescenceDetector:
+    """
+    Holds auto-processing items back until they stop changing.
+    An item is ready once its size and mtime have been unchanged, and no change event arrived
+    below it, for window seconds, and no lock/temp sidecar belongs to it.
+    Only the pending items themselves are stat'ed; directories are never rescanned, their
+    activity is learned from watcher events via touch() and note_event().
+    """
+    def __init__(self, window=10.0):
+        """
+        :param window: Seconds an item must stay unchanged before it is ready.
+        """
+        self.window = window
+        self._pending = {}  # item -> ((size, mtime_ns), stable_since)
+        self._sidecars = set()  # sidecar paths seen in events and not deleted since
+        self._lock = threading.Lock()
+
+    def observe(self, item, now=None):
+        """Stat item and restart its stability window if its size or mtime changed."""
+        now = now if now is not None else time.time()
+        try:
+            st = os.stat(item)
+        except OSError:
+            self.forget(item)
+            return
+        signature = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            previous = self._pending.get(item)
+            if previous is None:
+                # A file whose mtime is already old is not being written; directories can be
+                # filling up without their own mtime moving, so they always wait a full window
+                since = now if os.path.isdir(item) else min(now, st.st_mtime)
+                self._pending[item] = (signature, since)
+            elif previous[0] != signature:
+                self._pending[item] = (signature, now)
+        if previous is None and os.path.isdir(item):
+            self._seed_sidecars(item)
+
+    def touch(self, item, now=None):
+        """Restart item's stability window because a change event arrived for it or below it."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            if item in self._pending:
+                self._pending[item] = (self._pending[item][0], now)
+
+    def note_event(self, kind, path):
+        """Keep track of sidecar files from watcher events."""
+        if not is_sidecar(os.path.basename(path)):
+            return
+        with self._lock:
+            if kind == "deleted":
+                self._sidecars.discard(path)
+            else:
+                self._sidecars.add(path)
+
+    def _seed_sidecars(self, dir_path):
+        """One listing of a directory item's top level, so sidecars created before we watched are known."""
+        try:
+            with os.scandir(dir_path) as it:
+                found = {entry.path for entry in it if is_sidecar(entry.name)}
+        except OSError:
+            return
+        with self._lock:
+            self._sidecars.update(found)
+
+    def has_sidecar(self, item):
+        directory, name = os.path.split(item)
+        stem = os.path.splitext(name)[0]
+        # Sidecars next to a file: data.dm4.lock, data.lock, ~$data.dm4, .~lock.data.dm4#
+        candidates = [
+            os.path.join(directory, n)
+            for n in (name + ".lock", stem + ".lock", name + ".tmp", name + ".part", "~$" + name, f".~lock.{name}#")
+        ]
+        prefix = item + os.sep
+        with self._lock:
+            sidecars = [p for p in self._sidecars if p.startswith(prefix) or p in candidates]
+            for p in sidecars:
+                if not os.path.exists(p):
+                    self._sidecars.discard(p)
+            if any(p in self._sidecars for p in sidecars):
+                return True
+        if os.path.isdir(item):
+            return False
+        return any(os.path.exists(p) for p in candidates)
+
+    def ready(self, now=None):
+        """Return (and stop tracking) the pending items that have been stable for the whole window."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            stable = [item for item, (_, since) in self._pending.items() if now - since >= self.window]
+        ready = [item for item in stable if not self.has_sidecar(item)]
+        with self._lock:
+            for item in ready:
+                self._pending.pop(item, None)
+        return ready
+
+    def pending_items(self):
+        with self._lock:
+            return list(self._pending)
+
+    def forget(self, item):
+        with self._lock:
+            self._pending.pop(item, None)
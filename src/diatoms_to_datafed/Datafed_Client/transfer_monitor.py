@@ -0,0 +1,215 @@
+import time
+import threading
+from collections import namedtuple
+from types import SimpleNamespace
+
+# TaskStatus values from DataFed's SDMS.proto
+TS_BLOCKED = 0
+TS_READY = 1
+TS_RUNNING = 2
+TS_SUCCEEDED = 3
+TS_FAILED = 4
+
+# A transfer being watched: the auto-processing item, its record and the current Globus task
+Transfer = namedtuple("Transfer", ["item", "record_id", "task_id", "attempt", "started"])
+
+
+def task_id_from_reply(reply):
+    """Return the task ID from a dataPut reply, or None if no task was started."""
+    try:
+        return reply[0].task.id or None
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+class TransferMonitor:
+    """
+    Tracks DataFed transfer tasks started with dataPut(wait=False) and polls their status in bulk
+    on a background thread. The poll interval backs off while nothing changes and resets when a task
+    finishes or a new one is tracked. Failed tasks are re-submitted up to max_retries times before
+    the failure is reported.
+    """
+    def __init__(self, session, on_success, on_failure, resubmit=None, max_retries=2,
+                 min_interval=2.0, max_interval=60.0):
+        """
+        :param session: Callable returning a context manager that yields a DataFed API instance.
+        :param on_success: Callable(item, record_id) once a transfer succeeded.
+        :param on_failure: Callable(item, record_id, message) once a transfer failed for good.
+        :param resubmit: Callable(item, record_id) -> new task ID, used to retry failed transfers.
+        :param max_retries: Number of times a failed transfer is re-submitted.
+        :param min_interval: Shortest delay between polls, in seconds.
+        :param max_interval: Longest delay between polls, in seconds.
+        """
+        self.session = session
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.resubmit = resubmit
+        self.max_retries = max_retries
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self._transfers = {}  # task ID -> Transfer
+        self._items = {}  # item -> task ID, for is_tracking()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def track(self, item, record_id, task_id, attempt=0, started=None):
+        """
+        Watch a transfer task.
+        :param started: When the task was started (defaults to now), for transfers picked up again after a restart.
+        """
+        with self._lock:
+            self._transfers[task_id] = Transfer(item, record_id, task_id, attempt, started or time.time())
+            self._items[item] = task_id
+        self.interval = self.min_interval
+        self._wakeup.set()
+
+    def is_tracking(self, item):
+        with self._lock:
+            return item in self._items
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._transfers)
+
+    def transfers(self):
+        """The transfers still being watched"""
+        with self._lock:
+            return list(self._transfers.values())
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def drain(self, timeout):
+        """
+        Poll on the calling thread until every tracked transfer finished (re-submissions included)
+        or timeout seconds passed. Call after stop().
+        :return: Number of transfers still pending.
+        """
+        deadline = time.time() + timeout
+        while self.pending:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling transfer tasks: {e}")
+            remaining = deadline - time.time()
+            if not self.pending or remaining <= 0:
+                break
+            time.sleep(min(self.min_interval, remaining))
+        return self.pending
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stop_event.is_set() or not self.pending:
+                continue
+            try:
+                changed = self.poll()
+            except Exception as e:
+                print(f"Error polling transfer tasks: {e}")
+                changed = 0
+            self.interval = self.min_interval if changed else min(self.interval * 2, self.max_interval)
+
+    def _fetch_statuses(self, api, transfers):
+        """Return {task ID: (status, message)} using one taskList call plus taskView for any stragglers."""
+        oldest = min(t.started for t in transfers)
+        # taskList takes since as a string of seconds (or with an h/d/w suffix)
+        since = int(time.time() - oldest) + 60
+        statuses = {}
+        reply = api.taskList(since=str(since), count=max(100, 2 * len(transfers)))
+        for task in reply[0].task:
+            statuses[task.id] = (task.status, getattr(task, 'msg', ''))
+        for t in transfers:
+            if t.task_id not in statuses:
+                task = api.taskView(t.task_id)[0].task[0]
+                statuses[t.task_id] = (task.status, getattr(task, 'msg', ''))
+        return statuses
+
+    def poll(self):
+        """Poll all tracked tasks once and dispatch finished ones. Returns the number that finished."""
+        with self._lock:
+            transfers = list(self._transfers.values())
+        if not transfers:
+            return 0
+        with self.session() as api:
+            statuses = self._fetch_statuses(api, transfers)
+
+        finished = 0
+        for t in transfers:
+            status, message = statuses.get(t.task_id, (None, ''))
+            if status not in (TS_SUCCEEDED, TS_FAILED):
+                continue
+            finished += 1
+            with self._lock:
+                self._transfers.pop(t.task_id, None)
+                if self._items.get(t.item) == t.task_id:
+                    del self._items[t.item]
+            if status == TS_SUCCEEDED:
+                self.on_success(t.item, t.record_id)
+            elif self.resubmit is not None and t.attempt < self.max_retries:
+                print(f"Transfer {t.task_id} for {t.item} failed ({message}), re-submitting")
+                try:
+                    task_id = self.resubmit(t.item, t.record_id)
+                except Exception as e:
+                    self.on_failure(t.item, t.record_id, str(e))
+                    continue
+                if task_id:
+                    self.track(t.item, t.record_id, task_id, t.attempt + 1)
+                else:
+                    self.on_failure(t.item, t.record_id, "re-submitted transfer did not start a task")
+            else:
+                self.on_failure(t.item, t.record_id, message)
+        return finished
+
+
+class StubTaskAPI:
+    """
+    Minimal local stand-in for the task calls of datafed.CommandLib.API, for tests and offline runs.
+    Tasks are created by dataPut and advance through the statuses given in script
+    (by default running, then succeeded) one step per status query.
+    """
+    def __init__(self, script=(TS_RUNNING, TS_SUCCEEDED)):
+        self.script = script
+        self.tasks = {}  # task ID -> remaining statuses
+        self.calls = []
+        self._count = 0
+
+    def dataPut(self, data_id, wait=False, path=None, **kwargs):
+        self._count += 1
+        task_id = f"task/{self._count}"
+        self.tasks[task_id] = list(self.script)
+        self.calls.append(("dataPut", data_id, path))
+        return (SimpleNamespace(task=SimpleNamespace(id=task_id, status=TS_READY, msg="")), "DataPutReply")
+
+    def _advance(self, task_id):
+        statuses = self.tasks[task_id]
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return SimpleNamespace(id=task_id, status=status, msg="failed" if status == TS_FAILED else "")
+
+    def taskList(self, since=None, count=20, **kwargs):
+        # Same parsing as CommandLib.API.taskList: a string of seconds, or a number with an h/d/w suffix
+        if since is not None:
+            try:
+                int(since[:-1] if since[-1] in "hdw" else since)
+            except BaseException:
+                raise Exception("Invalid value for 'since'")
+        self.calls.append(("taskList", since, count))
+        tasks = [self._advance(task_id) for task_id in list(self.tasks)[:count]]
+        return (SimpleNamespace(task=tasks), "TaskDataReply")
+
+    def taskView(self, task_id, **kwargs):
+        self.calls.append(("taskView", task_id))
+        return (SimpleNamespace(task=[self._advance(task_id)]), "TaskDataReply")
@@ -0,0 +1,81 @@
+import threading
+import panel as pn
+
+_MISSING = object()
+
+
+class StatePublisher:
+    """
+    Coalesces UI updates made from worker threads and pushes them to the browser at a fixed rate.
+    Each tick, bound values that changed are written to their widgets, pending one-off values are
+    applied (latest wins), and invalidated renderers run once; everything is sent in one pn.io.hold()
+    batch. Widgets whose value did not change are not touched.
+    """
+    def __init__(self, period=250):
+        """
+        :param period: Milliseconds between pushes to the browser.
+        """
+        self.period = period
+        self._bindings = []  # [obj, attr, getter, last value]
+        self._renderers = {}  # key -> callable rebuilding a pane
+        self._dirty = set()
+        self._pending = {}  # (id(obj), attr) -> (obj, attr, value)
+        self._lock = threading.Lock()
+        self._callback = None
+
+    def bind(self, obj, attr, getter):
+        """Keep obj.<attr> equal to getter(), checked every tick."""
+        self._bindings.append([obj, attr, getter, _MISSING])
+
+    def add_renderer(self, key, render):
+        """Register render() to run on the next tick after invalidate(key)."""
+        self._renderers[key] = render
+
+    def invalidate(self, key):
+        with self._lock:
+            self._dirty.add(key)
+        if self._callback is None:
+            self.flush()
+
+    def set(self, obj, attr, value):
+        """Set obj.<attr> on the next tick; several sets before it are coalesced into the last one."""
+        if self._callback is None:
+            setattr(obj, attr, value)
+            return
+        with self._lock:
+            self._pending[(id(obj), attr)] = (obj, attr, value)
+
+    def start(self):
+        """Start pushing; must be called from a Panel session (e.g. in pn.state.onload)."""
+        if self._callback is None:
+            self._callback = pn.state.add_periodic_callback(self.flush, period=self.period)
+
+    def stop(self):
+        if self._callback is not None:
+            self._callback.stop()
+            self._callback = None
+
+    def flush(self):
+        updates = []
+        for binding in self._bindings:
+            obj, attr, getter, last = binding
+            try:
+                value = getter()
+            except Exception as e:
+                print(f"Error computing UI state for {attr}: {e}")
+                continue
+            if value != last:
+                binding[3] = value
+                updates.append((obj, attr, value))
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending = {}
+            dirty = [key for key in self._renderers if key in self._dirty]
+            self._dirty = set()
+        if not (updates or pending or dirty):
+            return
+        with pn.io.hold():
+            for obj, attr, value in updates + pending:
+                setattr(obj, attr, value)
+            for key in dirty:
+                self._renderers[key]()
@@ -0,0 +1,180 @@
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Outcome of one auto-processing item; index is the item's position in the submitted batch
+ItemResult = namedtuple("ItemResult", ["index", "path", "success", "record_id", "task_id", "error"])
+
+
+class UploadPool:
+    """
+    Bounded two-stage worker pool for auto-processing.
+    Items go through extract_fn (CPU-bound metadata extraction) and then upload_fn
+    (I/O-bound dataCreate/dataPut), each stage with its own concurrency limit.
+    """
+    def __init__(self, extract_fn, upload_fn, extract_workers=2, upload_workers=4, max_pending=None):
+        """
+        :param extract_fn: Callable(path) -> metadata dict, or None on failure.
+        :param upload_fn: Callable(path, metadata) -> (record ID, transfer task ID), or None on failure.
+        :param extract_workers: Number of concurrent extractions.
+        :param upload_workers: Number of concurrent DataFed uploads.
+        :param max_pending: Maximum number of items in flight (defaults to twice the total workers).
+        """
+        self.extract_fn = extract_fn
+        self.upload_fn = upload_fn
+        self.max_pending = max_pending or 2 * (extract_workers + upload_workers)
+        self._extract = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract")
+        self._upload = ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix="upload")
+
+    def submit(self, index, path, on_start=None, on_done=None):
+        """
+        Queue one item and return a Future resolving to its ItemResult.
+        on_start(path) and on_done(result) are called from worker threads.
+        """
+        future = Future()
+
+        def finish(success, record_id=None, task_id=None, error=None):
+            result = ItemResult(index, path, success, record_id, task_id, error)
+            if on_done:
+                on_done(result)
+            future.set_result(result)
+
+        def upload_stage(metadata):
+            try:
+                outcome = self.upload_fn(path, metadata)
+                if outcome is None:
+                    finish(False, error="upload failed")
+                else:
+                    finish(True, *outcome)
+            except Exception as e:
+                finish(False, error=str(e))
+
+        def extract_stage():
+            if on_start:
+                on_start(path)
+            try:
+                metadata = self.extract_fn(path)
+            except Exception as e:
+                finish(False, error=str(e))
+                return
+            if metadata is None:
+                finish(False, error="metadata extraction failed")
+                return
+            self._upload.submit(upload_stage, metadata)
+
+        self._extract.submit(extract_stage)
+        return future
+
+    def submit_batch(self, start_index, paths, upload_batch_fn, on_start=None, on_done=None):
+        """
+        Queue a group of items whose metadata is extracted concurrently and which are then
+        uploaded together by upload_batch_fn([(path, metadata), ...]) -> [(record ID, task ID) or None, ...].
+        Returns a Future resolving to the list of ItemResults for the group.
+        """
+        future = Future()
+        extracted = [None] * len(paths)
+        remaining = [len(paths)]
+        lock = threading.Lock()
+
+        def upload_stage():
+            ready = [(path, metadata) for path, metadata, error in extracted if error is None]
+            batch_error = None
+            try:
+                outcomes = upload_batch_fn(ready) if ready else []
+            except Exception as e:
+                outcomes, batch_error = [None] * len(ready), str(e)
+            by_path = dict(zip([path for path, _ in ready], outcomes))
+            results = []
+            for offset, (path, _, error) in enumerate(extracted):
+                record_id, task_id = by_path.get(path) or (None, None)
+                if error is None and record_id is None:
+                    error = batch_error or "upload failed"
+                result = ItemResult(start_index + offset, path, record_id is not None, record_id, task_id, error)
+                if on_done:
+                    on_done(result)
+                results.append(result)
+            future.set_result(results)
+
+        def extract_stage(offset, path):
+            if on_start:
+                on_start(path)
+            try:
+                metadata = self.extract_fn(path)
+                extracted[offset] = (path, metadata, None if metadata is not None else "metadata extraction failed")
+            except Exception as e:
+                extracted[offset] = (path, None, str(e))
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            # The last extraction of the group hands the whole group to the upload stage
+            if last:
+                self._upload.submit(upload_stage)
+
+        for offset, path in enumerate(paths):
+            self._extract.submit(extract_stage, offset, path)
+        return future
+
+    def run(self, paths, should_continue=None, on_start=None, on_done=None, batch_size=1, upload_batch_fn=None):
+        """
+        Process paths concurrently and yield their ItemResults in submission order,
+        so callers can commit the ledger in order. At most max_pending items are in flight.
+        With batch_size > 1 and an upload_batch_fn, items are uploaded in groups of batch_size.
+        Stops submitting new items once should_continue() returns False, but drains the in-flight ones.
+        """
+        if batch_size > 1 and upload_batch_fn is not None:
+            yield from self._run_batched(paths, should_continue, on_start, on_done, batch_size, upload_batch_fn)
+            return
+        in_flight = deque()
+        for index, path in enumerate(paths):
+            if should_continue is not None and not should_continue():
+                break
+            while len(in_flight) >= self.max_pending:
+                yield in_flight.popleft().result()
+            in_flight.append(self.submit(index, path, on_start, on_done))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def _run_batched(self, paths, should_continue, on_start, on_done, batch_size, upload_batch_fn):
+        # Keep at least two groups in flight so extraction of the next group overlaps the current upload
+        max_batches = max(2, self.max_pending // batch_size)
+        in_flight = deque()
+        paths = list(paths)
+        for start in range(0, len(paths), batch_size):
+            if should_continue is not None and not should_continue():
+                break
+            while len(in_flight) >= max_batches:
+                yield from in_flight.popleft().result()
+            in_flight.append(self.submit_batch(start, paths[start:start + batch_size], upload_batch_fn, on_start, on_done))
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+    def shutdown(self, wait=True):
+        self._extract.shutdown(wait=wait)
+        self._upload.shutdown(wait=wait)
+
+
+class ProgressTracker:
+    """Thread-safe bookkeeping of in-flight and completed items for progress reporting."""
+    def __init__(self, total):
+        self.total = total
+        self.completed = 0
+        self._in_flight = []
+        self._lock = threading.Lock()
+
+    def start(self, name):
+        with self._lock:
+            self._in_flight.append(name)
+            return self._describe_locked()
+
+    def done(self, name):
+        """Mark name as finished and return (percent complete, in-flight description)."""
+        with self._lock:
+            if name in self._in_flight:
+                self._in_flight.remove(name)
+            self.completed += 1
+            return int(self.completed / self.total * 100) if self.total else 100, self._describe_locked()
+
+    def _describe_locked(self):
+        if len(self._in_flight) <= 3:
+            return ", ".join(self._in_flight)
+        return f"{', '.join(self._in_flight[:3])} (+{len(self._in_flight) - 3} more)"
@@ -1,54 +1,53 @@
-from materials.AFM.bandexcitation.h5 import H5
-from materials.AFM.oxfordAFM.ibw import IBW
-from materials.EM.dm.dm4 import DM4
-from materials.Xray.panalytical.xrdml import XRDML
 import os
 import json
 import datetime
+from extractors import resolve_extractor
 
 
-def get_file_metadata(file_path):
+def basic_file_metadata(file_path, **extra):
     """
-    Extract metadata from a file based on its extension.
+    Basic stat-based metadata used for unsupported types and when extraction fails.
+    Extra keyword arguments (e.g. error=...) are added to the result.
+    """
+    file_stat = os.stat(file_path)
+    metadata = {
+        "filename": os.path.basename(file_path),
+        "filesize": file_stat.st_size,
+        "modified_time": datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
+        "created_time": datetime.datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
+        "file_type": os.path.splitext(file_path)[1].lower(),
+    }
+    metadata.update(extra)
+    return metadata
+
+
+def get_file_metadata(file_path, extractor_options=None):
+    """
+    Extract metadata from a file based on its content signature and extension.
     For unsupported file types, return basic file information.
+    :param extractor_options: Optional mapping of extractor class name -> keyword arguments for it,
+                              e.g. {"H5": {"max_depth": 4, "rdcc_nbytes": 4194304}}.
     """
     extension = os.path.splitext(file_path)[1].lower()
     
     print(f"Processing file with extension: {extension}")
     
     try:
-        # Specific file type handlers
-        if extension == '.h5':
-            return H5(file_path).extract()
-        elif extension == '.xrdml':
-            return XRDML(file_path).extract()
-        elif extension == '.dm4':
-            return DM4(file_path).extract()
-        elif extension == '.ibw':
-            return IBW(file_path).extract()
-        elif extension == '.json':
+        if extension == '.json':
             # For JSON files, read the content directly
             with open(file_path, 'r') as f:
                 return json.load(f)
-        else:
+        if os.path.isdir(file_path):
+            return basic_file_metadata(file_path, unsupported_type=True)
+        # The format is recognized from the first few KB; its module is imported on first use
+        extractor, mismatch = resolve_extractor(file_path)
+        if mismatch:
+            # Don't hand a mislabelled file to a parser that would fail slowly
+            return basic_file_metadata(file_path, error=mismatch)
+        if extractor is None:
             # For unsupported file types, return basic file information
-            file_stat = os.stat(file_path)
-            return {
-                "filename": os.path.basename(file_path),
-                "filesize": file_stat.st_size,
-                "modified_time": datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-                "created_time": datetime.datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-                "file_type": extension,
-                "unsupported_type": True
-            }
+            return basic_file_metadata(file_path, unsupported_type=True)
+        return extractor(file_path, **(extractor_options or {}).get(extractor.__name__, {})).extract()
     except Exception as e:
         # If extraction fails, still return basic info with error
-        file_stat = os.stat(file_path)
-        return {
-            "filename": os.path.basename(file_path),
-            "filesize": file_stat.st_size,
-            "modified_time": datetime.datetime.fromtimestamp(file_stat.st_mtime).isoformat(),
-            "created_time": datetime.datetime.fromtimestamp(file_stat.st_ctime).isoformat(),
-            "file_type": extension,
-            "error": str(e)
-        }
\ No newline at end of file
+        return basic_file_metadata(file_path, error=str(e))
@@ -0,0 +1,147 @@
+import queue
+import threading
+from collections import namedtuple
+from snapshot import DirectorySnapshot, _skipped
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog is optional, the polling backend is used instead
+    Observer = None
+    FileSystemEventHandler = object
+
+# kind is one of 'created', 'modified', 'deleted'
+ChangeEvent = namedtuple("ChangeEvent", ["kind", "path", "is_dir"])
+
+
+class DirectoryWatcher:
+    """
+    Base class for directory watcher backends.
+    Backends push ChangeEvent tuples onto the events queue; consumers call get_events().
+    """
+    def __init__(self, path, events=None):
+        """
+        :param path: Directory to watch recursively.
+        :param events: Optional queue.Queue to publish events on.
+        """
+        self.path = path
+        self.events = events if events is not None else queue.Queue()
+
+    def start(self):
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def stop(self):
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _emit(self, kind, path, is_dir):
+        if not _skipped(path):
+            self.events.put(ChangeEvent(kind, path, is_dir))
+
+    def get_events(self, timeout=None):
+        """
+        Block up to timeout seconds for the first event, then drain everything already queued.
+        Returns an empty list if nothing happened.
+        """
+        try:
+            events = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class _NotifyHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type == "moved":
+            self.watcher._emit("deleted", event.src_path, event.is_directory)
+            self.watcher._emit("created", event.dest_path, event.is_directory)
+        elif event.event_type in ("created", "modified", "deleted", "closed"):
+            kind = "modified" if event.event_type == "closed" else event.event_type
+            self.watcher._emit(kind, event.src_path, event.is_directory)
+
+
+class NotifyWatcher(DirectoryWatcher):
+    """
+    Watcher backed by OS change notifications (inotify on Linux, ReadDirectoryChangesW on Windows)
+    through the optional watchdog package.
+    """
+    def __init__(self, path, events=None):
+        if Observer is None:
+            raise RuntimeError("watchdog is not installed, use the polling backend")
+        super().__init__(path, events)
+        self._observer = None
+
+    def start(self):
+        self._observer = Observer()
+        self._observer.schedule(_NotifyHandler(self), self.path, recursive=True)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+
+class PollingWatcher(DirectoryWatcher):
+    """
+    Fallback watcher that polls a DirectorySnapshot of the tree.
+    Each poll only stats the known directories and re-lists the ones whose mtime changed.
+    """
+    def __init__(self, path, events=None, interval=1.0, snapshot=None):
+        """
+        :param interval: Seconds between polls.
+        :param snapshot: Optional DirectorySnapshot of path to start from (e.g. one loaded from disk).
+        """
+        super().__init__(path, events)
+        self.interval = interval
+        self.snapshot = snapshot if snapshot is not None else DirectorySnapshot(path)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        if not len(self.snapshot):
+            self.snapshot.add_tree()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error polling {self.path}: {e}")
+
+    def poll(self):
+        """Stat every known directory once and emit events for the ones that changed."""
+        self.snapshot.refresh(self._emit)
+
+
+def create_watcher(path, backend="auto", events=None, interval=1.0, snapshot=None):
+    """
+    Create a watcher for path.
+    :param backend: 'notify' for OS notifications, 'polling' for the snapshot poller,
+                    or 'auto' to use notifications when watchdog is available.
+    :param snapshot: Optional DirectorySnapshot of path for the polling backend to start from.
+    """
+    if backend == "notify" or (backend == "auto" and Observer is not None):
+        try:
+            return NotifyWatcher(path, events)
+        except RuntimeError as e:
+            print(f"{e}; falling back to polling")
+    return PollingWatcher(path, events, interval=interval, snapshot=snapshot)
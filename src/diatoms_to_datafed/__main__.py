@@ -96,12 +96,13 @@ def main() -> int:
         orchestrator = Orchestrator(
             watch_directory=config["watch_directory"],
             log_file=config["log_file"],
-            datafed_config=config["datafed"]
+            datafed_config=config["datafed"],
+            ingest_options=config["ingest"]
         )
         
-        # Start daily job
-        logger.info("Starting daily job scheduler")
-        orchestrator.run_daily_job()
+        # Watch the directory and process data as it arrives
+        logger.info("Starting auto-processing")
+        orchestrator.run()
         
     except Exception as e:
         logging.error(f"Fatal error: {e}", exc_info=True)
@@ -0,0 +1,64 @@
+"""
+Configuration loading for the headless service.
+"""
+
+from pathlib import Path
+from typing import Union
+
+import yaml
+
+DEFAULT_CONFIG = {
+    "log_file": "backup_log.json",
+    "datafed": {
+        "repo_id": None,
+        "parent_collection": "root",
+        "default_tags": [],
+    },
+    "ingest": {},
+    "logging": {
+        "level": "INFO",
+        "file": "logs/diatoms_to_datafed.log",
+        "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    },
+}
+
+
+def _merge(defaults: dict, overrides: dict) -> dict:
+    """Recursively merge overrides into a copy of defaults."""
+    merged = dict(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(path: Union[str, Path]) -> dict:
+    """
+    Load the YAML configuration and fill in defaults.
+
+    Args:
+        path: Path to config.yaml
+
+    Returns:
+        Configuration dictionary
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If a required setting is missing or malformed
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Configuration file not found: {path}")
+    with open(path, "r") as f:
+        loaded = yaml.safe_load(f) or {}
+    if not isinstance(loaded, dict):
+        raise ValueError(f"Configuration file {path} must contain a mapping")
+
+    config = _merge(DEFAULT_CONFIG, loaded)
+    if not config.get("watch_directory"):
+        raise ValueError("Configuration is missing 'watch_directory'")
+    if not isinstance(config["ingest"], dict):
+        raise ValueError("'ingest' must be a mapping of auto-processing options")
+    return config
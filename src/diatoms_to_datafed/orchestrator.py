@@ -0,0 +1,123 @@
+"""
+Headless auto-processing: runs the ingest pipeline without the Panel UI.
+"""
+
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import Optional
+
+# The Datafed_Client modules import each other without a package prefix
+_CLIENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Datafed_Client")
+if _CLIENT_DIR not in sys.path:
+    sys.path.insert(0, _CLIENT_DIR)
+
+from async_client import DataFedClientPool  # noqa: E402
+from ingest_service import IngestService, IngestObserver  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class LoggingObserver(IngestObserver):
+    """Reports ingest progress through the logging module."""
+
+    def status(self, text):
+        logger.info(text)
+
+    def item_processed(self, key):
+        logger.info(f"Processed {key}")
+
+    def record_created(self, record_id):
+        logger.debug(f"Created record {record_id}")
+
+    def message(self, text):
+        logger.info(text)
+
+    def stopped(self, error=None):
+        if error is not None:
+            logger.error(f"Auto-processing stopped: {error}")
+        else:
+            logger.info("Auto-processing stopped")
+
+
+class Orchestrator:
+    """
+    Runs the watcher -> extract -> create -> transfer pipeline from the configuration,
+    with DataFed sessions from a client pool. Nothing here imports Panel or Bokeh.
+    """
+
+    def __init__(self, watch_directory: str, log_file: str, datafed_config: dict,
+                 ingest_options: Optional[dict] = None):
+        """
+        Args:
+            watch_directory: Directory where the instrument saves data
+            log_file: Legacy JSON log of processed items, relative to watch_directory
+            datafed_config: The 'datafed' section of the configuration
+            ingest_options: Overrides of the auto-processing options (see ingest_service.DEFAULTS)
+        """
+        self.watch_directory = watch_directory
+        self.datafed_config = datafed_config
+        options = dict(ingest_options or {})
+        options.setdefault("log_file", log_file)
+        self._api = None
+        self._pool = DataFedClientPool(
+            self._create_api,
+            size=options.get("upload_workers", 4) + 2,
+            fallback_lock=threading.Lock()
+        )
+        self.service = IngestService(
+            watch_directory,
+            self._pool.session,
+            coll_id=datafed_config.get("parent_collection") or "root",
+            context=datafed_config.get("repo_id"),
+            tags=datafed_config.get("default_tags") or None,
+            observers=[LoggingObserver()],
+            **options
+        )
+
+    def _create_api(self):
+        """Client pool factory: an authenticated API instance, or None if it cannot log in."""
+        from datafed.CommandLib import API
+
+        api = API()
+        username = os.getenv("DATAFED_USERNAME")
+        password = os.getenv("DATAFED_PASSWORD")
+        if not api.getAuthUser() and username and password:
+            api.loginByPassword(username, password)
+        if not api.getAuthUser():
+            return None
+        endpoint = self.datafed_config.get("endpoint") or os.getenv("GLOBUS_ENDPOINT_ID")
+        if endpoint:
+            api.endpointDefaultSet(endpoint)
+        return api
+
+    def login(self) -> None:
+        """
+        Authenticate once up front; the instance also serves as the pool's fallback.
+
+        Raises:
+            RuntimeError: If no DataFed credentials are available
+        """
+        self._api = self._create_api()
+        if self._api is None:
+            raise RuntimeError(
+                "Not authenticated with DataFed: run 'datafed setup' or set DATAFED_USERNAME and DATAFED_PASSWORD"
+            )
+        self._pool.fallback_api = self._api
+        logger.info(f"Logged in to DataFed as {self._api.getAuthUser()}")
+
+    def run(self) -> None:
+        """Process new data until interrupted (Ctrl+C or SIGTERM)."""
+        self.login()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.service.stop())
+        logger.info(f"Watching {self.watch_directory}")
+        try:
+            self.service.run()
+        except KeyboardInterrupt:
+            logger.info("Interrupted, shutting down")
+            self.service.stop()
+        finally:
+            self.service.close()
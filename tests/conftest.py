@@ -7,4 +7,10 @@
     - https://docs.pytest.org/en/stable/writing_plugins.html
 """
 
-# import pytest
+import os
+import sys
+
+# The Datafed_Client modules import each other without a package prefix
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "diatoms_to_datafed", "Datafed_Client")
+)
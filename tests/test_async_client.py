@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import threading
+
+from async_client import AsyncDataFedClient, DataFedClientPool
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+class FakeAPI:
+    def __init__(self, user):
+        self.user = user
+        self.contexts = []
+
+    def setContext(self, context):
+        self.contexts.append(context)
+
+    def whoami(self):
+        return self.user
+
+
+def make_pool(size=2):
+    ids = itertools.count(1)
+    current = {"user": "u/alice"}
+    pool = DataFedClientPool(lambda: FakeAPI(f"{current['user']}#{next(ids)}"), size=size)
+    return pool, current
+
+
+def test_instances_are_reused():
+    pool, _ = make_pool()
+    with pool.session() as api:
+        first = api.api
+    with pool.session() as api:
+        assert api.api is first
+
+
+def test_context_is_only_sent_when_it_changes():
+    pool, _ = make_pool(size=1)
+    for context in ("p/a", "p/a", "p/b"):
+        with pool.session() as api:
+            api.setContext(context)
+    with pool.session() as api:
+        assert api.api.contexts == ["p/a", "p/b"]
+
+
+def test_reset_discards_leased_instances():
+    pool, current = make_pool(size=1)
+    with pool.session() as api:
+        current["user"] = "u/bob"
+        pool.reset()
+        assert api.whoami().startswith("u/alice")
+    # The instance leased before reset() is not handed out again
+    with pool.session() as api:
+        assert api.whoami().startswith("u/bob")
+        assert api.context is None
+
+
+def test_waiter_gets_new_instance_after_reset():
+    pool, current = make_pool(size=1)
+    leased = threading.Event()
+    release = threading.Event()
+    users = []
+
+    def holder():
+        with pool.session():
+            leased.set()
+            release.wait(5)
+
+    def waiter():
+        with pool.session() as api:
+            users.append(api.whoami())
+
+    holding = threading.Thread(target=holder)
+    holding.start()
+    leased.wait(5)
+    waiting = threading.Thread(target=waiter)
+    waiting.start()
+    current["user"] = "u/bob"
+    pool.reset()
+    release.set()
+    holding.join(5)
+    waiting.join(5)
+    assert not waiting.is_alive()
+    assert users and users[0].startswith("u/bob")
+
+
+def test_fallback_until_reset_after_login():
+    logged_in = {"user": None}
+    fallback = FakeAPI("u/ui")
+    pool = DataFedClientPool(
+        lambda: FakeAPI(logged_in["user"]) if logged_in["user"] else None, size=1, fallback_api=fallback
+    )
+    with pool.session() as api:
+        assert api is fallback
+    # The failed factory is not retried until the pool is reset, which the app does on login
+    logged_in["user"] = "u/alice"
+    with pool.session() as api:
+        assert api is fallback
+    pool.reset()
+    with pool.session() as api:
+        assert api.whoami() == "u/alice"
+
+
+def test_async_client_runs_calls_on_pooled_instances():
+    pool, _ = make_pool()
+    client = AsyncDataFedClient(pool)
+    try:
+        user = asyncio.run(asyncio.wait_for(client.call("whoami", context="p/a"), 5))
+    finally:
+        client.shutdown()
+    assert user.startswith("u/alice")
@@ -0,0 +1,90 @@
+import contextlib
+import json
+from types import SimpleNamespace
+
+from ingest_service import IngestService
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+class FakeAPI:
+    """dataCreate/dataBatchCreate/dataPut with a set of paths whose first dataPut fails"""
+    def __init__(self, failing_puts=()):
+        self.failing_puts = set(failing_puts)
+        self.records = {}
+        self.puts = []
+
+    def _create(self, title):
+        record_id = f"d/{len(self.records) + 1}"
+        self.records[record_id] = title
+        return SimpleNamespace(id=record_id)
+
+    def setContext(self, context):
+        pass
+
+    def dataCreate(self, title, metadata=None, parent_id="root", **kwargs):
+        return (SimpleNamespace(data=[self._create(title)]), "RecordDataReply")
+
+    def dataBatchCreate(self, files, coll_id=None, context=None):
+        with open(files[0]) as f:
+            payload = json.load(f)
+        return (SimpleNamespace(data=[self._create(record["title"]) for record in payload]), "RecordDataReply")
+
+    def dataPut(self, data_id, wait=False, path=None, **kwargs):
+        self.puts.append((data_id, path))
+        if path in self.failing_puts:
+            self.failing_puts.discard(path)
+            raise Exception("transfer endpoint unavailable")
+        task = SimpleNamespace(id=f"task/{len(self.puts)}", status=1, msg="")
+        return (SimpleNamespace(task=task), "DataPutReply")
+
+
+def make_service(tmp_path, api):
+    return IngestService(str(tmp_path), lambda: contextlib.nullcontext(api), metadata_cache_file="")
+
+
+def test_batch_retry_only_repeats_failed_puts(tmp_path):
+    api = FakeAPI(failing_puts={"/data/b"})
+    service = make_service(tmp_path, api)
+    items = [("/data/a", {"n": 1}), ("/data/b", {"n": 2}), ("/data/c", {"n": 3})]
+
+    results = service.upload_batch(items)
+    assert [result is not None for result in results] == [True, False, True]
+    assert len(api.records) == 3
+
+    # The failed item is retried on its own and goes into the record created for it
+    retry = service.upload_batch([("/data/b", {"n": 2})])
+    assert retry == [("d/2", "task/4")]
+    assert len(api.records) == 3
+    assert api.puts[-1] == ("d/2", "/data/b")
+
+
+def test_batch_retry_mixed_with_new_items(tmp_path):
+    api = FakeAPI(failing_puts={"/data/a"})
+    service = make_service(tmp_path, api)
+    service.upload_batch([("/data/a", {"n": 1})])
+
+    results = service.upload_batch([("/data/a", {"n": 1}), ("/data/d", {"n": 4})])
+    assert [record_id for record_id, _ in results] == ["d/1", "d/2"]
+    assert len(api.records) == 2
+
+
+def test_single_upload_retry_reuses_record(tmp_path):
+    api = FakeAPI(failing_puts={"/data/a"})
+    service = make_service(tmp_path, api)
+
+    assert service.upload_item("/data/a", {"n": 1}) is None
+    assert service.upload_item("/data/a", {"n": 1}) == ("d/1", "task/2")
+    assert len(api.records) == 1
+
+
+def test_failed_transfer_is_retried_into_its_record(tmp_path):
+    api = FakeAPI()
+    service = make_service(tmp_path, api)
+    record_id, _ = service.upload_item("/data/a", {"n": 1})
+
+    service._on_transfer_failed("/data/a", record_id, "failed")
+    assert service.upload_item("/data/a", {"n": 1})[0] == record_id
+    assert len(api.records) == 1
@@ -0,0 +1,82 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+from compaction import COMPACTION_KEY, compact_metadata
+from ingest_service import IngestService
+from MetaXtract import MyEncoder
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def encoded_size(metadata):
+    return len(json.dumps(metadata, cls=MyEncoder))
+
+
+def test_small_document_is_unchanged():
+    metadata = {"a": 1, "b": {"c": "text"}, "d": [1, 2, 3]}
+    assert compact_metadata(metadata) is metadata
+
+
+def test_size_budget():
+    metadata = {"header": {"instrument": "AFM"}}
+    metadata.update({f"field_{i}": "x" * (i * 100) for i in range(1, 40)})
+    assert encoded_size(metadata) > 16 * 1024
+
+    compacted = compact_metadata(metadata, max_bytes=16 * 1024)
+    assert encoded_size(compacted) <= 16 * 1024
+    # The largest values go first, small ones are kept
+    assert compacted["header"] == {"instrument": "AFM"}
+    assert "field_39" not in compacted
+    assert "field_1" in compacted
+    assert compacted[COMPACTION_KEY]["dropped"]["count"] > 0
+    # The input is not modified
+    assert "field_39" in metadata
+
+
+def test_arrays_and_long_lists_are_summarized():
+    metadata = {"image": np.arange(100.0).reshape(10, 10), "trace": list(range(50)), "short": [1, 2]}
+    compacted = compact_metadata(metadata)
+    assert compacted["image"] == {"shape": [10, 10], "dtype": "float64", "min": 0.0, "max": 99.0}
+    assert compacted["trace"] == {"length": 50, "type": "list", "min": 0, "max": 49}
+    assert compacted["short"] == [1, 2]
+    assert compacted[COMPACTION_KEY]["summarized"]["paths"] == ["image", "trace"]
+
+
+def test_depth_is_bounded():
+    metadata = {"a": {"b": {"c": {"d": 1}}}}
+    compacted = compact_metadata(metadata, max_depth=2)
+    assert compacted["a"]["b"] == {"pruned_keys": 1}
+    assert compacted[COMPACTION_KEY]["pruned"]["paths"] == ["a.b"]
+
+
+def test_compaction_is_idempotent():
+    metadata = {f"field_{i}": "x" * 1000 for i in range(20)}
+    compacted = compact_metadata(metadata, max_bytes=8 * 1024)
+    assert compact_metadata(compacted, max_bytes=8 * 1024) is compacted
+
+
+def test_cache_stores_compacted_metadata(tmp_path):
+    data_file = tmp_path / "sample.bin"
+    data_file.write_bytes(b"data")
+    calls = []
+
+    def extract(path):
+        calls.append(path)
+        return {f"field_{i}": "x" * 1000 for i in range(20)}
+
+    service = IngestService(
+        str(tmp_path), session=None, metadata_cache_file=str(tmp_path / "cache.db"), metadata_max_kb=8
+    )
+    service.get_extraction_service = lambda: SimpleNamespace(extract=extract)
+    try:
+        first = service.extract_metadata(str(data_file))
+        assert COMPACTION_KEY in first
+        assert COMPACTION_KEY in service._metadata_cache.get(str(data_file))
+        assert service.extract_metadata(str(data_file)) == first
+        assert len(calls) == 1
+    finally:
+        service.close()
@@ -0,0 +1,43 @@
+import os
+
+from directory_stats import DirectoryStats
+from snapshot import DirectorySnapshot
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_tree_sizes_groups_files_under_each_item(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, "run1", "a.bin"), 10)
+    write(os.path.join(root, "run1", "sub", "b.bin"), 20)
+    write(os.path.join(root, "run2", "c.bin"), 5)
+    write(os.path.join(root, "single.bin"), 7)
+    snapshot = DirectorySnapshot(root)
+    snapshot.add_tree()
+
+    items = [os.path.join(root, name) for name in ("run1", "run2", "single.bin", "missing")]
+    sizes = snapshot.tree_sizes(items)
+    assert sizes == dict(zip(items, [30, 5, 7, 0]))
+    assert all(sizes[item] == snapshot.tree_size(item) for item in items)
+
+
+def test_backlog_is_merged_across_cycles(tmp_path):
+    stats = DirectoryStats()
+    stats.refresh(str(tmp_path))
+    sizes = {"a": 1, "b": 2, "c": 4}
+    stats.set_backlog(["a", "b"], size_fn=sizes.__getitem__)
+    # A later cycle only reports the items it found, the earlier ones are still pending
+    stats.set_backlog(["c"], size_fn=sizes.__getitem__)
+    stats.discard("a")
+
+    info = stats.get(str(tmp_path))
+    assert info["backlog_count"] == 2
+    assert info["backlog_bytes"] == 6
@@ -0,0 +1,54 @@
+import json
+
+from directory_summary import merge_metadata, summarize_directory
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_merge_metadata():
+    common, varying = merge_metadata([
+        {"instrument": {"name": "AFM", "mode": "tapping"}, "voltage": 1.0, "user": "a"},
+        {"instrument": {"name": "AFM", "mode": "contact"}, "voltage": 3.0},
+    ])
+    assert common == {"instrument": {"name": "AFM"}}
+    assert varying["instrument.mode"] == {"files": 2, "distinct": 2, "examples": ["tapping", "contact"]}
+    assert varying["voltage"] == {"files": 2, "distinct": 2, "min": 1.0, "max": 3.0}
+    assert varying["user"] == {"files": 1, "distinct": 1, "examples": ["a"]}
+
+
+def test_summarize_directory(tmp_path):
+    for i in range(5):
+        (tmp_path / f"scan_{i}.json").write_text(json.dumps({"sample": "S1", "index": i}))
+    (tmp_path / "notes.log").write_text("skipped")
+
+    summary = summarize_directory(
+        str(tmp_path), load_json, max_files=3,
+        is_candidate_file=lambda name: not name.endswith(".log")
+    )
+    assert summary["file_count"] == 5
+    assert summary["summarized_files"] == 3
+    assert summary["skipped_files"] == 2
+    assert summary["file_types"] == {".json": 5}
+    assert summary["common"] == {"sample": "S1"}
+    assert summary["varying"]["index"] == {"files": 3, "distinct": 3, "min": 0, "max": 2}
+
+
+def test_failed_extractions_are_counted(tmp_path):
+    (tmp_path / "a.dat").write_text("a")
+    (tmp_path / "b.dat").write_text("b")
+
+    def extract(path):
+        if path.endswith("b.dat"):
+            raise ValueError("unreadable")
+        return {"ok": True}
+
+    summary = summarize_directory(str(tmp_path), extract)
+    assert summary["failed_files"] == 1
+    assert summary["common"] == {"ok": True}
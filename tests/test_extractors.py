@@ -0,0 +1,98 @@
+from extractors import BUILTIN_SIGNATURES, SNIFF_BYTES, ExtractorRegistry
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+HDF5_MAGIC = b"\x89HDF\r\n\x1a\n"
+
+
+class FakeH5:
+    pass
+
+
+class FakeDM4:
+    pass
+
+
+class FakeXRDML:
+    pass
+
+
+class FakeIBW:
+    pass
+
+
+def make_registry():
+    return ExtractorRegistry(
+        builtins={".h5": FakeH5, ".hdf5": FakeH5, ".dm4": FakeDM4, ".xrdml": FakeXRDML, ".ibw": FakeIBW},
+        signatures={
+            FakeH5: BUILTIN_SIGNATURES["materials.AFM.bandexcitation.h5:H5"],
+            FakeDM4: BUILTIN_SIGNATURES["materials.EM.dm.dm4:DM4"],
+            FakeXRDML: BUILTIN_SIGNATURES["materials.Xray.panalytical.xrdml:XRDML"],
+        },
+        discover=False,
+    )
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def hdf5_with_user_block(size):
+    return b"\0" * size + HDF5_MAGIC + b"\0" * 64
+
+
+def test_extension_and_content_agree(tmp_path):
+    registry = make_registry()
+    assert registry.resolve(write(tmp_path / "a.h5", hdf5_with_user_block(0))) == (FakeH5, None)
+    dm4 = b"\x00\x00\x00\x04" + b"\x00" * 8 + b"\x00\x00\x00\x01" + b"\x00" * 32
+    assert registry.resolve(write(tmp_path / "b.dm4", dm4)) == (FakeDM4, None)
+
+
+def test_content_wins_over_extension(tmp_path):
+    registry = make_registry()
+    xrdml = b'<?xml version="1.0"?>\n<xrdMeasurements xmlns="http://www.xrdml.com/XRDMeasurement/2.1">'
+    assert registry.resolve(write(tmp_path / "scan.dat", xrdml)) == (FakeXRDML, None)
+    assert registry.resolve(write(tmp_path / "scan.h5", xrdml)) == (FakeXRDML, None)
+
+
+def test_mismatch_is_reported(tmp_path):
+    registry = make_registry()
+    cls, reason = registry.resolve(write(tmp_path / "broken.h5", b"not an hdf5 file" * 1000))
+    assert cls is None
+    assert ".h5" in reason
+
+
+def test_formats_without_signature_use_extension(tmp_path):
+    registry = make_registry()
+    assert registry.resolve(write(tmp_path / "a.ibw", b"\x05\x00" + b"\0" * 100)) == (FakeIBW, None)
+    assert registry.resolve(write(tmp_path / "a.txt", b"plain text")) == (None, None)
+
+
+def test_hdf5_user_blocks(tmp_path):
+    registry = make_registry()
+    for size in (512, 2048, SNIFF_BYTES, 8 * SNIFF_BYTES):
+        path = write(tmp_path / f"block_{size}.hdf5", hdf5_with_user_block(size))
+        assert registry.resolve(path) == (FakeH5, None), size
+    # Large user blocks are only probed for files expected to be HDF5
+    assert registry.resolve(write(tmp_path / "block.dat", hdf5_with_user_block(8 * SNIFF_BYTES))) == (None, None)
+
+
+def test_matched_format_is_tried_first(tmp_path):
+    registry = make_registry()
+    xrdml = b"<xrdMeasurements>"
+    registry.resolve(write(tmp_path / "a.dat", xrdml))
+    assert registry._dispatch[".dat"][0] is FakeXRDML
+
+
+def test_register_overrides_builtin(tmp_path):
+    registry = make_registry()
+
+    class Custom:
+        magic = (((0, b"CUSTOM"),),)
+
+    registry.register("h5", Custom)
+    assert registry.get(".h5") is Custom
+    assert registry.resolve(write(tmp_path / "a.h5", b"CUSTOM" + b"\0" * 10)) == (Custom, None)
@@ -0,0 +1,106 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import file_selector
+from file_selector import FileSelector, _resort
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "sub" / "inner").mkdir(parents=True)
+    (tmp_path / "sub" / "a.txt").write_text("a")
+    (tmp_path / "b.txt").write_text("b")
+    return str(tmp_path)
+
+
+def listed(selector):
+    return selector._selector._lists[False].options
+
+
+def test_navigate_into_subdirectory_and_back_up(tree):
+    selector = FileSelector(tree, root_directory=tree)
+    assert listed(selector) == ["📁sub", "b.txt"]
+
+    selector._select_and_go(SimpleNamespace(option="📁sub"))
+    assert selector._cwd == os.path.join(tree, "sub")
+    assert listed(selector) == ["⬆ panel.", "📁inner", "a.txt"]
+
+    selector._select_and_go(SimpleNamespace(option="⬆ panel."))
+    assert selector._cwd == tree
+    assert listed(selector) == ["📁sub", "b.txt"]
+
+
+def test_virtual_window_pages_inside_subdirectory(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for i in range(30):
+        (sub / f"f{i:02d}.txt").write_text("")
+    selector = FileSelector(str(tmp_path), root_directory=str(tmp_path), virtual_window=12, size=5)
+
+    selector._select_and_go(SimpleNamespace(option="📁sub"))
+    options = listed(selector)
+    assert options[0] == "⬆ panel."
+    assert options[1:13] == [f"f{i:02d}.txt" for i in range(12)]
+    assert options[-1].startswith("⋯ next")
+
+    selector._select_and_go(SimpleNamespace(option=options[-1]))
+    options = listed(selector)
+    assert options[:2] == ["⬆ panel.", "⋯ previous 7 entries"]
+    assert "f07.txt" in options
+
+
+def bump_mtime(dir_path):
+    mtime_ns = os.stat(dir_path).st_mtime_ns + 1_000_000_000
+    os.utime(dir_path, ns=(mtime_ns, mtime_ns))
+
+
+def test_resort_patches_small_changes():
+    old = ["a", "c", "e", "g", "i", "k", "m", "o"]
+    assert _resort(old, ["o", "a", "d", "e", "g", "i", "k", "m", "c"]) == ["a", "c", "d", "e", "g", "i", "k", "m", "o"]
+    # Too many changes: sorted from scratch
+    assert _resort(old, ["z", "y", "x", "a"]) == ["a", "x", "y", "z"]
+
+
+def test_list_dir_is_cached_until_mtime_changes(tree):
+    selector = FileSelector(tree)
+    first = selector._list_dir(tree)
+    assert first == ([os.path.join(tree, "sub")], [os.path.join(tree, "b.txt")])
+    assert selector._list_dir(tree)[1] is first[1]
+
+    # A file added within the same mtime is only seen with force
+    open(os.path.join(tree, "c.txt"), "w").close()
+    stat = os.stat(tree)
+    os.utime(tree, ns=(stat.st_atime_ns, file_selector._LISTING_CACHE[tree][0]))
+    assert selector._list_dir(tree)[1] == [os.path.join(tree, "b.txt")]
+    assert selector._list_dir(tree, force=True)[1] == [os.path.join(tree, "b.txt"), os.path.join(tree, "c.txt")]
+
+    os.remove(os.path.join(tree, "b.txt"))
+    bump_mtime(tree)
+    assert selector._list_dir(tree)[1] == [os.path.join(tree, "c.txt")]
+
+
+def test_listing_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_selector, "LISTING_CACHE_SIZE", 2)
+    monkeypatch.setattr(file_selector, "_LISTING_CACHE", {})
+    selector = FileSelector(str(tmp_path))
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        selector._list_dir(str(tmp_path / name))
+    assert list(file_selector._LISTING_CACHE) == [str(tmp_path / "b"), str(tmp_path / "c")]
+
+
+def test_scan_path_filters_files_by_pattern(tree):
+    open(os.path.join(tree, "data.h5"), "w").close()
+    selector = FileSelector(tree)
+    dirs, files = selector._scan_path(tree, "*.h5", force=True)
+    assert dirs == [os.path.join(tree, "sub")]
+    assert files == [os.path.join(tree, "data.h5")]
+    # The caller gets copies, so the cached listing cannot be changed through them
+    files.clear()
+    assert selector._scan_path(tree, "*")[1] == [os.path.join(tree, "b.txt"), os.path.join(tree, "data.h5")]
@@ -0,0 +1,58 @@
+import h5py
+import numpy as np
+
+from materials.AFM.bandexcitation.h5 import H5
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def test_hard_links_are_recorded_once(tmp_path):
+    path = str(tmp_path / "linked.h5")
+    with h5py.File(path, "w") as f:
+        group = f.create_group("measurement")
+        group.attrs["voltage"] = 1.5
+        group.create_dataset("data", data=np.arange(5))
+        f["alias"] = group
+
+    # Groups are walked in name order, so the group is recorded under its first name
+    metadata = H5(path).extract()
+    assert metadata["alias"] == {"voltage": 1.5}
+    assert "alias/data" in metadata
+    assert not any(key.startswith("measurement") for key in metadata)
+
+
+def test_object_limit(tmp_path):
+    path = str(tmp_path / "many.h5")
+    with h5py.File(path, "w") as f:
+        for i in range(20):
+            f.create_group(f"g{i:02d}").attrs["index"] = i
+
+    metadata = H5(path, max_objects=5).extract()
+    assert len([key for key in metadata if key.startswith("g")]) <= 5
+
+
+def test_object_limit_counts_skipped_datasets(tmp_path):
+    path = str(tmp_path / "datasets.h5")
+    with h5py.File(path, "w") as f:
+        for i in range(20):
+            f.create_dataset(f"d{i:02d}", data=np.arange(3))
+
+    # Datasets are opened but not recorded, and still count towards the limit
+    metadata = H5(path, max_objects=5, skip_datasets=True).extract()
+    assert metadata["_walk_truncated"] is True
+
+
+def test_extractor_options_reach_the_extractor(tmp_path):
+    from util import get_file_metadata
+
+    path = str(tmp_path / "deep.h5")
+    with h5py.File(path, "w") as f:
+        f.create_group("a/b/c").attrs["level"] = 3
+        f["a"].attrs["level"] = 1
+
+    metadata = get_file_metadata(path, {"H5": {"max_depth": 1}})
+    assert metadata["a"] == {"level": 1}
+    assert not any(key.startswith("a/b") for key in metadata)
+    assert "a/b/c" in get_file_metadata(path)
@@ -0,0 +1,94 @@
+import contextlib
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+from ingest_service import IngestService
+from transfer_monitor import TS_RUNNING, TS_SUCCEEDED, StubTaskAPI
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+class FakeDataFed(StubTaskAPI):
+    """StubTaskAPI plus dataCreate; tasks stay running until finish() is called"""
+    def __init__(self):
+        super().__init__(script=(TS_RUNNING,))
+        self.created = []
+        self._lock = threading.Lock()
+
+    def setContext(self, context):
+        pass
+
+    def dataCreate(self, title, metadata=None, parent_id="root", **kwargs):
+        with self._lock:
+            self.created.append(title)
+            record_id = f"d/{len(self.created)}"
+        return (SimpleNamespace(data=[SimpleNamespace(id=record_id)]), "RecordDataReply")
+
+    def finish(self):
+        for task_id in self.tasks:
+            self.tasks[task_id] = [TS_SUCCEEDED]
+
+
+def wait_for(condition, timeout=20):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.05)
+
+
+def committed(ledger_path):
+    with sqlite3.connect(ledger_path) as conn:
+        return [item for item, in conn.execute("SELECT item FROM processed")]
+
+
+def make_service(tmp_path, api):
+    watched = tmp_path / "watched"
+    watched.mkdir()
+    (watched / "scan.dat").write_text("data")
+    service = IngestService(
+        str(watched), lambda: contextlib.nullcontext(api), watcher_backend="polling", watch_timeout=0.1,
+        stable_window=0, metadata_cache_file="", snapshot_dir="", transfer_drain_timeout=1.0,
+    )
+    service.get_extraction_service = lambda: SimpleNamespace(extract=lambda path: {"name": "scan"})
+    return service, str(watched / service.ledger_file)
+
+
+def test_restart_during_drain_does_not_upload_again(tmp_path):
+    api = FakeDataFed()
+    service, ledger_path = make_service(tmp_path, api)
+    try:
+        service.start()
+        wait_for(lambda: service._transfer_monitor is not None and service._transfer_monitor.pending)
+
+        # Start again while the first run is still draining its running transfer
+        service.stop()
+        service.start()
+        wait_for(lambda: service._transfer_monitor is not None and service._transfer_monitor.pending
+                 and service._thread is not None and service.running)
+        time.sleep(0.5)
+        assert api.created == ["scan"]
+
+        api.finish()
+        wait_for(lambda: "scan.dat" in committed(ledger_path))
+        assert api.created == ["scan"]
+    finally:
+        service.close()
+
+
+def test_finished_transfer_is_committed_without_shutdown(tmp_path):
+    api = FakeDataFed()
+    service, ledger_path = make_service(tmp_path, api)
+    try:
+        service.start()
+        wait_for(lambda: service._transfer_monitor is not None and service._transfer_monitor.pending)
+        api.finish()
+        # Committed as soon as the monitor reports it, not when 20 items are pending or the service stops
+        wait_for(lambda: "scan.dat" in committed(ledger_path))
+        assert service.running
+    finally:
+        service.close()
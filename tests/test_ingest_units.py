@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from ingest_units import item_key, scan_units, units_for_path
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """
+    base/
+        a.txt
+        run1/x.dat
+        run2/y.dat
+        run2/sub/z.dat
+        .hidden
+    """
+    base = tmp_path / "base"
+    (base / "run1").mkdir(parents=True)
+    (base / "run2" / "sub").mkdir(parents=True)
+    for name in ("a.txt", "run1/x.dat", "run2/y.dat", "run2/sub/z.dat", ".hidden"):
+        (base / name).write_text(name)
+    return str(base)
+
+
+def relative(base, items):
+    return [item_key(base, item) for item in items]
+
+
+def candidate(name):
+    return not name.startswith(".")
+
+
+def test_item_key(tree):
+    assert item_key(tree, os.path.join(tree, "a.txt")) == "a.txt"
+    assert item_key(tree, os.path.join(tree, "run2", "sub", "z.dat")) == "run2/sub/z.dat"
+
+
+def test_top_level(tree):
+    items = scan_units(tree, "top_level", is_candidate_file=candidate)
+    assert relative(tree, items) == ["a.txt", "run1", "run2"]
+
+
+def test_leaf_dir(tree):
+    items = scan_units(tree, "leaf_dir", is_candidate_file=candidate)
+    assert relative(tree, items) == ["a.txt", "run1", "run2/y.dat", "run2/sub"]
+
+
+def test_file(tree):
+    items = scan_units(tree, "file", is_candidate_file=candidate)
+    assert relative(tree, items) == ["a.txt", "run1/x.dat", "run2/y.dat", "run2/sub/z.dat"]
+
+
+def test_ingested_items_are_pruned(tree):
+    listed = []
+
+    def list_dir(path):
+        listed.append(item_key(tree, path))
+        files, dirs = [], []
+        for entry in os.scandir(path):
+            (dirs if entry.is_dir() else files).append(entry.path)
+        return files, dirs
+
+    ingested = {"a.txt", "run2"}
+    items = scan_units(tree, "file", is_ingested=lambda key: key in ingested, is_candidate_file=candidate,
+                       list_dir=list_dir)
+    assert relative(tree, items) == ["run1/x.dat"]
+    assert "run2" not in listed
+
+
+def test_unknown_unit(tree):
+    with pytest.raises(ValueError):
+        scan_units(tree, "everything")
+
+
+def test_units_for_path(tree):
+    changed = os.path.join(tree, "run2", "sub", "z.dat")
+    assert relative(tree, units_for_path(tree, changed, False, "top_level")) == ["run2"]
+    assert relative(tree, units_for_path(tree, changed, False, "leaf_dir")) == ["run2/sub"]
+    assert relative(tree, units_for_path(tree, changed, False, "file")) == ["run2/sub/z.dat"]
+    assert units_for_path(tree, os.path.join(tree, ".hidden"), False, "top_level", candidate) == []
+    assert units_for_path(tree, os.path.dirname(tree), True) == []
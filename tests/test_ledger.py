@@ -0,0 +1,83 @@
+import json
+import sqlite3
+
+from ledger import ProcessedLedger, open_ledger
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return [item for item, in conn.execute("SELECT item FROM processed ORDER BY rowid")]
+
+
+def test_membership_and_recent(tmp_path):
+    ledger = ProcessedLedger(str(tmp_path / "ledger.db"))
+    ledger.add_many(["a", "b", "c"])
+    assert "b" in ledger
+    assert "d" not in ledger
+    assert len(ledger) == 3
+    assert ledger.recent(2) == ["b", "c"]
+    # Re-adding an item moves it to the end
+    ledger.add("a")
+    assert ledger.recent(3) == ["b", "c", "a"]
+    ledger.close()
+
+
+def test_writes_are_committed_in_batches(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    ledger = ProcessedLedger(db_path, batch_size=3)
+    ledger.add("a")
+    ledger.add("b")
+    assert rows(db_path) == []
+    ledger.add("c")
+    assert rows(db_path) == ["a", "b", "c"]
+    ledger.add("d")
+    ledger.flush()
+    assert rows(db_path) == ["a", "b", "c", "d"]
+    ledger.close()
+
+
+def test_reopen_keeps_items(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    ledger = ProcessedLedger(db_path)
+    ledger.add_many(["run1", "run2/x.dat"])
+    ledger.close()
+
+    reopened = ProcessedLedger(db_path)
+    assert list(reopened) == ["run1", "run2/x.dat"]
+    reopened.close()
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "backup_log.json"
+    legacy.write_text(json.dumps({
+        "processed_dirs": ["old1", "old2"],
+        "timestamps": {"old1": "2024-01-01T00:00:00"},
+    }))
+    db_path = str(tmp_path / "backup_log.db")
+
+    ledger = open_ledger(db_path, legacy_json_path=str(legacy))
+    assert list(ledger) == ["old1", "old2"]
+    ledger.close()
+
+    # The database exists now, so later changes to the legacy log are ignored
+    legacy.write_text(json.dumps({"processed_dirs": ["old3"]}))
+    ledger = open_ledger(db_path, legacy_json_path=str(legacy))
+    assert "old3" not in ledger
+    ledger.close()
+
+
+def test_in_flight_transfers_are_stored(tmp_path):
+    db_path = str(tmp_path / "ledger.db")
+    ledger = ProcessedLedger(db_path)
+    ledger.save_transfers([("/data/a", "d/1", "task/1", 100.0), ("/data/b", "d/2", "task/2", 200.0)])
+    ledger.close()
+
+    ledger = ProcessedLedger(db_path)
+    assert ledger.load_transfers() == [("/data/a", "d/1", "task/1", 100.0), ("/data/b", "d/2", "task/2", 200.0)]
+    ledger.save_transfers([])
+    assert ledger.load_transfers() == []
+    ledger.close()
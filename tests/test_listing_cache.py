@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+import listing_cache
+from listing_cache import ListingCache
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(listing_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ListingCache(ttl=60)
+    fetch = Counter()
+    assert cache.get_or_fetch(("projects",), fetch) == "reply 1"
+    clock[0] += 59
+    assert cache.get_or_fetch(("projects",), fetch) == "reply 1"
+    clock[0] += 2
+    assert cache.get_or_fetch(("projects",), fetch) == "reply 2"
+    assert fetch.calls == 2
+
+
+def test_invalidate_drops_keys_with_prefix(clock):
+    cache = ListingCache()
+    fetch = Counter()
+    for key in [("items", "p/a", "root"), ("items", "p/a", "c/1"), ("items", "p/b", "root"), ("projects",)]:
+        cache.get_or_fetch(key, fetch)
+
+    cache.invalidate("items", "p/a")
+    assert cache.get_or_fetch(("items", "p/a", "root"), fetch) == "reply 5"
+    assert cache.get_or_fetch(("items", "p/b", "root"), fetch) == "reply 3"
+
+    cache.invalidate("items")
+    assert cache.get_or_fetch(("items", "p/b", "root"), fetch) == "reply 6"
+    assert cache.get_or_fetch(("projects",), fetch) == "reply 4"
+
+    cache.clear()
+    assert cache.get_or_fetch(("projects",), fetch) == "reply 7"
+
+
+def test_concurrent_async_lookups_share_one_fetch():
+    cache = ListingCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "items"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch_async(("items", "p/a", "root"), fetch) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["items"] * 3
+    assert len(calls) == 1
+
+
+def test_failed_async_fetch_is_not_cached():
+    cache = ListingCache()
+    replies = [RuntimeError("offline"), "items"]
+
+    async def fetch():
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_fetch_async(("projects",), fetch)
+        return await cache.get_or_fetch_async(("projects",), fetch)
+
+    assert asyncio.run(main()) == "items"
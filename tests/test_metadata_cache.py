@@ -0,0 +1,111 @@
+import os
+
+from metadata_cache import MetadataCache
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+class CountingExtractor:
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result
+
+    def __call__(self, path):
+        self.calls += 1
+        return self.result if self.result is not None else {"size": os.path.getsize(path), "call": self.calls}
+
+
+def test_hit_for_unchanged_file(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"12345")
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    extract = CountingExtractor()
+
+    assert cache.get_or_extract(str(data), extract) == {"size": 5, "call": 1}
+    assert cache.get_or_extract(str(data), extract) == {"size": 5, "call": 1}
+    assert extract.calls == 1
+    cache.close()
+
+
+def test_rewritten_file_is_extracted_again(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"12345")
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    extract = CountingExtractor()
+    cache.get_or_extract(str(data), extract)
+
+    data.write_bytes(b"1234567")
+    assert cache.get(str(data)) is None
+    assert cache.get_or_extract(str(data), extract) == {"size": 7, "call": 2}
+    cache.close()
+
+
+def test_same_size_rewrite_is_caught_by_mtime(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"aaaaa")
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    cache.put(str(data), {"v": 1})
+
+    data.write_bytes(b"bbbbb")
+    st = os.stat(data)
+    os.utime(data, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.get(str(data)) is None
+    cache.close()
+
+
+def test_verify_hash(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"aaaaa")
+    cache = MetadataCache(str(tmp_path / "cache.db"), verify_hash=True)
+    cache.put(str(data), {"v": 1})
+
+    # Same size and restored mtime, different content
+    st = os.stat(data)
+    data.write_bytes(b"bbbbb")
+    os.utime(data, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert cache.get(str(data)) is None
+    cache.close()
+
+
+def test_errors_are_not_cached(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"1")
+    cache = MetadataCache(str(tmp_path / "cache.db"))
+    extract = CountingExtractor({"error": "timeout"})
+    cache.get_or_extract(str(data), extract)
+    cache.get_or_extract(str(data), extract)
+    assert extract.calls == 2
+    cache.close()
+
+
+def test_lru_eviction(tmp_path):
+    cache = MetadataCache(str(tmp_path / "cache.db"), max_bytes=250)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.dat"
+        path.write_bytes(b"x")
+        paths.append(str(path))
+        cache.put(str(path), {"payload": "y" * 80})
+    assert cache.get(paths[0]) is None
+    assert cache.get(paths[2]) is not None
+    cache.close()
+
+
+def test_version_change_empties_cache(tmp_path):
+    data = tmp_path / "a.dat"
+    data.write_bytes(b"1")
+    db_path = str(tmp_path / "cache.db")
+
+    cache = MetadataCache(db_path, version="compact:64:8")
+    cache.put(str(data), {"v": 1})
+    cache.close()
+
+    cache = MetadataCache(db_path, version="compact:64:8")
+    assert cache.get(str(data)) == {"v": 1}
+    cache.close()
+
+    cache = MetadataCache(db_path, version="compact:32:8")
+    assert cache.get(str(data)) is None
+    cache.close()
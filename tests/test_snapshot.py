@@ -0,0 +1,117 @@
+import os
+
+from snapshot import DirectorySnapshot
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def write(path, data="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+
+
+def bump_mtime(dir_path):
+    """Move a directory's mtime forward, so the change is seen even within the filesystem's timestamp granularity"""
+    mtime_ns = os.stat(dir_path).st_mtime_ns + 1_000_000_000
+    os.utime(dir_path, ns=(mtime_ns, mtime_ns))
+
+
+def make_tree(root):
+    write(os.path.join(root, "run1", "a.dat"), "aaaa")
+    write(os.path.join(root, "run1", "sub", "b.dat"), "bb")
+    write(os.path.join(root, "top.dat"), "t")
+    write(os.path.join(root, "$RECYCLE.BIN", "old.dat"), "old")
+
+
+def test_add_tree_skips_ignored_directories(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+    snapshot = DirectorySnapshot(root)
+    created = []
+    snapshot.add_tree(on_change=lambda kind, path, is_dir: created.append(os.path.relpath(path, root)))
+
+    assert len(snapshot) == 3
+    assert {"run1", "run1/a.dat", "run1/sub", "run1/sub/b.dat", "top.dat"} <= set(created)
+    files, dirs = snapshot.children(root)
+    assert files == [os.path.join(root, "top.dat")]
+    assert dirs == [os.path.join(root, "run1")]
+
+
+def test_refresh_reports_created_modified_and_deleted_entries(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+    snapshot = DirectorySnapshot(root)
+    snapshot.add_tree()
+    assert snapshot.refresh() == 0
+
+    run1 = os.path.join(root, "run1")
+    write(os.path.join(run1, "a.dat"), "longer content")
+    write(os.path.join(run1, "new", "c.dat"))
+    os.remove(os.path.join(run1, "sub", "b.dat"))
+    os.rmdir(os.path.join(run1, "sub"))
+    bump_mtime(run1)
+
+    events = []
+    assert snapshot.refresh(lambda kind, path, is_dir: events.append((kind, os.path.relpath(path, root), is_dir))) == 1
+    assert ("modified", "run1/a.dat", False) in events
+    assert ("created", "run1/new", True) in events
+    assert ("created", "run1/new/c.dat", False) in events
+    assert ("deleted", "run1/sub", True) in events
+    # The new directory is snapshotted, the removed one is dropped
+    assert snapshot.entries(os.path.join(run1, "new")).keys() == {"c.dat"}
+    assert snapshot.entries(os.path.join(run1, "sub")) == {}
+
+
+def test_refresh_drops_removed_trees(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+    snapshot = DirectorySnapshot(root)
+    snapshot.add_tree()
+    for name in ("sub/b.dat", "a.dat"):
+        os.remove(os.path.join(root, "run1", name))
+    os.rmdir(os.path.join(root, "run1", "sub"))
+    os.rmdir(os.path.join(root, "run1"))
+    bump_mtime(root)
+
+    events = []
+    snapshot.refresh(lambda kind, path, is_dir: events.append((kind, os.path.relpath(path, root))))
+    assert events == [("deleted", "run1")]
+    assert len(snapshot) == 1
+
+
+def test_snapshot_persists_across_restarts(tmp_path):
+    root = str(tmp_path / "data")
+    db_path = str(tmp_path / "state" / "snapshot.db")
+    make_tree(root)
+    snapshot = DirectorySnapshot(root, db_path=db_path)
+    snapshot.add_tree()
+    snapshot.close()
+
+    # Only the directory that changed while stopped is listed again
+    write(os.path.join(root, "run1", "late.dat"))
+    bump_mtime(os.path.join(root, "run1"))
+    reopened = DirectorySnapshot(root, db_path=db_path)
+    assert len(reopened) == 3
+    events = []
+    assert reopened.refresh(lambda kind, path, is_dir: events.append((kind, os.path.relpath(path, root)))) == 1
+    assert events == [("created", "run1/late.dat")]
+    reopened.close()
+
+    loaded = DirectorySnapshot(root, db_path=db_path)
+    assert "late.dat" in loaded.entries(os.path.join(root, "run1"))
+    loaded.close()
+
+
+def test_tree_size(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+    snapshot = DirectorySnapshot(root)
+    snapshot.add_tree()
+
+    assert snapshot.tree_size(os.path.join(root, "run1")) == 6
+    assert snapshot.tree_size(os.path.join(root, "top.dat")) == 1
+    assert snapshot.tree_size(root) == 7
+    assert snapshot.tree_size(os.path.join(root, "missing")) == 0
@@ -0,0 +1,101 @@
+import os
+
+from stability import QuiescenceDetector, is_sidecar
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def recent_file(path, now):
+    path.write_bytes(b"data")
+    os.utime(path, (now, now))
+    return str(path)
+
+
+def test_is_sidecar():
+    for name in ("scan.dm4.lock", "scan.tmp", "~$notes.docx", ".~lock.notes.odt#", "x.crdownload"):
+        assert is_sidecar(name)
+    assert not is_sidecar("scan.dm4")
+
+
+def test_item_is_ready_after_window(tmp_path):
+    now = 1_000_000.0
+    item = recent_file(tmp_path / "scan.dm4", now)
+    detector = QuiescenceDetector(window=10)
+
+    detector.observe(item, now=now)
+    assert detector.ready(now=now + 5) == []
+    assert detector.ready(now=now + 10) == [item]
+    # Ready items are no longer tracked
+    assert detector.pending_items() == []
+
+
+def test_old_file_is_ready_immediately(tmp_path):
+    now = 1_000_000.0
+    item = recent_file(tmp_path / "scan.dm4", now - 3600)
+    detector = QuiescenceDetector(window=10)
+    detector.observe(item, now=now)
+    assert detector.ready(now=now) == [item]
+
+
+def test_change_restarts_window(tmp_path):
+    now = 1_000_000.0
+    path = tmp_path / "scan.dm4"
+    item = recent_file(path, now)
+    detector = QuiescenceDetector(window=10)
+    detector.observe(item, now=now)
+
+    path.write_bytes(b"more data")
+    os.utime(path, (now + 8, now + 8))
+    detector.observe(item, now=now + 8)
+    assert detector.ready(now=now + 12) == []
+    assert detector.ready(now=now + 18) == [item]
+
+
+def test_touch_restarts_window(tmp_path):
+    now = 1_000_000.0
+    run = tmp_path / "run1"
+    run.mkdir()
+    detector = QuiescenceDetector(window=10)
+    detector.observe(str(run), now=now)
+
+    detector.touch(str(run), now=now + 9)
+    assert detector.ready(now=now + 10) == []
+    assert detector.ready(now=now + 19) == [str(run)]
+
+
+def test_sidecar_holds_item_back(tmp_path):
+    now = 1_000_000.0
+    item = recent_file(tmp_path / "scan.dm4", now - 3600)
+    lock = tmp_path / "scan.dm4.lock"
+    lock.write_text("")
+    detector = QuiescenceDetector(window=10)
+    detector.observe(item, now=now)
+    assert detector.ready(now=now) == []
+
+    lock.unlink()
+    assert detector.ready(now=now) == [item]
+
+
+def test_sidecar_inside_directory_from_events(tmp_path):
+    now = 1_000_000.0
+    run = tmp_path / "run1"
+    run.mkdir()
+    lock = run / "acquisition.lck"
+    detector = QuiescenceDetector(window=10)
+    detector.observe(str(run), now=now)
+
+    lock.write_text("")
+    detector.note_event("created", str(lock))
+    assert detector.ready(now=now + 10) == []
+
+    lock.unlink()
+    detector.note_event("deleted", str(lock))
+    assert detector.ready(now=now + 10) == [str(run)]
+
+
+def test_missing_item_is_forgotten(tmp_path):
+    detector = QuiescenceDetector(window=10)
+    detector.observe(str(tmp_path / "gone.dm4"))
+    assert detector.pending_items() == []
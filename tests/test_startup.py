@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+CLIENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "diatoms_to_datafed", "Datafed_Client")
+
+# Runs in a fresh interpreter, so backends imported by other tests do not count
+CHILD = r"""
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import util, ingest_service
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules} & {"hyperspy", "h5py", "igor2"})))
+"""
+
+
+def test_core_modules_do_not_import_format_backends():
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, CLIENT_DIR], check=True, capture_output=True, text=True
+    ).stdout
+    assert json.loads(out.strip().splitlines()[-1]) == []
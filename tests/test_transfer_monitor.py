@@ -0,0 +1,140 @@
+import contextlib
+import time
+
+import pytest
+
+from transfer_monitor import (
+    TS_FAILED,
+    TS_RUNNING,
+    TS_SUCCEEDED,
+    StubTaskAPI,
+    TransferMonitor,
+    task_id_from_reply,
+)
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def make_monitor(api, **kwargs):
+    events = []
+    monitor = TransferMonitor(
+        lambda: contextlib.nullcontext(api),
+        on_success=lambda item, record_id: events.append(("success", item, record_id)),
+        on_failure=lambda item, record_id, message: events.append(("failure", item, record_id, message)),
+        **kwargs
+    )
+    return monitor, events
+
+
+def start_transfer(api, monitor, item, record_id):
+    task_id = task_id_from_reply(api.dataPut(record_id, wait=False, path=item))
+    monitor.track(item, record_id, task_id)
+    return task_id
+
+
+def test_stub_rejects_invalid_since():
+    """The stub parses since like CommandLib.API.taskList"""
+    api = StubTaskAPI()
+    for since in ("60", "2h", "1d", "1w"):
+        api.taskList(since=since)
+    for since in (60, "abc", "h"):
+        with pytest.raises(Exception, match="Invalid value for 'since'"):
+            api.taskList(since=since)
+
+
+def test_success():
+    api = StubTaskAPI(script=(TS_RUNNING, TS_SUCCEEDED))
+    monitor, events = make_monitor(api)
+    start_transfer(api, monitor, "/data/a", "d/1")
+    assert monitor.is_tracking("/data/a")
+
+    assert monitor.poll() == 0
+    assert events == []
+    assert monitor.poll() == 1
+    assert events == [("success", "/data/a", "d/1")]
+    assert not monitor.is_tracking("/data/a")
+    assert monitor.pending == 0
+    # since is sent as a string of seconds
+    assert all(isinstance(call[1], str) for call in api.calls if call[0] == "taskList")
+
+
+def test_failure_without_resubmit():
+    api = StubTaskAPI(script=(TS_FAILED,))
+    monitor, events = make_monitor(api)
+    start_transfer(api, monitor, "/data/a", "d/1")
+
+    assert monitor.poll() == 1
+    assert events == [("failure", "/data/a", "d/1", "failed")]
+    assert monitor.pending == 0
+
+
+def test_resubmit_until_retries_run_out():
+    api = StubTaskAPI(script=(TS_FAILED,))
+    resubmitted = []
+
+    def resubmit(item, record_id):
+        resubmitted.append((item, record_id))
+        return task_id_from_reply(api.dataPut(record_id, wait=False, path=item))
+
+    monitor, events = make_monitor(api, resubmit=resubmit, max_retries=2)
+    start_transfer(api, monitor, "/data/a", "d/1")
+
+    monitor.poll()
+    monitor.poll()
+    assert events == []
+    assert resubmitted == [("/data/a", "d/1"), ("/data/a", "d/1")]
+    assert monitor.is_tracking("/data/a")
+
+    monitor.poll()
+    assert events == [("failure", "/data/a", "d/1", "failed")]
+    assert len([call for call in api.calls if call[0] == "dataPut"]) == 3
+
+
+def test_resubmit_without_task_is_a_failure():
+    api = StubTaskAPI(script=(TS_FAILED,))
+    monitor, events = make_monitor(api, resubmit=lambda item, record_id: None)
+    start_transfer(api, monitor, "/data/a", "d/1")
+
+    monitor.poll()
+    assert [event[0] for event in events] == ["failure"]
+    assert monitor.pending == 0
+
+
+def test_backoff_and_reset():
+    api = StubTaskAPI(script=(TS_RUNNING,))
+    monitor, events = make_monitor(api, min_interval=0.01, max_interval=0.04)
+    start_transfer(api, monitor, "/data/a", "d/1")
+    monitor.start()
+    try:
+        deadline = time.time() + 5
+        while monitor.interval < monitor.max_interval and time.time() < deadline:
+            time.sleep(0.01)
+        assert monitor.interval == monitor.max_interval
+
+        # A new transfer resets the poll interval
+        start_transfer(api, monitor, "/data/b", "d/2")
+        assert monitor.interval <= 2 * monitor.min_interval
+    finally:
+        monitor.stop()
+    assert events == []
+
+
+def test_drain_waits_for_running_transfers():
+    api = StubTaskAPI(script=(TS_RUNNING, TS_RUNNING, TS_SUCCEEDED))
+    monitor, events = make_monitor(api, min_interval=0.01)
+    start_transfer(api, monitor, "/data/a", "d/1")
+
+    assert monitor.drain(timeout=5) == 0
+    assert events == [("success", "/data/a", "d/1")]
+
+
+def test_drain_is_bounded():
+    api = StubTaskAPI(script=(TS_RUNNING,))
+    monitor, events = make_monitor(api, min_interval=0.01)
+    start_transfer(api, monitor, "/data/a", "d/1")
+
+    assert monitor.drain(timeout=0.05) == 1
+    assert [t.record_id for t in monitor.transfers()] == ["d/1"]
+    assert events == []
@@ -0,0 +1,107 @@
+import threading
+
+from upload_pool import ProgressTracker, UploadPool
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def test_results_arrive_in_submission_order():
+    def extract(path):
+        return {"path": path}
+
+    def upload(path, metadata):
+        return f"d/{path}", None
+
+    pool = UploadPool(extract, upload, extract_workers=2, upload_workers=3)
+    try:
+        results = list(pool.run([str(i) for i in range(20)]))
+    finally:
+        pool.shutdown()
+    assert [result.index for result in results] == list(range(20))
+    assert all(result.success for result in results)
+    assert results[7].record_id == "d/7"
+
+
+def test_failures_are_reported_per_item():
+    def extract(path):
+        if path == "bad-metadata":
+            return None
+        if path == "crash":
+            raise RuntimeError("extractor crashed")
+        return {}
+
+    def upload(path, metadata):
+        return None if path == "bad-upload" else ("d/1", "task/1")
+
+    pool = UploadPool(extract, upload)
+    try:
+        results = {result.path: result for result in pool.run(["ok", "bad-metadata", "crash", "bad-upload"])}
+    finally:
+        pool.shutdown()
+    assert results["ok"].success and results["ok"].task_id == "task/1"
+    assert results["bad-metadata"].error == "metadata extraction failed"
+    assert results["crash"].error == "extractor crashed"
+    assert results["bad-upload"].error == "upload failed"
+
+
+def test_uploads_run_concurrently_up_to_the_limit():
+    lock = threading.Lock()
+    running = [0, 0]  # current, peak
+    barrier = threading.Barrier(3, timeout=5)
+
+    def upload(path, metadata):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        barrier.wait()
+        with lock:
+            running[0] -= 1
+        return "d/1", None
+
+    pool = UploadPool(lambda path: {}, upload, extract_workers=3, upload_workers=3)
+    try:
+        results = list(pool.run(["a", "b", "c", "d", "e", "f"]))
+    finally:
+        pool.shutdown()
+    assert all(result.success for result in results)
+    assert running[1] == 3
+
+
+def test_should_continue_stops_submitting():
+    running = [True]
+    pool = UploadPool(lambda path: {}, lambda path, metadata: ("d/1", None), max_pending=1)
+    try:
+        results = []
+        for result in pool.run(["a", "b", "c"], should_continue=lambda: running[0]):
+            results.append(result)
+            running[0] = False
+    finally:
+        pool.shutdown()
+    # "b" was already submitted when the stop was requested and is drained; "c" is never submitted
+    assert [result.path for result in results] == ["a", "b"]
+
+
+def test_batched_upload():
+    batches = []
+
+    def upload_batch(items):
+        batches.append([path for path, _ in items])
+        return [(f"d/{path}", None) for path, _ in items]
+
+    pool = UploadPool(lambda path: {}, None)
+    try:
+        results = list(pool.run(["a", "b", "c", "d", "e"], batch_size=2, upload_batch_fn=upload_batch))
+    finally:
+        pool.shutdown()
+    assert sorted(batches) == [["a", "b"], ["c", "d"], ["e"]]
+    assert [result.record_id for result in results] == ["d/a", "d/b", "d/c", "d/d", "d/e"]
+
+
+def test_progress_tracker():
+    tracker = ProgressTracker(4)
+    for name in ("a", "b", "c", "d"):
+        tracker.start(name)
+    assert tracker.start("e") == "a, b, c (+2 more)"
+    assert tracker.done("a") == (25, "b, c, d (+1 more)")
@@ -0,0 +1,84 @@
+import contextlib
+import os
+
+import pytest
+
+from ingest_service import IngestService
+from snapshot import DirectorySnapshot
+from watcher import PollingWatcher
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def write(path, data="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(data)
+
+
+def bump_mtime(dir_path):
+    mtime_ns = os.stat(dir_path).st_mtime_ns + 1_000_000_000
+    os.utime(dir_path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def watched(tmp_path):
+    """
+    watched/
+        run1/x.dat
+        run1/sub/y.dat
+    """
+    root = str(tmp_path / "watched")
+    write(os.path.join(root, "run1", "x.dat"))
+    write(os.path.join(root, "run1", "sub", "y.dat"))
+    return root
+
+
+def poll_events(root, change):
+    """Snapshot root, apply change, and return the events of one poll"""
+    snapshot = DirectorySnapshot(root)
+    snapshot.add_tree()
+    watcher = PollingWatcher(root, snapshot=snapshot)
+    change()
+    watcher.poll()
+    return watcher.get_events(timeout=0)
+
+
+def items_for(root, events, unit):
+    service = IngestService(root, contextlib.nullcontext, ingest_unit=unit, metadata_cache_file="", snapshot_dir="")
+    return [os.path.relpath(item, root) for item in service._items_from_events(root, events)]
+
+
+def test_new_directory_maps_to_its_top_level_item(watched):
+    def change():
+        write(os.path.join(watched, "run2", "a.dat"))
+        write(os.path.join(watched, "run1", "sub", "z.dat"))
+        bump_mtime(os.path.join(watched, "run1", "sub"))
+
+    events = poll_events(watched, change)
+    assert sorted(items_for(watched, events, "top_level")) == ["run1", "run2"]
+
+
+def test_events_map_to_leaf_directories_and_files(watched):
+    def change():
+        write(os.path.join(watched, "run1", "sub", "z.dat"))
+        write(os.path.join(watched, "loose.dat"))
+        write(os.path.join(watched, ".hidden"))
+        bump_mtime(os.path.join(watched, "run1", "sub"))
+        bump_mtime(watched)
+
+    events = poll_events(watched, change)
+    assert sorted(items_for(watched, events, "leaf_dir")) == ["loose.dat", os.path.join("run1", "sub")]
+    assert sorted(items_for(watched, events, "file")) == ["loose.dat", os.path.join("run1", "sub", "z.dat")]
+
+
+def test_deleted_paths_map_to_no_item(watched):
+    def change():
+        os.remove(os.path.join(watched, "run1", "x.dat"))
+        bump_mtime(os.path.join(watched, "run1"))
+
+    events = poll_events(watched, change)
+    assert [event.kind for event in events] == ["deleted"]
+    assert items_for(watched, events, "top_level") == []
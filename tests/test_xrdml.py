@@ -0,0 +1,25 @@
+from materials.Xray.panalytical.xrdml import XRDML
+
+__author__ = "jagar2"
+__copyright__ = "jagar2"
+__license__ = "MIT"
+
+
+def test_repeated_tags_get_numeric_suffixes(tmp_path):
+    positions = "".join(f"<startPosition>{i}</startPosition>" for i in range(1, 1001))
+    path = tmp_path / "scan.xrdml"
+    path.write_text(
+        '<?xml version="1.0"?>'
+        '<xrdMeasurements xmlns="http://www.xrdml.com/XRDMeasurement/2.1">'
+        f"<status>Completed</status><scan>{positions}<intensities>1 2 3 4 5 6 7 8 9 10 11 12</intensities>"
+        "<startPosition_2>clash</startPosition_2></scan></xrdMeasurements>"
+    )
+
+    metadata = XRDML(str(path)).extract()
+    assert metadata["status"] == "Completed"
+    assert metadata["startPosition"] == "1"
+    assert metadata["startPosition_2"] == "2"
+    assert metadata["startPosition_1000"] == "1000"
+    # A tag that looks like a suffixed key does not overwrite it
+    assert metadata["startPosition_2_2"] == "clash"
+    assert "intensities" not in metadata